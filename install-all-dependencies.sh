@@ -6,7 +6,7 @@ echo "🚀 Installing Complete JARVIS Dependencies..."
 pkg update -y
 
 # Install core packages
-pkg install -y python nodejs espeak espeak-data termux-api git curl wget jq
+pkg install -y python python-numpy nodejs espeak espeak-data termux-api git curl wget jq
 
 # Install Python packages
 pip install speechrecognition pyttsx3 requests flask flask-cors
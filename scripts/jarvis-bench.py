@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+"""
+J.A.R.V.I.S micro-benchmarks
+Usage: python scripts/jarvis-bench.py <benchmark> [options]
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from jarvis_intents import IntentRouter
+from jarvis_metrics import Metrics
+
+WORDS = ("open play show send call set check turn find read start stop tell give "
+         "music camera photo battery weather alarm timer message note light volume "
+         "screen mail chat video map ride food news score song radio podcast").split()
+
+
+def synthetic_phrases(count, rng):
+    """Distinct 1-3 word trigger phrases"""
+    phrases = set()
+    while len(phrases) < count:
+        length = rng.choice((1, 2, 2, 3))
+        phrases.add(" ".join(rng.choice(WORDS) + str(rng.randrange(count)) for _ in range(length)))
+    return sorted(phrases)
+
+
+def linear_route(table, command):
+    """The old process_command strategy: substring scan of every keyword"""
+    for keyword, intent in table:
+        if keyword in command:
+            return intent
+    return None
+
+
+def bench_router(args):
+    rng = random.Random(args.seed)
+    print(f"{'phrases':>8} {'trie us/cmd':>12} {'linear us/cmd':>14}")
+    for size in args.sizes:
+        phrases = synthetic_phrases(size, rng)
+        router = IntentRouter()
+        for i, phrase in enumerate(phrases):
+            router.add(f"intent{i}", phrase)
+        router.compile()
+        table = [(phrase, f"intent{i}") for i, phrase in enumerate(phrases)]
+
+        commands = []
+        for _ in range(args.commands):
+            words = [rng.choice(WORDS) for _ in range(rng.randrange(3, 9))]
+            if rng.random() < 0.7:
+                words.insert(rng.randrange(len(words)), rng.choice(phrases))
+            commands.append(" ".join(words))
+
+        start = time.perf_counter()
+        for command in commands:
+            router.route(command)
+        trie_us = (time.perf_counter() - start) / len(commands) * 1e6
+
+        start = time.perf_counter()
+        for command in commands:
+            linear_route(table, command)
+        linear_us = (time.perf_counter() - start) / len(commands) * 1e6
+
+        print(f"{size:>8} {trie_us:>12.2f} {linear_us:>14.2f}")
+
+
+class MockCompletionHandler(BaseHTTPRequestHandler):
+    """Local stand-in for /chat/completions: streams SSE deltas with a per-token delay"""
+
+    protocol_version = 'HTTP/1.1'
+    reply = ("Paris is the capital of France. It sits on the Seine and is home to about two million "
+             "people. The Eiffel Tower is its best known landmark.")
+    token_delay = 0.02
+    connections = set()
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        MockCompletionHandler.connections.add(self.client_address)
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        words = self.reply.split(' ')
+        if not body.get('stream'):
+            time.sleep(self.token_delay * len(words))
+            payload = json.dumps({'choices': [{'message': {'content': self.reply}}]}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for i, word in enumerate(words):
+            time.sleep(self.token_delay)
+            delta = {'choices': [{'delta': {'content': word + (' ' if i < len(words) - 1 else '')}}]}
+            self._chunk(f"data: {json.dumps(delta)}\n\n")
+        self._chunk("data: [DONE]\n\n")
+        self._chunk("")
+
+    def _chunk(self, text):
+        data = text.encode()
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+
+def bench_llm(args):
+    from jarvis_llm import ChatClient
+
+    MockCompletionHandler.token_delay = args.token_delay
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MockCompletionHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = ChatClient('test-key', base_url=f"http://127.0.0.1:{server.server_port}/v1")
+
+    first, total = [], []
+    for _ in range(args.queries):
+        start = time.perf_counter()
+        client.complete("what's the capital of France")
+        total.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for i, _sentence in enumerate(client.stream_sentences("what's the capital of France")):
+            if i == 0:
+                first.append(time.perf_counter() - start)
+
+    server.shutdown()
+    print(f"queries: {args.queries}, connections opened: {len(MockCompletionHandler.connections)}")
+    print(f"full completion      avg {sum(total) / len(total) * 1000:8.1f} ms")
+    print(f"first streamed chunk avg {sum(first) / len(first) * 1000:8.1f} ms")
+
+
+class StubJarvis:
+    """Just enough of JarvisVoice for the control API"""
+
+    telemetry = Metrics()
+
+    def speak(self, text, language='en'):
+        pass
+
+    def process_command(self, text):
+        time.sleep(0.01)
+
+    def status(self):
+        return {'listening': True}
+
+    def metrics(self):
+        return {}
+
+
+async def http_client(host, port, method, path, body, requests, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    payload = json.dumps(body).encode() if body is not None else b''
+    request = (f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+               f"Content-Length: {len(payload)}\r\n\r\n").encode() + payload
+    statuses = {}
+    for _ in range(requests):
+        start = time.perf_counter()
+        writer.write(request)
+        head = await reader.readuntil(b'\r\n\r\n')
+        length = int(head.lower().split(b'content-length:')[1].split(b'\r\n')[0])
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - start)
+        status = int(head.split(b' ')[1])
+        statuses[status] = statuses.get(status, 0) + 1
+    writer.close()
+    return statuses
+
+
+async def run_load(host, port, args):
+    body = {'text': 'what time is it'} if args.method == 'POST' else None
+    latencies = []
+    start = time.perf_counter()
+    results = await asyncio.gather(*[
+        http_client(host, port, args.method, args.path, body, args.requests, latencies)
+        for _ in range(args.clients)
+    ])
+    elapsed = time.perf_counter() - start
+    statuses = {}
+    for result in results:
+        for status, count in result.items():
+            statuses[status] = statuses.get(status, 0) + count
+    return elapsed, sorted(latencies), statuses
+
+
+def bench_http(args):
+    from jarvis_control import ControlServer
+
+    server = None
+    host, port = args.host, args.port
+    if not port:
+        server = ControlServer(StubJarvis(), host='127.0.0.1', port=0).start()
+        host, port = '127.0.0.1', server.port
+
+    elapsed, latencies, statuses = asyncio.run(run_load(host, port, args))
+    total = len(latencies)
+    print(f"{args.method} {args.path}: {args.clients} keep-alive clients x {args.requests} requests")
+    print(f"throughput {total / elapsed:10.0f} req/s   statuses {statuses}")
+    print(f"latency p50 {latencies[total // 2] * 1000:.2f} ms  p99 {latencies[int(total * 0.99)] * 1000:.2f} ms")
+    if server:
+        server.stop()
+
+
+def per_op_ns(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e9
+
+
+def busy_wait(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def simulated_utterance(router, command, telemetry, work):
+    """The instrumented hot path of one utterance, with recognition stood in by busy work"""
+    telemetry.observe('listen', 1.2)
+    with telemetry.span('recognize', 'vosk'):
+        busy_wait(work)
+    with telemetry.span('process_command'):
+        with telemetry.span('route'):
+            match = router.route(command)
+        with telemetry.span('handler', match.intent if match else 'general_query'):
+            busy_wait(work / 10)
+    telemetry.observe('speak.first_audio', 0.05)
+
+
+def bench_metrics(args):
+    enabled, disabled = Metrics(), Metrics(enabled=False)
+
+    def span():
+        with enabled.span('route'):
+            pass
+
+    def null_span():
+        with disabled.span('route'):
+            pass
+
+    print("per-operation cost")
+    for name, func in [('span (enabled)', span), ('span (disabled)', null_span),
+                       ('observe', lambda: enabled.observe('speak', 0.25)),
+                       ('incr', lambda: enabled.incr('command.timeouts'))]:
+        print(f"  {name:<16} {per_op_ns(func, args.iterations):8.0f} ns")
+
+    rng = random.Random(args.seed)
+    phrases = synthetic_phrases(200, rng)
+    router = IntentRouter()
+    for i, phrase in enumerate(phrases):
+        router.add(f"intent{i}", phrase)
+    router.compile()
+    commands = [f"please {rng.choice(phrases)} now" for _ in range(args.utterances)]
+
+    work = args.work_ms / 1000.0
+    rounds = {'off': [], 'on': []}
+    for _ in range(args.rounds):
+        # Interleaved so CPU frequency drift hits both variants alike
+        for variant, telemetry in (('off', Metrics(enabled=False)), ('on', Metrics())):
+            start = time.perf_counter()
+            for command in commands:
+                simulated_utterance(router, command, telemetry, work)
+            rounds[variant].append(time.perf_counter() - start)
+    off = sorted(rounds['off'])[len(rounds['off']) // 2]
+    on = sorted(rounds['on'])[len(rounds['on']) // 2]
+    overhead = (on - off) / off * 100
+    print(f"voice loop: {args.utterances} utterances x {args.rounds} rounds, {args.work_ms} ms recognition stand-in")
+    print(f"  spans off {off / args.utterances * 1000:8.3f} ms/utterance")
+    print(f"  spans on  {on / args.utterances * 1000:8.3f} ms/utterance")
+    print(f"  overhead  {overhead:8.3f} %  ({'OK' if overhead < 1.0 else 'OVER BUDGET'}: budget 1%)")
+    return 0 if overhead < 1.0 else 1
+
+
+def print_stages(title, stages):
+    print(f"{title:<24} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, s in stages.items():
+        print(f"  {name:<22} {s['count']:>7} {s['p50_ms']:>9.2f} {s['p95_ms']:>9.2f} {s['p99_ms']:>9.2f} {s['max_ms']:>9.1f}")
+
+
+def bench_replay(args):
+    import jarvis_harness as harness
+    from jarvis_recognition import RecognitionChain
+
+    corpus = harness.load_corpus(args.corpus) if args.corpus else harness.synthetic_corpus(args.count, args.seed)
+    telemetry = Metrics()
+    backend = harness.ScriptedBackend(delay=args.recognize_ms / 1000.0)
+    speech = harness.SilentSpeechQueue(seconds_per_char=args.tts_ms_per_char / 1000.0)
+    microphone = harness.ReplayMicrophone(speed=args.speed)
+
+    # Handlers print every reply; keep the report readable unless asked
+    quiet = contextlib.redirect_stdout(open(os.devnull, 'w')) if not args.verbose else contextlib.nullcontext()
+    workdir = tempfile.TemporaryDirectory(prefix='jarvis-replay-')
+    cwd = os.getcwd()
+    # Anything a handler writes relative to the cwd lands in a scratch directory
+    os.chdir(workdir.name)
+    with quiet:
+        jarvis = harness.build_jarvis(microphone, RecognitionChain([backend]), speech, telemetry)
+        try:
+            if args.mode == 'audio':
+                report = harness.replay_audio(jarvis, corpus, backend)
+            else:
+                report = harness.replay_text(jarvis, corpus)
+        finally:
+            jarvis.shutdown(farewell=False)
+            os.chdir(cwd)
+            workdir.cleanup()
+
+    summary = report.summary(telemetry)
+    print(f"{args.mode} replay: {summary['utterances']} utterances, {summary['throughput_per_s']} per second")
+    print(f"counts: {summary['counts']}")
+    print_stages("harness stages", summary['stages'])
+    print_stages("voice-loop spans", summary['spans'])
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(summary, f, indent=2)
+        print(f"saved report to {args.save}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = harness.compare(summary, json.load(f), args.tolerance)
+        for name, before, after in regressions:
+            print(f"❌ regression: {name} p95 {before:.2f} ms -> {after:.2f} ms")
+        if regressions:
+            return 1
+        print(f"✅ no p95 regressions beyond {args.tolerance:.0%} of {args.baseline}")
+    return 0
+
+
+def bench_notes(args):
+    from jarvis_notes import NoteStore
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory(prefix='jarvis-notes-') as directory:
+        path = os.path.join(directory, 'notes.sqlite')
+        store = NoteStore(path)
+        start = time.perf_counter()
+        for _ in range(args.notes):
+            store.add(" ".join(rng.choice(WORDS) for _ in range(rng.randrange(4, 12))))
+        print(f"append {args.notes} notes: {(time.perf_counter() - start) / args.notes * 1e6:8.1f} us/note")
+        store.close()
+
+        start = time.perf_counter()
+        store = NoteStore(path)
+        store.pending_reminders()
+        print(f"open + load reminders:  {(time.perf_counter() - start) * 1000:8.2f} ms")
+
+        queries = [" ".join(rng.sample(WORDS, 2)) for _ in range(args.queries)]
+        start = time.perf_counter()
+        hits = sum(len(store.search(query)) for query in queries)
+        print(f"full-text search:       {(time.perf_counter() - start) / len(queries) * 1000:8.2f} ms/query "
+              f"({hits / len(queries):.1f} hits, full_text={store.fts})")
+        store.close()
+
+
+ENDPOINT_SCENES = {
+    # name: (noise dBFS, noise dBFS once speech starts, speech dBFS, words, longest pause s)
+    'quiet': (-60, -60, -22, (1, 3), 0.15),
+    'office': (-45, -45, -22, (2, 5), 0.2),
+    'noisy': (-35, -35, -18, (2, 5), 0.2),
+    'drift': (-55, -42, -20, (2, 5), 0.2),  # a fan switches on after calibration
+    'dictation': (-45, -45, -22, (8, 14), 0.45),
+}
+
+
+def endpoint_fixture(np, scene, rng, sample_rate=16000):
+    """Noise bed plus syllable-modulated word bursts; returns (pcm, speech_start, speech_end)"""
+    start_db, end_db, speech_db, words, longest_pause = ENDPOINT_SCENES[scene]
+    segments = [np.zeros(int(sample_rate * 1.0))]
+    for index in range(rng.randint(*words)):
+        length = int(sample_rate * rng.uniform(0.2, 0.5))
+        t = np.arange(length) / sample_rate
+        envelope = np.hanning(length) * (0.55 + 0.45 * np.sin(2 * np.pi * rng.uniform(3, 6) * t))
+        level = 32768 * 10 ** ((speech_db + rng.uniform(-4, 4)) / 20) * np.sqrt(2)
+        segments.append(level * envelope * np.sin(2 * np.pi * rng.uniform(120, 220) * t
+                                                   + 3 * np.random.default_rng(index).standard_normal(length)))
+        segments.append(np.zeros(int(sample_rate * rng.uniform(0.05, longest_pause))))
+    speech_start = len(segments[0]) / sample_rate
+    speech_end = (sum(map(len, segments)) - len(segments[-1])) / sample_rate
+    segments.append(np.zeros(int(sample_rate * 2.5)))
+    signal = np.concatenate(segments)
+    # Background level steps from start_db to end_db over the first half second of speech
+    ramp = np.clip((np.arange(len(signal)) / sample_rate - speech_start) / 0.5, 0.0, 1.0)
+    noise_db = start_db + (end_db - start_db) * ramp
+    noise = np.random.default_rng(rng.randrange(1 << 30)).standard_normal(len(signal)) * 32768 * 10 ** (noise_db / 20)
+    pcm = np.clip(signal + noise, -32767, 32767).astype(np.int16)
+    return pcm.tobytes(), speech_start, speech_end
+
+
+def run_endpointer(factory, pcm, calibrated_threshold, chunk=1024, sample_rate=16000):
+    """Feed one fixture frame by frame; returns [(emitted_at, started_at, audio_seconds)]"""
+    from types import SimpleNamespace
+    recognizer = SimpleNamespace(pause_threshold=0.8, non_speaking_duration=0.5, phrase_threshold=0.3,
+                                 energy_threshold=calibrated_threshold)
+    segmenter = factory(recognizer, sample_rate, 2, chunk, 15)
+    spf = chunk / sample_rate
+    phrases = []
+    for index in range(len(pcm) // (2 * chunk)):
+        phrase = segmenter.feed(pcm[index * 2 * chunk:(index + 1) * 2 * chunk], index * spf)
+        if phrase is not None:
+            phrases.append(((index + 1) * spf, phrase[1], len(phrase[0]) / 2 / sample_rate))
+    return phrases
+
+
+def bench_endpoint(args):
+    import audioop
+    from jarvis_metrics import LatencyHistogram
+    from jarvis_pipeline import PhraseSegmenter
+    from jarvis_vad import VadSegmenter, np
+    if np is None:
+        print("NumPy is required for the adaptive endpointer")
+        return 1
+
+    rng = random.Random(args.seed)
+    scenes = args.scenes or list(ENDPOINT_SCENES)
+    fixtures = [(scene, *endpoint_fixture(np, scene, rng)) for scene in scenes for _ in range(args.fixtures)]
+    endpointers = {'energy': PhraseSegmenter, 'vad': VadSegmenter}
+    print(f"{len(fixtures)} fixtures, recognition at {args.rtf:.2f}x real time; latencies from the end of speech")
+    print(f"{'scene':<10} {'endpointer':<10} {'missed':>6} {'split':>5} {'false':>5} {'audio s':>7} "
+          f"{'endpoint p50':>12} {'p95':>6} {'recognized p50':>14} {'p95':>6}")
+    totals = {}
+    for scene in scenes + ['all']:
+        for name, factory in endpointers.items():
+            endpoint, recognized = LatencyHistogram(), LatencyHistogram()
+            missed = split = false = 0
+            audio = 0.0
+            for fixture_scene, pcm, speech_start, speech_end in fixtures:
+                if scene != 'all' and fixture_scene != scene:
+                    continue
+                # The fixed threshold gets what adjust_for_ambient_noise would measure on the lead-in;
+                # the adaptive one starts from the library default and has to find the floor itself
+                threshold = audioop.rms(pcm[:16000], 2) * 1.5 if name == 'energy' else 300
+                phrases = run_endpointer(factory, pcm, threshold)
+                hits = [p for p in phrases if p[1] < speech_end and p[0] > speech_start]
+                false += len(phrases) - len(hits)
+                if not hits:
+                    missed += 1
+                    continue
+                split += len(hits) > 1
+                audio += sum(p[2] for p in hits)
+                waited = max(0.0, hits[-1][0] - speech_end)
+                endpoint.record(waited)
+                # Recognition of the final phrase starts at the endpoint and scales with its length
+                recognized.record(waited + args.rtf * hits[-1][2])
+            found = endpoint.count
+            print(f"{scene:<10} {name:<10} {missed:>6} {split:>5} {false:>5} {audio / max(1, found):>7.2f} "
+                  f"{endpoint.percentile(0.5):>12.0f} {endpoint.percentile(0.95):>6.0f} "
+                  f"{recognized.percentile(0.5):>14.0f} {recognized.percentile(0.95):>6.0f}")
+            totals[name] = recognized
+    energy, vad = totals['energy'], totals['vad']
+    print(f"adaptive VAD: end of speech -> recognized p50 {energy.percentile(0.5):.0f} -> "
+          f"{vad.percentile(0.5):.0f} ms (fixed threshold missed phrases are not in its figures)")
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="J.A.R.V.I.S micro-benchmarks")
+    sub = parser.add_subparsers(dest='benchmark', required=True)
+
+    router = sub.add_parser('router', help="intent routing cost vs. intent table size")
+    router.add_argument('--sizes', type=int, nargs='+', default=[20, 200, 2000, 5000])
+    router.add_argument('--commands', type=int, default=2000)
+    router.add_argument('--seed', type=int, default=17)
+    router.set_defaults(func=bench_router)
+
+    llm = sub.add_parser('llm', help="streamed vs. blocking completions against a local mock server")
+    llm.add_argument('--queries', type=int, default=10)
+    llm.add_argument('--token-delay', type=float, default=0.02)
+    llm.set_defaults(func=bench_llm)
+
+    http = sub.add_parser('http', help="load-test the control API (local stub server unless --port)")
+    http.add_argument('--host', default='127.0.0.1')
+    http.add_argument('--port', type=int, default=0)
+    http.add_argument('--method', default='GET', choices=['GET', 'POST'])
+    http.add_argument('--path', default='/status')
+    http.add_argument('--clients', type=int, default=32)
+    http.add_argument('--requests', type=int, default=200)
+    http.set_defaults(func=bench_http)
+
+    metrics = sub.add_parser('metrics', help="span timer cost and its overhead on a simulated voice loop")
+    metrics.add_argument('--iterations', type=int, default=200000)
+    metrics.add_argument('--utterances', type=int, default=200)
+    metrics.add_argument('--rounds', type=int, default=5)
+    metrics.add_argument('--work-ms', type=float, default=5.0,
+                         help="recognition stand-in; real recognition is 100+ ms, so this is pessimistic")
+    metrics.add_argument('--seed', type=int, default=17)
+    metrics.set_defaults(func=bench_metrics)
+
+    notes = sub.add_parser('notes', help="note store append, open and search cost at scale")
+    notes.add_argument('--notes', type=int, default=100000)
+    notes.add_argument('--queries', type=int, default=200)
+    notes.add_argument('--seed', type=int, default=17)
+    notes.set_defaults(func=bench_notes)
+
+    endpoint = sub.add_parser('endpoint', help="fixed-threshold vs. adaptive VAD endpointing on synthetic fixtures")
+    endpoint.add_argument('--fixtures', type=int, default=20, help="fixtures per scene")
+    endpoint.add_argument('--scenes', nargs='+', choices=sorted(ENDPOINT_SCENES))
+    endpoint.add_argument('--rtf', type=float, default=0.3, help="recognizer cost as a fraction of audio length")
+    endpoint.add_argument('--seed', type=int, default=17)
+    endpoint.set_defaults(func=bench_endpoint)
+
+    replay = sub.add_parser('replay', help="drive JarvisVoice headless from a text or audio corpus")
+    replay.add_argument('corpus', nargs='?', help="commands, one per line, or JSONL with optional \"audio\" WAVs")
+    replay.add_argument('--count', type=int, default=1000, help="synthetic commands when no corpus is given")
+    replay.add_argument('--mode', choices=['text', 'audio'], default='text')
+    replay.add_argument('--speed', type=float, default=4.0, help="audio playback speed vs. real time")
+    replay.add_argument('--recognize-ms', type=float, default=0.0, help="mock recognizer latency")
+    replay.add_argument('--tts-ms-per-char', type=float, default=0.0, help="stub TTS speaking time")
+    replay.add_argument('--save', help="write the JSON report here")
+    replay.add_argument('--baseline', help="fail when p95 regresses against this saved report")
+    replay.add_argument('--tolerance', type=float, default=0.2)
+    replay.add_argument('--seed', type=int, default=17)
+    replay.add_argument('--verbose', action='store_true')
+    replay.set_defaults(func=bench_replay)
+
+    args = parser.parse_args(argv)
+    return args.func(args) or 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -76,6 +76,17 @@ app.post("/api/speak", async (req, res) => {
 
 // System info endpoint
 app.get("/api/system-info", async (req, res) => {
+  // Prefer the voice process's cached device snapshot over spawning termux-* here
+  try {
+    const response = await fetch("http://localhost:8001/device")
+    if (response.ok) {
+      const snapshot = await response.json()
+      return res.json({ battery: snapshot.battery, wifi: snapshot.wifi, timestamp: snapshot.timestamp })
+    }
+  } catch (error) {
+    // Voice process not running; fall back to direct calls
+  }
+
   try {
     const battery = await executeCommand("termux-battery-status")
     const wifi = await executeCommand("termux-wifi-connectioninfo")
@@ -3,79 +3,231 @@
 J.A.R.V.I.S Voice Recognition and TTS for Termux
 Enhanced with conversational AI and feature integration
 """
-import speech_recognition as sr
-import subprocess
-import json
+import argparse
+import audioop
 import time
 import threading
-import requests
 import random
 import os
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 
+from jarvis_actions import ActionExecutor
+from jarvis_cache import CACHE_PATH, ResponseCache, fingerprint, is_cacheable
+from jarvis_control import ControlServer
+from jarvis_device import DeviceStatus
+from jarvis_dialog import CANCEL_PHRASES, DialogFrame, DialogManager, Slot
+from jarvis_intents import IntentRouter
+from jarvis_llm import MODEL, SYSTEM_PROMPT, ChatClient
+from jarvis_memory import CONTEXT_TOKEN_BUDGET, ConversationMemory, session_log_path
+from jarvis_metrics import Metrics
+from jarvis_notes import LEGACY_NOTES_PATH, NOTES_PATH, NoteStore, ReminderScheduler, parse_reminder
+from jarvis_pipeline import AudioPipeline
+from jarvis_recognition import create_chain
+from jarvis_registry import Registry
+from jarvis_scheduler import INSTANT, CommandScheduler, check_cancelled, current_task
+from jarvis_speech import LOW, NORMAL, URGENT, SpeechQueue
+from jarvis_startup import StartupProfiler, lazy_import, load_calibration, save_calibration
+from jarvis_tts_cache import SpeechCache
+from jarvis_vad import ENDPOINTER, segmenter_factory
+from jarvis_wakeword import create_detector
+
+sr = lazy_import('speech_recognition')
+
+COMMAND_TIMEOUT = 8  # seconds to wait for a command after the wake word
+STOP_MAX_SECONDS = 1.5  # "stop" over our own speech is short; longer phrases then are echo
+BARGE_IN_MAX_SECONDS = 2.0  # "Jarvis" / "hey Jarvis, stop" over our own speech without templates
+BARGE_IN_LOUDNESS = 2.0  # ...and only when it is this many times louder than our echo usually is
+UNNAMED_CONTACTS = {'someone', 'somebody'}
+MESSAGE_RECIPIENT = re.compile(r"\bto (.+?)(?= saying\b| that says\b| says\b|$)")
+MESSAGE_BODY = re.compile(r"\b(?:saying|that says|says)\s+(.+)$")
+WAKE_PHRASES = ['hey jarvis', 'hi jarvis', 'jarvis']
+DAY_GREETINGS = ["Good morning", "Good afternoon", "Good evening", "Good night"]
+
+# Fixed lines, rendered to the speech cache at startup so they play without synthesis
+GREETINGS = [
+    "I am JARVIS, your personal assistant. How can I assist you today?",
+    "JARVIS at your service. What would you like me to help you with?",
+    "I'm here and ready to help. What can I do for you?",
+    "Your personal AI assistant is online. How may I be of assistance?",
+    "JARVIS reporting for duty. What tasks can I handle for you today?",
+    "Good to see you again! What exciting task do we have today?",
+    "I'm fully operational and eager to help. What's on your mind?"
+]
+WAKE_ACKS = [
+    "Yes sir, how can I help you?",
+    "I'm here, what do you need?",
+    "How may I assist you today?",
+    "At your service, sir. What can I do for you?"
+]
+JOKES = [
+    "Why don't scientists trust atoms? Because they make up everything!",
+    "I told my wife she was drawing her eyebrows too high. She looked surprised.",
+    "Why don't programmers like nature? It has too many bugs!",
+    "I'm reading a book about anti-gravity. It's impossible to put down!"
+]
+COMPLIMENTS = [
+    "You're doing great today!",
+    "I appreciate you using me to help with your tasks.",
+    "You have excellent taste in AI assistants!",
+    "You're very smart for choosing JARVIS as your assistant."
+]
+GOODBYES = [
+    "Goodbye! Have a wonderful day!",
+    "See you later! I'll be here when you need me.",
+    "Take care! Call me anytime you need assistance.",
+    "Until next time! Stay awesome!"
+]
+NUMBER_WORDS = {'one': 1, 'once': 1, 'two': 2, 'twice': 2, 'three': 3, 'four': 4, 'five': 5,
+                'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10}
+
+
+def parse_repeat(command, default=1, limit=15):
+    """Step count from phrases like 'five times' or 'by 3'"""
+    for word in command.split():
+        if word.isdigit():
+            return max(1, min(int(word), limit))
+        if word in NUMBER_WORDS:
+            return NUMBER_WORDS[word]
+    return default
+
+
+def message_slots(text):
+    """Recipient and/or body from 'message to mom saying I'm late' (either part may be absent)"""
+    recipient, body = MESSAGE_RECIPIENT.search(text), MESSAGE_BODY.search(text)
+    return {'recipient': recipient and recipient.group(1), 'body': body and body.group(1)}
+
+
+def reminder_slots(text):
+    """A follow-up like 'call mom at 5' fills both the reminder text and its time"""
+    reminder_text, due_at = parse_reminder(text)
+    return {'when': due_at, 'text': reminder_text if due_at else None}
+
+
 class JarvisVoice:
-    def __init__(self):
-        self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
-        self.tts_engine = None
-        self.tts_available = False
+    def __init__(self, fast_start=False, profiler=None, telemetry=None, microphone=None, recognition=None,
+                 speech=None, actions=None, device=None, wake_detector=None, notes=None, response_cache=None,
+                 registry=None, endpointer=ENDPOINTER, autostart=True):
+        """Components can be injected (replay harness, tests); autostart=False skips run()"""
+        self.fast_start = fast_start
+        self.profiler = profiler or StartupProfiler()
+        # Span timers for capture, recognition, routing, handlers and TTS
+        self.telemetry = telemetry or Metrics()
+        step = self.profiler.step
+        
+        with step('speech_recognition + microphone'):
+            self.recognizer = sr.Recognizer()
+            self.microphone = microphone or sr.Microphone()
+        
+        # Slow, independent initializers run side by side instead of one after another
+        self.startup_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix='jarvis-init')
+        
+        # Local model is loaded once, in the background; cloud is only a low-confidence fallback
+        self.recognition = recognition or create_chain(self.recognizer, warm=False)
+        self.startup_pool.submit(self.profiler.timed('recognition backends', self.recognition.warm))
+        self.recognition.on_partial = lambda backend, text: print(f"💭 {text}...")
         
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
         if not self.openai_api_key:
             print("⚠️ OpenAI API key not found. Set OPENAI_API_KEY environment variable for intelligent responses.")
+        self.chat_client = ChatClient(self.openai_api_key) if self.openai_api_key else None
+        self.response_cache = response_cache or ResponseCache(CACHE_PATH)
         
-        try:
-            import pyttsx3
-            self.tts_engine = pyttsx3.init()
-            self.tts_engine.setProperty('rate', 150)
-            self.tts_engine.setProperty('volume', 0.9)
-            self.tts_available = True
-            print("✅ TTS engine initialized successfully")
-        except Exception as e:
-            print(f"⚠️ TTS engine not available: {e}")
-            print("📱 Will use espeak directly")
+        # Single long-lived synthesis worker; speak() only enqueues. Fixed phrases replay rendered audio
+        self.speech = speech or SpeechQueue(audio_cache=SpeechCache())
+        self.speech.on_start, self.speech.on_finish = self._speech_started, self._speech_finished
+        self.speech.start()
+        self.startup_pool.submit(self.profiler.timed('tts engine', self.speech.wait_ready, 10))
+        
+        with step('device status + action shell'):
+            # termux-* calls are slow; share cached readings across handlers
+            self.device = device or DeviceStatus().start()
+            # am/input run through a persistent shell instead of a fork per command
+            self.actions = actions or ActionExecutor()
         
         self.is_listening = False
+        self.pipeline = None
+        self.awaiting_command_until = None
+        # Follow-up questions ("Who should I call?") are answered without the wake word
+        self.dialog = DialogManager(self.speak)
+        # Slow handlers leave the dispatch thread so listening (and "stop") keeps working
+        self.scheduler = CommandScheduler(on_progress=self._command_progress, on_deadline=self._command_deadline,
+                                          metrics=self.telemetry)
+        self.calibration_seconds = 2
+        # Adaptive VAD tracks the noise floor as it listens; 'energy' keeps the fixed calibrated threshold
+        self.segmenter_factory = segmenter_factory(endpointer)
+        self.control = None
+        self.wake_detector = None
+        if wake_detector is not None:
+            self._wake_detector_ready = Future()
+            self._wake_detector_ready.set_result(wake_detector)
+        else:
+            self._wake_detector_ready = self.startup_pool.submit(self.profiler.timed(
+                'wake-word detector', create_detector, lambda: self.recognizer.energy_threshold))
         self.wake_word = "jarvis"
         self.user_name = "Sir"
+        self.cache_fingerprint = fingerprint(MODEL, SYSTEM_PROMPT, self.user_name)
+        # Picked as soon as the wake word passes the local gate, so its audio is ready before recognition ends
+        self.next_ack = None
+        self.echo_rms = None  # running level of our own speech as the microphone hears it
+        self.startup_pool.submit(self.speech.prepare, self.canned_phrases())
         
-        self.greetings = [
-            "I am JARVIS, your personal assistant. How can I assist you today?",
-            "JARVIS at your service. What would you like me to help you with?",
-            "I'm here and ready to help. What can I do for you?",
-            "Your personal AI assistant is online. How may I be of assistance?",
-            "JARVIS reporting for duty. What tasks can I handle for you today?",
-            "Good to see you again! What exciting task do we have today?",
-            "I'm fully operational and eager to help. What's on your mind?"
-        ]
+        # Bounded memory; older turns are summarized, never accumulated forever
+        log_path = session_log_path() if os.getenv('JARVIS_SESSION_LOG') else None
+        self.memory = ConversationMemory(log_path=log_path)
         
-        self.conversation_context = []
+        # Notes and reminders live in SQLite; only pending reminders are read at startup
+        self.notes = notes or NoteStore(NOTES_PATH)
+        if notes is None and os.path.exists(LEGACY_NOTES_PATH):
+            print(f"📝 Imported {self.notes.import_text_log(LEGACY_NOTES_PATH)} notes from {LEGACY_NOTES_PATH}")
+        self.reminders = ReminderScheduler(self._reminder_due).start()
+        for reminder in self.notes.pending_reminders():
+            self.reminders.schedule(reminder)
         
-        self.responses = {
-            'time': self.get_time,
-            'date': self.get_date,
-            'weather': self.get_weather_info,
-            'battery': self.get_battery_status,
-            'apps': self.list_apps,
-            'call': self.make_call,
-            'message': self.send_message,
-            'music': self.play_music,
-            'camera': self.open_camera,
-            'calculator': self.open_calculator,
-            'settings': self.open_settings,
-            'joke': self.tell_joke,
-            'compliment': self.give_compliment,
-            'goodbye': self.say_goodbye,
-            'search': self.web_search,
-            'note': self.take_note,
-            'reminder': self.set_reminder,
-            'wifi': self.wifi_info,
-            'brightness': self.adjust_brightness,
-            'volume': self.adjust_volume
-        }
+        # Intents, trigger phrases and execution classes are declared in registry/commands.json
+        with step('intent router'):
+            self.registry = registry or Registry()
+            self.intent_router = self.build_router()
+        
+        if autostart:
+            self.run()
+
+    def build_router(self):
+        """Compile the declared commands; higher priority wins (device intents over small talk)"""
+        router = IntentRouter()
+        for spec in self.registry.commands:
+            intent = spec['intent']
+            handler = getattr(self, spec['handler'], None) if spec.get('handler') else None
+            if spec.get('handler') and handler is None:
+                print(f"⚠️ No handler {spec['handler']!r} for intent {intent!r}")
+                continue
+            try:
+                self.scheduler.register(intent, spec.get('execution', INSTANT), spec.get('deadline'))
+            except ValueError as e:
+                print(f"⚠️ Intent {intent!r}: {e}")
+                continue
+            if spec.get('phrases'):
+                router.add(intent, spec['phrases'], handler, priority=spec.get('priority', 0))
+        router.compile()
+        return router
+
+    def canned_phrases(self):
+        """Lines worth rendering ahead, most latency-sensitive first"""
+        greetings = [f"{greeting}, {self.user_name}!" for greeting in DAY_GREETINGS]
+        welcomes = [f"{greeting} {welcome}" for greeting in greetings for welcome in GREETINGS]
+        return (WAKE_ACKS + JOKES + COMPLIMENTS + GOODBYES + ["JARVIS is activated"] + greetings + welcomes +
+                ["Say 'Hey JARVIS' to wake me up, or just start talking to me."])
+
+    def run(self):
+        """Serve the control API, greet, and listen until interrupted"""
+        with self.profiler.step('control api'):
+            # Local control API for the web UI (speak, command, status, metrics)
+            self.control = ControlServer(self).start()
         
         # Start activation sequence
-        self.announce_activation()
+        if not self.fast_start:
+            self.announce_activation()
         self.initial_greeting()
         
         # Auto-start listening
@@ -85,115 +237,188 @@ class JarvisVoice:
     def announce_activation(self):
         """Announce JARVIS activation"""
         self.speak("JARVIS is activated")
-        time.sleep(0.5)  # Brief pause for dramatic effect
         
     def initial_greeting(self):
         """Initial greeting when JARVIS starts"""
         current_hour = datetime.now().hour
         if 5 <= current_hour < 12:
-            greeting = "Good morning"
+            greeting = DAY_GREETINGS[0]
         elif 12 <= current_hour < 17:
-            greeting = "Good afternoon"
+            greeting = DAY_GREETINGS[1]
         elif 17 <= current_hour < 21:
-            greeting = "Good evening"
+            greeting = DAY_GREETINGS[2]
         else:
-            greeting = "Good night"
+            greeting = DAY_GREETINGS[3]
             
-        welcome_msg = f"{greeting}, {self.user_name}! " + random.choice(self.greetings)
-        self.speak(welcome_msg)
-        self.speak("Say 'Hey JARVIS' to wake me up, or just start talking to me.")
+        welcome_msg = f"{greeting}, {self.user_name}! " + random.choice(GREETINGS)
+        if self.fast_start:
+            self.speak(f"{greeting}, {self.user_name}!", priority=LOW)
+            return
+        self.speak(welcome_msg, priority=LOW)
+        self.speak("Say 'Hey JARVIS' to wake me up, or just start talking to me.", priority=LOW)
 
-    def speak(self, text, language='en'):
-        """Enhanced TTS with better espeak integration"""
+    def speak(self, text, language='en', priority=NORMAL, wait=False):
+        """Queue text for speech; returns immediately unless wait=True"""
+        task = current_task()
+        if task is not None:
+            if task.cancelled:
+                # A stopped command finishing late stays quiet
+                return None
+            self.scheduler.note_output()
         print(f"🔊 JARVIS: {text}")
-        
-        try:
-            if language == 'hi':
-                subprocess.run(['termux-tts-speak', text, '-l', 'hi-IN'], check=False)
-            elif self.tts_available and self.tts_engine:
-                self.tts_engine.say(text)
-                self.tts_engine.runAndWait()
-            else:
-                result = subprocess.run([
-                    'espeak', text, 
-                    '-s', '155',  # Slightly slower for clarity
-                    '-p', '45',   # Better pitch
-                    '-a', '120',  # Higher amplitude
-                    '-g', '8',    # More gap between words
-                    '-v', 'en+m3' # Male voice variant
-                ], capture_output=True)
-                
-                if result.returncode != 0:
-                    subprocess.run(['termux-tts-speak', text], check=False)
-        except Exception as e:
-            print(f"TTS Error: {e}")
+        item = self.speech.say(text, language, priority)
+        if wait:
+            item.wait(timeout=30)
+        return item
 
-    def web_search(self, command):
-        """Perform web search"""
-        query = command.replace('search', '').replace('for', '').strip()
-        if query:
-            self.speak(f"Searching for {query}")
+    def status(self):
+        """Cheap, non-blocking state summary for the control API"""
+        return {
+            'listening': self.is_listening,
+            'awaiting_command': self.awaiting_command_until is not None,
+            'dialog': self.dialog.frame.intent if self.dialog.active else None,
+            'running': self.scheduler.stats()['running'],
+            'speaking': self.speech.speaking,
+            'wake_detector': self.wake_detector.name if self.wake_detector else 'loading',
+            'memory_turns': len(self.memory)
+        }
+
+    def metrics(self):
+        """Counters from every subsystem"""
+        return {
+            'pipeline': self.pipeline.snapshot() if self.pipeline else {},
+            'recognition': self.recognition.summary(),
+            'speech': self.speech.stats(),
+            'speech_cache': self.speech.audio_cache.stats() if self.speech.audio_cache else {},
+            'response_cache': self.response_cache.stats(),
+            'device': self.device.stats(),
+            'actions': self.actions.stats(),
+            'notes': self.notes.stats(),
+            'registry': self.registry.stats(),
+            'dialog': self.dialog.stats(),
+            'scheduler': self.scheduler.stats(),
+            'voice_loop': self.telemetry.snapshot()
+        }
+
+    def _speech_started(self, item):
+        # Capture keeps running while we talk; our own voice is just flagged
+        if self.pipeline:
+            self.pipeline.speech_started(item.text)
+
+    def _speech_finished(self, item):
+        if self.pipeline:
+            self.pipeline.speech_finished()
+        if item.cancelled:
+            self.telemetry.incr('speak.interrupted')
+        elif item.started_at is not None:
+            self.telemetry.observe('speak.first_audio', item.time_to_first_audio)
+            self.telemetry.observe('speak', time.time() - item.started_at)
+
+    def run_action(self, future, failure_message):
+        """Fire-and-forget device action; failures are reported by voice when they happen"""
+        def report(done):
             try:
-                subprocess.run(['am', 'start', '-a', 'android.intent.action.WEB_SEARCH', '--es', 'query', query])
-            except:
-                self.speak("I couldn't perform the search right now.")
-        else:
-            self.speak("What would you like me to search for?")
+                if done.result().ok:
+                    return
+            except Exception as e:
+                print(f"Action error: {e}")
+            self.speak(failure_message)
+        future.add_done_callback(report)
+        return future
+
+    def web_search(self, command, slots):
+        """Perform web search"""
+        self.dialog.start(DialogFrame('search', [
+            Slot('query', "What would you like me to search for?", value=slots['query'] or None)
+        ], lambda slots: self._search(slots['query'])))
 
-    def take_note(self, command):
+    def _search(self, query):
+        self.speak(f"Searching for {query}")
+        self.run_action(self.actions.am('start', '-a', 'android.intent.action.WEB_SEARCH', '--es', 'query', query),
+                        "I couldn't perform the search right now.")
+
+    def take_note(self, command, slots):
         """Take a note"""
-        note_content = command.replace('note', '').replace('take', '').strip()
-        if note_content:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            try:
-                with open('jarvis_notes.txt', 'a') as f:
-                    f.write(f"[{timestamp}] {note_content}\n")
-                self.speak("Note saved successfully.")
-            except:
-                self.speak("I couldn't save the note right now.")
-        else:
-            self.speak("What would you like me to note down?")
+        self.dialog.start(DialogFrame('note', [
+            Slot('content', "What would you like me to note down?", value=slots['query'] or None)
+        ], lambda slots: self._save_note(slots['content'])))
+
+    def _save_note(self, content):
+        try:
+            self.notes.add(content)
+            self.speak("Note saved successfully.")
+        except Exception as e:
+            print(f"Note error: {e}")
+            self.speak("I couldn't save the note right now.")
 
-    def set_reminder(self, command):
-        """Set a reminder"""
-        self.speak("Reminder feature is being prepared. For now, I've noted your request.")
-        self.take_note(f"Reminder: {command}")
+    def find_notes(self, command, slots):
+        """Full-text search over saved notes"""
+        notes = self.notes.search(slots['query'] or command, limit=3)
+        if not notes:
+            self.speak("I couldn't find any notes about that.")
+            return
+        self.speak(f"I found {len(notes)} note{'s' if len(notes) > 1 else ''}.")
+        for note in notes:
+            self.speak(f"On {datetime.fromtimestamp(note.created_at):%B %d}: {note.text}")
+
+    def set_reminder(self, command, slots):
+        """Set a reminder, e.g. 'remind me to call mom at 6 pm' or 'in 20 minutes'"""
+        text, due_at = parse_reminder(command)
+        if due_at is None:
+            if 'reminders' in command:
+                pending = self.reminders.pending()
+                if not pending:
+                    self.speak("You have no reminders set.")
+                for reminder in pending[:3]:
+                    self.speak(f"{reminder.text} at {datetime.fromtimestamp(reminder.due_at):%I:%M %p on %A}")
+                return
+        self.dialog.start(DialogFrame('reminder', [
+            Slot('text', "What should I remind you about?", value=text or None),
+            Slot('when', "When should I remind you?", parse=lambda answer: reminder_slots(answer)['when'],
+                 value=due_at)
+        ], lambda slots: self._schedule_reminder(slots['text'], slots['when']), extract=reminder_slots))
 
-    def wifi_info(self, command):
+    def _schedule_reminder(self, text, due_at):
+        reminder = self.notes.add_reminder(text, due_at)
+        self.reminders.schedule(reminder)
+        self.speak(f"I'll remind you to {reminder.text} at {datetime.fromtimestamp(due_at):%I:%M %p}.")
+
+    def _reminder_due(self, reminder):
+        # Runs on the reminder timer thread; speak() only enqueues
+        late = time.time() - reminder.due_at
+        prefix = "Earlier reminder" if late > 60 else "Reminder"
+        self.speak(f"{prefix}: {reminder.text}", priority=URGENT)
+        self.notes.mark_fired(reminder.id)
+
+    def wifi_info(self, command, slots):
         """Get WiFi information"""
-        try:
-            result = subprocess.run(['termux-wifi-connectioninfo'], capture_output=True, text=True)
-            if result.returncode == 0:
-                wifi_info = json.loads(result.stdout)
-                ssid = wifi_info.get('ssid', 'Unknown')
-                self.speak(f"You are connected to {ssid}")
-            else:
-                self.speak("I couldn't get WiFi information right now.")
-        except:
-            self.speak("WiFi information is not available.")
+        wifi_info = self.device.get('wifi')
+        if wifi_info:
+            ssid = wifi_info.get('ssid', 'Unknown')
+            self.speak(f"You are connected to {ssid}")
+        else:
+            self.speak("I couldn't get WiFi information right now.")
 
-    def adjust_brightness(self, command):
+    def adjust_brightness(self, command, slots):
         """Adjust screen brightness"""
         self.speak("Opening display settings for brightness adjustment.")
-        try:
-            subprocess.run(['am', 'start', '-a', 'android.settings.DISPLAY_SETTINGS'])
-        except:
-            self.speak("I couldn't open display settings right now.")
+        self.run_action(self.actions.am('start', '-a', 'android.settings.DISPLAY_SETTINGS'),
+                        "I couldn't open display settings right now.")
 
-    def adjust_volume(self, command):
+    def adjust_volume(self, command, slots):
         """Adjust volume"""
+        # "volume up five times" becomes one batched `input keyevent` call
+        steps = parse_repeat(command)
         if 'up' in command:
-            subprocess.run(['input', 'keyevent', 'KEYCODE_VOLUME_UP'])
+            self.run_action(self.actions.keyevent('KEYCODE_VOLUME_UP', steps), "I couldn't change the volume right now.")
             self.speak("Volume increased.")
         elif 'down' in command:
-            subprocess.run(['input', 'keyevent', 'KEYCODE_VOLUME_DOWN'])
+            self.run_action(self.actions.keyevent('KEYCODE_VOLUME_DOWN', steps), "I couldn't change the volume right now.")
             self.speak("Volume decreased.")
         else:
             self.speak("Opening sound settings.")
-            try:
-                subprocess.run(['am', 'start', '-a', 'android.settings.SOUND_SETTINGS'])
-            except:
-                self.speak("I couldn't open sound settings right now.")
+            self.run_action(self.actions.am('start', '-a', 'android.settings.SOUND_SETTINGS'),
+                            "I couldn't open sound settings right now.")
 
     def start_listening(self):
         """Start the main listening loop"""
@@ -204,79 +429,250 @@ class JarvisVoice:
             while True:
                 time.sleep(1)
         except KeyboardInterrupt:
-            self.speak("JARVIS shutting down. Goodbye!")
-            self.is_listening = False
+            self.shutdown()
+
+    def shutdown(self, farewell=True):
+        """Stop listening, serving and speaking; safe to call on a never-started instance"""
+        self.is_listening = False
+        if self.pipeline:
+            self.pipeline.stop()
+        if self.control:
+            self.control.stop()
+        self.scheduler.shutdown()
+        if farewell:
+            self.speak("JARVIS shutting down. Goodbye!", priority=URGENT, wait=True)
+        self.speech.stop()
+        self.reminders.stop()
+        self.actions.stop()
+        self.device.stop()
+        self.notes.close()
+        self.memory.close()
+        self.response_cache.close()
+        self.startup_pool.shutdown(wait=False)
 
     def listen_for_wake_word(self):
-        """Continuous listening for wake word"""
-        with self.microphone as source:
-            self.recognizer.adjust_for_ambient_noise(source, duration=2)
-        
-        print("🎤 Listening for wake word 'Hey JARVIS'...")
-        
-        while self.is_listening:
-            try:
-                with self.microphone as source:
-                    audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=3)
-                
-                text = self.recognizer.recognize_google(audio).lower()
-                print(f"Heard: {text}")
-                
-                if any(wake in text for wake in ['jarvis', 'hey jarvis', 'hi jarvis']):
-                    responses = [
-                        "Yes sir, how can I help you?",
-                        "I'm here, what do you need?",
-                        "How may I assist you today?",
-                        "At your service, sir. What can I do for you?"
-                    ]
-                    self.speak(random.choice(responses))
-                    command = self.listen_for_command()
-                    if command:
-                        self.process_command(command)
-                    
-            except sr.WaitTimeoutError:
-                pass
-            except sr.UnknownValueError:
-                pass
-            except Exception as e:
-                print(f"Wake word error: {e}")
-                time.sleep(1)
-    
-    def listen_for_command(self):
-        """Listen for actual command after wake word"""
+        """Continuous listening for wake word through the streaming audio pipeline"""
+        self.wake_detector = self._wake_detector_ready.result()
+        self.pipeline = AudioPipeline(
+            self.microphone,
+            self.recognizer,
+            recognize=self.recognize_audio,
+            on_result=self.handle_recognition,
+            on_tick=self.check_command_timeout,
+            gate=self.gate_audio,
+            # Phrases over our own speech reach gate_audio, which keeps our echo away from the cloud
+            barge_in=True,
+            metrics=self.telemetry,
+            segmenter_factory=self.segmenter_factory
+        )
+        # Fast start reuses a recent ambient-noise calibration instead of 2 s of sampling
+        cached_threshold = load_calibration() if self.fast_start else None
+        if cached_threshold:
+            self.recognizer.energy_threshold = cached_threshold
+        # The adaptive endpointer measures the room in its first half second without blocking startup
+        calibrate = 0 if cached_threshold or self.segmenter_factory.adaptive else self.calibration_seconds
         try:
-            with self.microphone as source:
-                print("🎤 Listening for command...")
-                audio = self.recognizer.listen(source, timeout=8, phrase_time_limit=15)
-            
-            command = self.recognizer.recognize_google(audio)
-            print(f"Command received: {command}")
-            return command.lower()
-            
-        except sr.WaitTimeoutError:
-            self.speak("I didn't hear anything. Please try again.")
-            return None
-        except sr.UnknownValueError:
-            self.speak("Sorry, I didn't understand that. Could you repeat?")
-            return None
+            with self.profiler.step('microphone calibration' if calibrate else 'microphone open'):
+                self.pipeline.start(calibrate=calibrate)
         except Exception as e:
-            print(f"Command recognition error: {e}")
-            self.speak("There was an error processing your request.")
-            return None
+            self.telemetry.incr('listen.errors')
+            print(f"Microphone error: {e}")
+            return
+        if calibrate:
+            save_calibration(self.recognizer.energy_threshold)
+        if not self.wake_enrolled:
+            print("ℹ️ No wake-word templates: barge-in only hears a short phrase clearly louder than my voice. "
+                  "Run 'python jarvis_wakeword.py enroll' to interrupt me with 'Jarvis' at any volume.")
+        print("🎤 Listening for wake word 'Hey JARVIS'...")
+        self.profiler.report("listening")
+
+    def gate_audio(self, audio, during_speech=False):
+        """Local wake-word stage: only phrases that pass it are sent to the cloud"""
+        # While a slow command runs, a bare "stop" has to get through too
+        if (self.awaiting_command_until is not None or self.dialog.active or self.scheduler.busy) and not during_speech:
+            return True
+        if during_speech and self.scheduler.busy:
+            seconds = len(audio.frame_data) / float(audio.sample_rate * audio.sample_width)
+            if seconds <= STOP_MAX_SECONDS:
+                return True
+        if during_speech and not self.wake_enrolled:
+            return self.louder_than_echo(audio)
+        decision = self.wake_detector.check(audio.frame_data, audio.sample_rate, audio.sample_width)
+        if decision.passed and not during_speech:
+            # Recognition takes a while; use it to get the likely acknowledgement ready to play
+            self.next_ack = random.choice(WAKE_ACKS)
+            self.speech.prefetch(self.next_ack)
+        return decision.passed
+
+    def louder_than_echo(self, audio):
+        """Without templates the spotter can't tell our voice from the user's, so loudness does"""
+        seconds = len(audio.frame_data) / float(audio.sample_rate * audio.sample_width)
+        level = audioop.rms(audio.frame_data, audio.sample_width)
+        echo = self.echo_rms
+        if echo is not None and level >= echo * BARGE_IN_LOUDNESS and seconds <= BARGE_IN_MAX_SECONDS:
+            self.telemetry.incr('barge_in.loud')
+            return True
+        self.echo_rms = level if echo is None else 0.7 * echo + 0.3 * level
+        return False
+
+    def recognize_audio(self, audio):
+        """Recognition stage: runs on a pipeline worker, never on the capture thread"""
+        start = time.perf_counter()
+        outcome = self.recognition.recognize(audio)
+        self.telemetry.observe('recognize', time.perf_counter() - start, outcome.backend if outcome else 'none')
+        return outcome.text.lower() if outcome else None
+
+    def handle_recognition(self, result):
+        """Dispatch stage: wake word detection and command hand-off, in capture order"""
+        awaiting = self.awaiting_command_until is not None
+        if not result.ok:
+            outcome = result.error if result.error in ('unknown', 'dropped', 'gated') else 'errors'
+            self.telemetry.incr(f'recognize.{outcome}')
+            if self.dialog.active and result.error == 'unknown':
+                self.dialog.retry()
+            elif awaiting and result.error == 'unknown':
+                self.awaiting_command_until = None
+                self.speak("Sorry, I didn't understand that. Could you repeat?")
+            elif result.error not in (None, 'unknown', 'dropped', 'gated'):
+                print(f"Recognition error: {result.error}")
+            return
+
+        text = result.text
+        print(f"Heard: {text}")
+
+        if result.during_speech:
+            if self.scheduler.busy and CANCEL_PHRASES.match(text) and not self.is_echo(text, result):
+                # "Stop" over a command that is still talking
+                self.stop_commands()
+                return
+            # Barge-in: only the wake word counts while we're talking, never our own echo of it
+            if not self.is_wake_phrase(text) or any(self.is_wake_phrase(spoken.lower()) for spoken in result.echo):
+                return
+            awaiting = False
+
+        if self.continue_dialog(text):
+            return
+
+        if not awaiting and self.scheduler.busy and CANCEL_PHRASES.match(text):
+            self.stop_commands()
+            return
+
+        if awaiting:
+            self.awaiting_command_until = None
+            print(f"Command received: {text}")
+            self.process_command(text)
+            return
+
+        for wake in WAKE_PHRASES:
+            if wake in text:
+                # "Jarvis, what time is it" arrives as a single phrase
+                command = text.split(wake, 1)[1].strip(" ,.!?")
+                self.speech.interrupt()
+                if command:
+                    self.process_command(command)
+                else:
+                    ack, self.next_ack = self.next_ack or random.choice(WAKE_ACKS), None
+                    self.speak(ack, priority=URGENT)
+                    self.awaiting_command_until = time.time() + COMMAND_TIMEOUT
+                    print("🎤 Listening for command...")
+                return
+
+    def continue_dialog(self, text):
+        """Feed an open slot-filling dialog; True when the text was its answer (or 'stop')"""
+        if not self.dialog.active:
+            return False
+        if not self.is_wake_phrase(text):
+            # The answer to a follow-up question: no wake word, no new routing
+            print(f"Follow-up: {text}")
+            self.dialog.handle(text)
+            return True
+        # "Jarvis, ..." starts over with a new command
+        self.dialog.cancel()
+        return False
+
+    def handle_command(self, text):
+        """Typed commands from the control API: answer an open dialog first, like spoken ones"""
+        if not self.continue_dialog(text):
+            self.process_command(text)
+
+    @property
+    def wake_enrolled(self):
+        spotter = getattr(self.wake_detector, 'spotter', None)
+        return bool(spotter and spotter.templates)
+
+    def is_echo(self, text, result):
+        """Heard text that was part of what we were saying when it was captured"""
+        pattern = re.compile(rf"\b{re.escape(text)}\b")
+        return any(pattern.search(spoken.lower()) for spoken in result.echo)
+
+    def is_wake_phrase(self, text):
+        return any(wake in text for wake in WAKE_PHRASES)
+
+    def check_command_timeout(self):
+        """Give up on a pending command or follow-up question once its listen window has passed"""
+        self.dialog.tick(self.speech.speaking)
+        self.scheduler.tick()
+        if self.registry.refresh():
+            # Edited commands.json/apps.json take effect without a restart
+            self.intent_router = self.build_router()
+            print("🔁 Command registry reloaded")
+        deadline = self.awaiting_command_until
+        if deadline is not None and self.speech.speaking:
+            # The window only starts once the acknowledgement has been spoken
+            self.awaiting_command_until = time.time() + COMMAND_TIMEOUT
+        elif deadline is not None and time.time() > deadline:
+            self.awaiting_command_until = None
+            self.telemetry.incr('command.timeouts')
+            self.speak("I didn't hear anything. Please try again.")
 
     def process_command(self, command):
-        """Process voice commands and execute appropriate actions"""
+        """Route a command and hand it to the scheduler; slow handlers run off this thread"""
         command = command.lower()
+        if CANCEL_PHRASES.match(command):
+            self.stop_commands()
+            return
         
-        self.conversation_context.append(f"User: {command}")
-        
-        # Check for specific command patterns
-        for keyword, handler in self.responses.items():
-            if keyword in command:
-                handler(command)
-                return
-        
-        if any(word in command for word in ['how are you', 'how do you do', 'how are you doing']):
+        with self.telemetry.span('process_command'):
+            self.memory.add_user(command)
+            
+            with self.telemetry.span('route'):
+                match = self.route(command)
+            intent = match.intent if match else None
+            if match and match.handler:
+                self.scheduler.submit(intent, match.handler, command, match.slots)
+            else:
+                # Small talk has no handler of its own; no intent at all means the LLM
+                self.scheduler.submit(intent or 'general_query', self.respond_to, intent, command)
+
+    def route(self, command):
+        """Router's pick, except that 'open'/'launch' followed by a declared app opens that app"""
+        match = self.intent_router.route(command)
+        if match is None or match.intent == 'open_app':
+            return match
+        opener = self.intent_router.route(command, intent='open_app')
+        # "open google maps" / "open messages": the trigger is part of the app's name
+        if opener and opener.start < match.start and self.registry.resolve_app(opener.slots['query']):
+            return opener
+        return match
+
+    def stop_commands(self):
+        """'Stop' / 'cancel': drop running commands and whatever they queued to say"""
+        stopped = self.scheduler.cancel_all()
+        self.speech.interrupt()
+        self.telemetry.incr('command.cancelled', stopped)
+        self.speak("Okay, I've stopped." if stopped else "Okay.", priority=URGENT)
+
+    def _command_progress(self, task):
+        if not self.speech.speaking:
+            self.speak("Still working on it.", priority=LOW)
+
+    def _command_deadline(self, task):
+        self.telemetry.incr('command.deadlines', label=task.intent)
+        self.speak("Sorry, that's taking too long, so I've stopped it.", priority=URGENT)
+
+    def respond_to(self, intent, command):
+        """Small-talk intents without a dedicated handler, then the general query fallback"""
+        if intent == 'how_are_you':
             responses = [
                 "I'm functioning perfectly and feeling quite energetic today! How are you doing?",
                 "All systems are running smoothly, thank you for asking! What about you?",
@@ -285,8 +681,8 @@ class JarvisVoice:
             ]
             response = random.choice(responses)
             self.speak(response)
-            self.conversation_context.append(f"JARVIS: {response}")
-        elif any(word in command for word in ['thank you', 'thanks', 'appreciate']):
+            self.memory.add_reply(response)
+        elif intent == 'thanks':
             responses = [
                 "You're absolutely welcome! It's my pleasure to help you.",
                 "Anytime! I genuinely enjoy assisting you with your tasks.",
@@ -295,71 +691,56 @@ class JarvisVoice:
             ]
             response = random.choice(responses)
             self.speak(response)
-            self.conversation_context.append(f"JARVIS: {response}")
-        elif any(word in command for word in ['who are you', 'what are you', 'introduce yourself']):
+            self.memory.add_reply(response)
+        elif intent == 'identity':
             response = "I'm JARVIS, your personal AI assistant created to make your life easier and more enjoyable. I can help with tasks, answer questions, and have friendly conversations with you!"
             self.speak(response)
-            self.conversation_context.append(f"JARVIS: {response}")
-        elif any(word in command for word in ['help', 'what can you do', 'capabilities']):
+            self.memory.add_reply(response)
+        elif intent == 'help':
             self.list_capabilities()
         else:
             self.handle_general_query(command)
 
-    def get_gpt_response(self, query):
-        """Get intelligent response from GPT API"""
-        if not self.openai_api_key:
-            return None
+    def stream_gpt_response(self, query):
+        """Speak a streamed GPT reply sentence by sentence; returns (text, complete)"""
+        if not self.chat_client:
+            return None, False
             
+        spoken = []
         try:
-            # Prepare conversation context
-            context = "\n".join(self.conversation_context[-6:])  # Last 6 exchanges
-            
-            headers = {
-                'Authorization': f'Bearer {self.openai_api_key}',
-                'Content-Type': 'application/json'
-            }
-            
-            data = {
-                'model': 'gpt-3.5-turbo',
-                'messages': [
-                    {
-                        'role': 'system', 
-                        'content': 'You are JARVIS, a friendly and helpful AI assistant. Keep responses concise (1-2 sentences), conversational, and helpful. You are running on a mobile device in Termux.'
-                    },
-                    {
-                        'role': 'user', 
-                        'content': f"Context: {context}\n\nUser question: {query}"
-                    }
-                ],
-                'max_tokens': 150,
-                'temperature': 0.7
-            }
-            
-            response = requests.post(
-                'https://api.openai.com/v1/chat/completions',
-                headers=headers,
-                json=data,
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result['choices'][0]['message']['content'].strip()
-            else:
-                print(f"API Error: {response.status_code}")
-                return None
-                
+            context = self.memory.context(CONTEXT_TOKEN_BUDGET)
+            for sentence in self.chat_client.stream_sentences(query, context):
+                # Closing the generator on cancel also closes the HTTP stream
+                check_cancelled()
+                self.speak(sentence)
+                spoken.append(sentence)
         except Exception as e:
             print(f"GPT API Error: {e}")
-            return None
+            return " ".join(spoken) or None, False
+        return " ".join(spoken) or None, bool(spoken)
 
     def handle_general_query(self, command):
         """Handle general queries with GPT API or fallback responses"""
-        gpt_response = self.get_gpt_response(command)
+        cache_key = None
+        if is_cacheable(command):
+            cache_key = self.response_cache.key(command, self.cache_fingerprint)
+            cached = self.response_cache.get(cache_key)
+            if cached:
+                # Repeated question: answered without touching the network
+                self.speak(cached)
+                self.memory.add_reply(cached)
+                return
         
-        if gpt_response:
-            self.speak(gpt_response)
-            self.conversation_context.append(f"JARVIS: {gpt_response}")
+        gpt_response, complete = self.stream_gpt_response(command)
+        
+        if complete:
+            if cache_key:
+                self.response_cache.put(cache_key, gpt_response)
+            self.memory.add_reply(gpt_response)
+        elif gpt_response:
+            # Cut off mid-answer: half a reply is neither worth caching nor worth building on
+            self.telemetry.incr('llm.partial_replies')
+            self.speak("Sorry, I lost the connection there.")
         else:
             # Friendly fallback responses
             responses = [
@@ -371,119 +752,132 @@ class JarvisVoice:
             ]
             response = random.choice(responses)
             self.speak(response)
-            self.conversation_context.append(f"JARVIS: {response}")
+            self.memory.add_reply(response)
 
-    def get_time(self, command):
+    def get_time(self, command, slots):
         """Get current time"""
         current_time = datetime.now().strftime("%I:%M %p")
         self.speak(f"The current time is {current_time}")
 
-    def get_date(self, command):
+    def get_date(self, command, slots):
         """Get current date"""
         current_date = datetime.now().strftime("%A, %B %d, %Y")
         self.speak(f"Today is {current_date}")
 
-    def get_weather_info(self, command):
+    def get_weather_info(self, command, slots):
         """Get weather information"""
         self.speak("Let me check the weather for you.")
         # You can integrate with weather API here
         self.speak("I'm still learning to access weather data. Please check your weather app for now.")
 
-    def get_battery_status(self, command):
+    def get_battery_status(self, command, slots):
         """Get battery status"""
-        try:
-            result = subprocess.run(['termux-battery-status'], capture_output=True, text=True)
-            if result.returncode == 0:
-                battery_info = json.loads(result.stdout)
-                percentage = battery_info.get('percentage', 'unknown')
-                status = battery_info.get('status', 'unknown')
-                self.speak(f"Your battery is at {percentage}% and is currently {status}")
-            else:
-                self.speak("I couldn't access battery information right now.")
-        except Exception as e:
-            self.speak("Battery information is not available.")
+        battery_info = self.device.get('battery')
+        if battery_info:
+            percentage = battery_info.get('percentage', 'unknown')
+            status = battery_info.get('status', 'unknown')
+            self.speak(f"Your battery is at {percentage}% and is currently {status}")
+        else:
+            self.speak("I couldn't access battery information right now.")
 
-    def list_apps(self, command):
+    def list_apps(self, command, slots):
         """List installed apps"""
         self.speak("Let me show you your installed applications.")
-        try:
-            # This would integrate with the app launcher
-            self.speak("Opening your app list now.")
-            subprocess.run(['am', 'start', '-a', 'android.intent.action.MAIN', '-c', 'android.intent.category.LAUNCHER'])
-        except:
-            self.speak("I couldn't open the app list right now.")
+        # This would integrate with the app launcher
+        self.speak("Opening your app list now.")
+        self.run_action(self.actions.am('start', '-a', 'android.intent.action.MAIN', '-c', 'android.intent.category.LAUNCHER'),
+                        "I couldn't open the app list right now.")
 
-    def make_call(self, command):
+    def make_call(self, command, slots):
         """Make a phone call"""
-        self.speak("Who would you like to call?")
-        # This would integrate with phone controls
-        self.speak("Phone calling feature is being prepared for you.")
+        contact = slots['query']
+        self.dialog.start(DialogFrame('call', [
+            Slot('contact', "Who would you like to call?",
+                 value=contact if contact and contact not in UNNAMED_CONTACTS else None)
+        ], lambda slots: self._place_call(slots['contact'])))
+
+    def _place_call(self, contact):
+        number = re.sub(r"\D", "", contact)
+        if len(number) >= 3:
+            self.speak(f"Dialing {contact}.")
+            args = ['-d', f'tel:{number}']
+        else:
+            # Contact lookup isn't wired up yet; the dialer lets the user pick the entry
+            self.speak(f"Opening the dialer so you can call {contact}.")
+            args = []
+        self.run_action(self.actions.am('start', '-a', 'android.intent.action.DIAL', *args),
+                        "I couldn't open the dialer right now.")
 
-    def send_message(self, command):
+    def send_message(self, command, slots):
         """Send a message"""
-        self.speak("I can help you send messages. This feature is being set up.")
+        # Only what follows the trigger: "i want to send a message to mom" isn't addressed to "send a..."
+        parts = message_slots(slots['after'])
+        self.dialog.start(DialogFrame('message', [
+            Slot('recipient', "Who should I send it to?", value=parts['recipient'],
+                 parse=lambda answer: MESSAGE_BODY.sub('', answer).strip(" ,.") or None),
+            Slot('body', "What should the message say?", value=parts['body'],
+                 parse=lambda answer: MESSAGE_BODY.sub(r"\1", answer).strip(" ,.") or None)
+        ], lambda slots: self._compose_message(slots['recipient'], slots['body']), extract=message_slots))
 
-    def play_music(self, command):
+    def _compose_message(self, recipient, body):
+        number = re.sub(r"\D", "", recipient)
+        if len(number) >= 3:
+            self.speak(f"Opening a message to {recipient} saying: {body}")
+        else:
+            # Same as _place_call: no contact lookup yet, so the user picks the recipient
+            self.speak(f"Opening a message saying: {body}. Choose {recipient} as the recipient.")
+            number = ''
+        self.run_action(self.actions.am('start', '-a', 'android.intent.action.SENDTO', '-d', f'smsto:{number}',
+                                        '--es', 'sms_body', body),
+                        "I couldn't open messaging right now.")
+
+    def play_music(self, command, slots):
         """Play music"""
         self.speak("Let me play some music for you.")
-        try:
-            subprocess.run(['am', 'start', '-a', 'android.intent.action.VIEW', '-t', 'audio/*'])
-        except:
-            self.speak("I couldn't open the music player right now.")
+        self.run_action(self.actions.am('start', '-a', 'android.intent.action.VIEW', '-t', 'audio/*'),
+                        "I couldn't open the music player right now.")
 
-    def open_camera(self, command):
+    def open_camera(self, command, slots):
         """Open camera"""
         self.speak("Opening camera for you.")
-        try:
-            subprocess.run(['am', 'start', '-a', 'android.media.action.IMAGE_CAPTURE'])
-        except:
-            self.speak("I couldn't open the camera right now.")
+        self.run_action(self.actions.am('start', '-a', 'android.media.action.IMAGE_CAPTURE'),
+                        "I couldn't open the camera right now.")
 
-    def open_calculator(self, command):
+    def open_calculator(self, command, slots):
         """Open calculator"""
-        self.speak("Opening calculator.")
-        try:
-            subprocess.run(['am', 'start', '-n', 'com.android.calculator2/.Calculator'])
-        except:
-            self.speak("I couldn't open the calculator right now.")
+        # APP_CALCULATOR in registry/apps.json opens whichever vendor's calculator is installed
+        self.launch_app(self.registry.resolve_app('calculator'))
+
+    def open_app(self, command, slots):
+        """Open any app declared in the registry, e.g. 'open whats app'"""
+        self.dialog.start(DialogFrame('open_app', [
+            Slot('app', "Which app should I open?", value=slots['query'] or None)
+        ], lambda slots: self.launch_app(self.registry.resolve_app(slots['app']), slots['app'])))
 
-    def open_settings(self, command):
+    def launch_app(self, app, spoken=None):
+        if app is None:
+            self.speak(f"I couldn't find an app called {spoken}.")
+            return
+        self.speak(f"Opening {app.name}.")
+        self.run_action(self.actions.am('start', *app.am_args()), f"I couldn't open {app.name} right now.")
+
+    def open_settings(self, command, slots):
         """Open settings"""
         self.speak("Opening device settings.")
-        try:
-            subprocess.run(['am', 'start', '-a', 'android.settings.SETTINGS'])
-        except:
-            self.speak("I couldn't open settings right now.")
+        self.run_action(self.actions.am('start', '-a', 'android.settings.SETTINGS'),
+                        "I couldn't open settings right now.")
 
-    def tell_joke(self, command):
+    def tell_joke(self, command, slots):
         """Tell a joke"""
-        jokes = [
-            "Why don't scientists trust atoms? Because they make up everything!",
-            "I told my wife she was drawing her eyebrows too high. She looked surprised.",
-            "Why don't programmers like nature? It has too many bugs!",
-            "I'm reading a book about anti-gravity. It's impossible to put down!"
-        ]
-        self.speak(random.choice(jokes))
-
-    def give_compliment(self, command):
+        self.speak(random.choice(JOKES))
+
+    def give_compliment(self, command, slots):
         """Give a compliment"""
-        compliments = [
-            "You're doing great today!",
-            "I appreciate you using me to help with your tasks.",
-            "You have excellent taste in AI assistants!",
-            "You're very smart for choosing JARVIS as your assistant."
-        ]
-        self.speak(random.choice(compliments))
-
-    def say_goodbye(self, command):
+        self.speak(random.choice(COMPLIMENTS))
+
+    def say_goodbye(self, command, slots):
         """Say goodbye"""
-        goodbyes = [
-            "Goodbye! Have a wonderful day!",
-            "See you later! I'll be here when you need me.",
-            "Take care! Call me anytime you need assistance.",
-            "Until next time! Stay awesome!"
-        ]
-        self.speak(random.choice(goodbyes))
+        self.speak(random.choice(GOODBYES))
 
     def list_capabilities(self):
         """List JARVIS capabilities"""
@@ -492,9 +886,21 @@ class JarvisVoice:
         I can also tell jokes, have friendly conversations, answer questions, and learn from our chats. 
         Just talk to me naturally - I'm here to help make your day better!"""
         self.speak(capabilities)
-        self.conversation_context.append(f"JARVIS: {capabilities}")
+        self.memory.add_reply(capabilities)
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="J.A.R.V.I.S voice assistant")
+    parser.add_argument('--fast-start', action='store_true',
+                        help="reuse cached mic calibration and skip the long greeting")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="print an import/init timing breakdown once listening starts")
+    parser.add_argument('--no-metrics', action='store_true',
+                        help="disable voice-loop span timers (event counters stay on)")
+    parser.add_argument('--endpointer', choices=['vad', 'energy'], default=ENDPOINTER,
+                        help="adaptive VAD endpointing, or the fixed energy threshold and 0.8 s pause")
+    args = parser.parse_args()
+    
     print("🎤 J.A.R.V.I.S Voice System Starting...")
     print("🚀 JARVIS is now activated and ready!")
-    jarvis = JarvisVoice()
+    jarvis = JarvisVoice(fast_start=args.fast_start, profiler=StartupProfiler(args.profile_startup),
+                         telemetry=Metrics(enabled=not args.no_metrics), endpointer=args.endpointer)
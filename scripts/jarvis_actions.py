@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+J.A.R.V.I.S action executor
+Persistent shell worker for am/input commands with futures, timeouts and key-event batching
+"""
+import itertools
+import os
+import queue
+import shlex
+import signal
+import subprocess
+import threading
+import time
+from concurrent.futures import Future
+
+from jarvis_metrics import LatencyHistogram
+
+SHELL = 'sh'
+DEFAULT_TIMEOUTS = {
+    'am': 10,
+    'keyevent': 5,
+    'shell': 15,
+}
+
+
+class ActionTimeout(Exception):
+    pass
+
+
+class ActionResult:
+    def __init__(self, returncode, output, duration):
+        self.returncode = returncode
+        self.output = output
+        self.duration = duration
+
+    @property
+    def ok(self):
+        return self.returncode == 0
+
+
+class ShellWorker:
+    """One long-lived shell; commands go in over stdin, a marker line reports each exit code"""
+
+    def __init__(self, shell=SHELL):
+        self.shell = shell
+        self.process = None
+        self._lines = None
+        self._ids = itertools.count()
+        self._start()
+
+    def _start(self):
+        self.process = subprocess.Popen(
+            [self.shell],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            # Own process group, so a timeout can kill whatever the shell is running too
+            start_new_session=True
+        )
+        self._lines = queue.Queue()
+        threading.Thread(target=self._read, args=(self.process, self._lines),
+                         name='jarvis-shell-reader', daemon=True).start()
+
+    @staticmethod
+    def _read(process, lines):
+        for line in process.stdout:
+            lines.put(line)
+        lines.put(None)
+
+    def run(self, argv, timeout):
+        """Run argv in the shell; returns (returncode, output) or raises ActionTimeout"""
+        if self.process.poll() is not None:
+            self._start()
+        marker = f"__JARVIS_DONE_{next(self._ids)}__"
+        command = " ".join(shlex.quote(arg) for arg in argv)
+        # Leading newline: output without a trailing one must not swallow the marker
+        self.process.stdin.write(f"{command} </dev/null 2>&1; printf '\\n%s %d\\n' {marker} $?\n")
+        self.process.stdin.flush()
+
+        output = []
+        deadline = time.time() + timeout
+        while True:
+            try:
+                line = self._lines.get(timeout=max(0.0, deadline - time.time()))
+            except queue.Empty:
+                # A hung command would block every later action: replace the shell
+                self.restart()
+                raise ActionTimeout(f"{argv[0]} timed out after {timeout}s")
+            if line is None:
+                self._start()
+                return 127, "".join(output)
+            if marker in line:
+                # Drop the newline printed ahead of the marker
+                return int(line.split()[-1]), "".join(output)[:-1]
+            output.append(line)
+
+    def restart(self):
+        self.close()
+        self._start()
+
+    def close(self):
+        if self.process and self.process.poll() is None:
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except OSError:
+                self.process.kill()
+            self.process.wait()
+
+
+class ActionExecutor:
+    """Queue of device actions served by persistent shell workers"""
+
+    def __init__(self, workers=1, timeouts=None, shell=SHELL):
+        self.timeouts = dict(DEFAULT_TIMEOUTS, **(timeouts or {}))
+        self.histograms = {}
+        self.counters = {'submitted': 0, 'failed': 0, 'timeouts': 0, 'batched_keyevents': 0}
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._workers = []
+        for i in range(workers):
+            worker = ShellWorker(shell)
+            thread = threading.Thread(target=self._serve, args=(worker,), name=f'jarvis-actions-{i}', daemon=True)
+            thread.start()
+            self._workers.append(worker)
+
+    def submit(self, action, argv, timeout=None):
+        """Queue a command; returns a Future resolving to an ActionResult"""
+        future = Future()
+        self._queue.put((action, list(argv), timeout or self.timeouts.get(action, 10), future, time.time()))
+        with self._lock:
+            self.counters['submitted'] += 1
+        return future
+
+    def am(self, *args):
+        return self.submit('am', ['am'] + list(args))
+
+    def keyevent(self, keycode, repeat=1):
+        return self.submit('keyevent', ['input', 'keyevent'] + [keycode] * repeat)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            histograms = dict(self.histograms)
+        stats['queued'] = self._queue.qsize()
+        stats['latency'] = {action: hist.summary() for action, hist in histograms.items()}
+        return stats
+
+    def stop(self):
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.close()
+
+    def _record(self, action, seconds):
+        with self._lock:
+            hist = self.histograms.get(action)
+            if hist is None:
+                hist = self.histograms[action] = LatencyHistogram()
+        hist.record(seconds)
+
+    def _next_batch(self, pending):
+        """Next job, merged with directly following key events into one `input keyevent` call"""
+        job = pending.pop(0) if pending else self._queue.get()
+        if job is None or job[0] != 'keyevent':
+            return job, [job]
+        jobs = [job]
+        while True:
+            try:
+                follower = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if follower is None or follower[0] != 'keyevent':
+                pending.append(follower)
+                break
+            jobs.append(follower)
+        if len(jobs) == 1:
+            return job, jobs
+        keycodes = [code for j in jobs for code in j[1][2:]]
+        with self._lock:
+            self.counters['batched_keyevents'] += len(jobs) - 1
+        merged = ('keyevent', ['input', 'keyevent'] + keycodes, max(j[2] for j in jobs), None, job[4])
+        return merged, jobs
+
+    def _serve(self, worker):
+        pending = []
+        while True:
+            job, jobs = self._next_batch(pending)
+            if job is None:
+                break
+            action, argv, timeout, _, _ = job
+            start = time.time()
+            try:
+                returncode, output = worker.run(argv, timeout)
+                outcome = ActionResult(returncode, output, time.time() - start)
+                if returncode != 0:
+                    with self._lock:
+                        self.counters['failed'] += 1
+            except ActionTimeout as e:
+                outcome = e
+                with self._lock:
+                    self.counters['timeouts'] += 1
+            except Exception as e:
+                outcome = e
+                with self._lock:
+                    self.counters['failed'] += 1
+            finished = time.time()
+            for _, _, _, future, submitted_at in jobs:
+                # Latency as the caller sees it: queueing plus execution
+                self._record(action, finished - submitted_at)
+                if isinstance(outcome, Exception):
+                    future.set_exception(outcome)
+                else:
+                    future.set_result(outcome)
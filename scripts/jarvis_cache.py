@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+J.A.R.V.I.S response cache
+LRU + TTL cache with a byte cap, optional SQLite persistence and hit/miss metrics
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_PATH = os.getenv('JARVIS_CACHE_PATH', os.path.expanduser('~/.jarvis/response-cache.sqlite'))
+CACHE_TTL = 7 * 24 * 3600
+CACHE_MAX_BYTES = 2 * 1024 * 1024
+
+CONTRACTIONS = {
+    "what's": "what is", "who's": "who is", "where's": "where is", "how's": "how is",
+    "it's": "it is", "that's": "that is", "i'm": "i am", "don't": "do not", "can't": "cannot"
+}
+FILLER_WORDS = {'please', 'jarvis', 'hey', 'hi', 'ok', 'okay', 'so', 'um', 'uh', 'tell', 'me', 'can', 'you'}
+# Answers to these depend on the conversation, so they are never cached
+REFERENTIAL_WORDS = {'it', 'that', 'this', 'they', 'them', 'he', 'she', 'him', 'her', 'there',
+                     'those', 'these', 'again', 'more', 'else'}
+
+
+def normalize_query(query):
+    """Canonical form so trivially different phrasings share one entry"""
+    words = re.findall(r"[a-z0-9']+", query.lower())
+    expanded = []
+    for word in words:
+        expanded.extend(CONTRACTIONS.get(word, word).split())
+    return " ".join(w.strip("'") for w in expanded if w not in FILLER_WORDS)
+
+
+def fingerprint(*parts):
+    """Short stable digest of whatever shapes the answer (model, prompt, user...)"""
+    digest = hashlib.sha1("\x1f".join(str(p) for p in parts).encode('utf-8'))
+    return digest.hexdigest()[:12]
+
+
+def is_cacheable(query):
+    words = set(re.findall(r"[a-z']+", query.lower()))
+    return bool(words) and not (words & REFERENTIAL_WORDS)
+
+
+class ResponseCache:
+    """In-memory LRU with per-entry expiry, mirrored to SQLite when a path is given"""
+
+    def __init__(self, path=None, max_bytes=CACHE_MAX_BYTES, ttl=CACHE_TTL):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.bytes = 0
+        self.metrics = {'hits': 0, 'misses': 0, 'evictions': 0, 'expired': 0, 'stores': 0}
+        self._entries = OrderedDict()  # key -> (value, expires_at, size)
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._open(path)
+
+    def key(self, query, context_fingerprint=""):
+        return f"{context_fingerprint}|{normalize_query(query)}"
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.metrics['misses'] += 1
+                return None
+            value, expires_at, size = entry
+            if expires_at <= now:
+                self._remove(key)
+                self.metrics['expired'] += 1
+                self.metrics['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.metrics['hits'] += 1
+            return value
+
+    def put(self, key, value, ttl=None):
+        size = len(key.encode('utf-8')) + len(value.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        expires_at = time.time() + (ttl or self.ttl)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires_at, size)
+            self.bytes += size
+            self.metrics['stores'] += 1
+            if self._db:
+                self._db.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?)', (key, value, expires_at))
+            self._evict()
+            if self._db:
+                self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.metrics)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self.bytes
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        return stats
+
+    def close(self):
+        with self._lock:
+            if self._db:
+                self._db.close()
+                self._db = None
+
+    def _remove(self, key):
+        _, _, size = self._entries.pop(key)
+        self.bytes -= size
+        if self._db:
+            self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+
+    def _evict(self):
+        while self.bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.metrics['evictions'] += 1
+
+    def _open(self, path):
+        """Load unexpired entries in store order, oldest first, then apply the byte cap"""
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('CREATE TABLE IF NOT EXISTS responses '
+                             '(key TEXT PRIMARY KEY, value TEXT, expires_at REAL)')
+            self._db.execute('DELETE FROM responses WHERE expires_at <= ?', (time.time(),))
+            for key, value, expires_at in self._db.execute(
+                    'SELECT key, value, expires_at FROM responses ORDER BY rowid'):
+                size = len(key.encode('utf-8')) + len(value.encode('utf-8'))
+                self._entries[key] = (value, expires_at, size)
+                self.bytes += size
+            self._evict()
+            self._db.commit()
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️ Response cache persistence disabled: {e}")
+            self._db = None
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+J.A.R.V.I.S local control API (port 8001)
+asyncio HTTP/1.1 keep-alive + WebSocket server running beside the audio loop
+"""
+import base64
+import hashlib
+import json
+import re
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from jarvis_startup import lazy_import
+
+# Imported on the control thread when the server starts, not on the startup path
+asyncio = lazy_import('asyncio')
+
+# Loopback only: the API places calls and sends messages, and its one client (jarvis-server.js) is local
+CONTROL_HOST = '127.0.0.1'
+CONTROL_PORT = 8001
+COMMAND_QUEUE_SIZE = 16
+MAX_CONNECTIONS = 64
+MAX_BODY = 64 * 1024
+IDLE_TIMEOUT = 30
+WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+LOCAL_ORIGIN = re.compile(r"^https?://(localhost|127\.0\.0\.1|\[::1\])(:\d+)?$")
+
+STATUS_TEXT = {200: 'OK', 202: 'Accepted', 204: 'No Content', 400: 'Bad Request', 403: 'Forbidden',
+               404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large', 503: 'Service Unavailable'}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ControlServer:
+    """Routes speak/command/status/metrics to a JarvisVoice-like object without touching its threads"""
+
+    def __init__(self, jarvis, host=CONTROL_HOST, port=CONTROL_PORT, queue_size=COMMAND_QUEUE_SIZE):
+        self.jarvis = jarvis
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self.loop = None
+        self.server = None
+        self.counters = {'requests': 0, 'connections': 0, 'rejected': 0, 'errors': 0, 'ws_messages': 0}
+        self._commands = None
+        self._slots = None
+        self._worker_task = None
+        self._connections = set()
+        self._writers = set()
+        # Blocking calls (handle_command, device reads) never run on the event loop
+        self._command_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='jarvis-control-cmd')
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='jarvis-control-io')
+        self._thread = None
+        self._ready = threading.Event()
+
+    def start(self):
+        """Serve from a background thread; returns once the socket is bound"""
+        self._thread = threading.Thread(target=self._run, name='jarvis-control', daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=5)
+        return self
+
+    def stop(self):
+        if self.loop and self.loop.is_running():
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop).result(timeout=5)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=5)
+
+    async def _shutdown(self):
+        """Close the listener and every open connection so handlers exit on their own"""
+        self.server.close()
+        for writer in list(self._writers):
+            writer.close()
+        if self._connections:
+            await asyncio.wait(list(self._connections), timeout=2)
+        self._worker_task.cancel()
+        await asyncio.gather(self._worker_task, return_exceptions=True)
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._commands = asyncio.Queue(maxsize=self.queue_size)
+        self._slots = asyncio.Semaphore(MAX_CONNECTIONS)
+        try:
+            self.server = self.loop.run_until_complete(
+                asyncio.start_server(self._handle_connection, self.host, self.port))
+            self.port = self.server.sockets[0].getsockname()[1]
+            print(f"🌐 Control API listening on http://localhost:{self.port}")
+        except OSError as e:
+            print(f"⚠️ Control API not available: {e}")
+            self._ready.set()
+            return
+        self._worker_task = self.loop.create_task(self._command_worker())
+        self._ready.set()
+        self.loop.run_forever()
+        self.loop.close()
+
+    async def _command_worker(self):
+        while True:
+            text = await self._commands.get()
+            try:
+                await self.loop.run_in_executor(self._command_pool, self.jarvis.handle_command, text)
+            except Exception as e:
+                self.counters['errors'] += 1
+                print(f"Control command error: {e}")
+
+    # HTTP ------------------------------------------------------------------
+
+    async def _handle_connection(self, reader, writer):
+        if self._slots.locked():
+            self.counters['rejected'] += 1
+            writer.close()
+            return
+        async with self._slots:
+            self.counters['connections'] += 1
+            self._connections.add(asyncio.current_task())
+            self._writers.add(writer)
+            try:
+                while True:
+                    request = await asyncio.wait_for(self._read_request(reader), IDLE_TIMEOUT)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    origin = headers.get('origin')
+                    if origin and not LOCAL_ORIGIN.match(origin):
+                        # A web page in the phone's browser: CORS alone wouldn't stop a simple POST or a WebSocket
+                        raise HttpError(403, 'cross-origin requests are not allowed')
+                    if headers.get('upgrade', '').lower() == 'websocket' and path == '/ws':
+                        await self._websocket(reader, writer, headers)
+                        break
+                    keep_alive = headers.get('connection', '').lower() != 'close'
+                    status, payload = await self._dispatch(method, path, body)
+                    self._write_response(writer, status, payload, keep_alive)
+                    await writer.drain()
+                    if not keep_alive:
+                        break
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                pass
+            except HttpError as e:
+                self._write_response(writer, e.status, {'success': False, 'error': str(e)}, False)
+            finally:
+                self._connections.discard(asyncio.current_task())
+                self._writers.discard(writer)
+                writer.close()
+
+    async def _read_request(self, reader):
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            raise HttpError(413, 'headers too large')
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, path, _ = lines[0].split(' ', 2)
+        except ValueError:
+            raise HttpError(400, 'bad request line')
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get('content-length', 0) or 0)
+            if length < 0:
+                raise ValueError(length)
+        except ValueError:
+            raise HttpError(400, 'bad Content-Length')
+        if length > MAX_BODY:
+            raise HttpError(413, 'body too large')
+        body = await reader.readexactly(length) if length else b''
+        return method.upper(), path.split('?', 1)[0], headers, body
+
+    def _write_response(self, writer, status, payload, keep_alive):
+        if isinstance(payload, str):
+            body, content_type = payload.encode('utf-8'), 'text/plain; version=0.0.4'
+        else:
+            body = b'' if payload is None else json.dumps(payload).encode('utf-8')
+            content_type = 'application/json'
+        head = [
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'OK')}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode('latin-1') + body)
+
+    async def _dispatch(self, method, path, body):
+        self.counters['requests'] += 1
+        routes = {
+            ('POST', '/speak'): self._speak,
+            ('POST', '/command'): self._command,
+            ('GET', '/status'): self._status,
+            ('GET', '/metrics'): self._metrics,
+            ('GET', '/metrics/prometheus'): self._prometheus,
+            ('GET', '/device'): self._device,
+        }
+        handler = routes.get((method, path))
+        if handler is None:
+            known = any(p == path for _, p in routes)
+            return (405, {'success': False, 'error': 'method not allowed'}) if known else \
+                   (404, {'success': False, 'error': 'not found'})
+        try:
+            data = json.loads(body) if body else {}
+        except ValueError:
+            return 400, {'success': False, 'error': 'invalid JSON'}
+        try:
+            return await handler(data)
+        except HttpError as e:
+            return e.status, {'success': False, 'error': str(e)}
+        except Exception as e:
+            self.counters['errors'] += 1
+            return 503, {'success': False, 'error': str(e)}
+
+    # Endpoints ---------------------------------------------------------------
+
+    async def _speak(self, data):
+        text = (data.get('text') or '').strip()
+        if not text:
+            raise HttpError(400, 'text is required')
+        # speak() only enqueues, so it is safe to call from the event loop
+        self.jarvis.speak(text, data.get('language', 'en'))
+        return 202, {'success': True}
+
+    async def _command(self, data):
+        text = (data.get('text') or '').strip().lower()
+        if not text:
+            raise HttpError(400, 'text is required')
+        try:
+            self._commands.put_nowait(text)
+        except asyncio.QueueFull:
+            self.counters['rejected'] += 1
+            raise HttpError(503, 'command queue full')
+        return 202, {'success': True, 'queued': self._commands.qsize()}
+
+    async def _status(self, data):
+        return 200, self.jarvis.status()
+
+    async def _metrics(self, data):
+        metrics = await self.loop.run_in_executor(self._io_pool, self.jarvis.metrics)
+        metrics['control'] = dict(self.counters, command_queue=self._commands.qsize())
+        return 200, metrics
+
+    async def _prometheus(self, data):
+        return 200, self.jarvis.telemetry.prometheus()
+
+    async def _device(self, data):
+        return 200, await self.loop.run_in_executor(self._io_pool, self.jarvis.device.snapshot)
+
+    # WebSocket ---------------------------------------------------------------
+
+    async def _websocket(self, reader, writer, headers):
+        """Minimal RFC 6455 endpoint: JSON text frames like {"type": "speak", "text": "..."}"""
+        key = headers.get('sec-websocket-key')
+        if not key:
+            raise HttpError(400, 'missing Sec-WebSocket-Key')
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode('latin-1'))
+        await writer.drain()
+        while True:
+            opcode, payload = await self._ws_read(reader)
+            if opcode == 0x8:
+                self._ws_write(writer, 0x8, b'')
+                break
+            if opcode == 0x9:
+                self._ws_write(writer, 0xA, payload)
+            elif opcode == 0x1:
+                self.counters['ws_messages'] += 1
+                try:
+                    message = json.loads(payload)
+                    path = {'speak': '/speak', 'command': '/command', 'status': '/status',
+                            'metrics': '/metrics', 'device': '/device'}[message.get('type')]
+                    method = 'POST' if path in ('/speak', '/command') else 'GET'
+                    status, response = await self._dispatch(method, path, payload)
+                except (ValueError, KeyError):
+                    status, response = 400, {'success': False, 'error': 'unknown message'}
+                self._ws_write(writer, 0x1, json.dumps({'status': status, 'body': response}).encode())
+            await writer.drain()
+
+    async def _ws_read(self, reader):
+        first, second = await reader.readexactly(2)
+        opcode = first & 0x0F
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack('!H', await reader.readexactly(2))[0]
+        elif length == 127:
+            length = struct.unpack('!Q', await reader.readexactly(8))[0]
+        if length > MAX_BODY:
+            raise HttpError(413, 'frame too large')
+        mask = await reader.readexactly(4) if second & 0x80 else None
+        payload = await reader.readexactly(length)
+        if mask:
+            payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        return opcode, payload
+
+    @staticmethod
+    def _ws_write(writer, opcode, payload):
+        length = len(payload)
+        if length < 126:
+            header = struct.pack('!BB', 0x80 | opcode, length)
+        elif length < 65536:
+            header = struct.pack('!BBH', 0x80 | opcode, 126, length)
+        else:
+            header = struct.pack('!BBQ', 0x80 | opcode, 127, length)
+        writer.write(header + payload)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+J.A.R.V.I.S device status provider
+Per-sensor TTL cache over termux-* commands with request coalescing and a background poller
+"""
+import json
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+
+COMMAND_TIMEOUT = 10
+ERROR_TTL = 5          # failed reads are retried at most this often
+POLL_INTERVAL = 5
+IDLE_AFTER = 300       # stop polling a sensor nobody asked about for this long
+
+SENSORS = {
+    'battery': (['termux-battery-status'], 60),
+    'wifi': (['termux-wifi-connectioninfo'], 30),
+}
+
+
+class SensorReading:
+    __slots__ = ('value', 'error', 'fetched_at', 'duration')
+
+    def __init__(self, value=None, error=None, fetched_at=None, duration=0.0):
+        self.value = value
+        self.error = error
+        self.fetched_at = fetched_at or time.time()
+        self.duration = duration
+
+    def age(self, now=None):
+        return (now or time.time()) - self.fetched_at
+
+
+class DeviceStatus:
+    """Concurrent callers for the same sensor share one in-flight subprocess"""
+
+    def __init__(self, sensors=None, poll_interval=POLL_INTERVAL, idle_after=IDLE_AFTER):
+        self.sensors = dict(sensors or SENSORS)
+        self.poll_interval = poll_interval
+        self.idle_after = idle_after
+        self.counters = {'hits': 0, 'misses': 0, 'coalesced': 0, 'spawns': 0, 'errors': 0}
+        self._cache = {}
+        self._inflight = {}
+        self._last_requested = {}
+        self._lock = threading.Lock()
+        self._running = False
+        self._poller = None
+
+    def start(self):
+        self._running = True
+        self._poller = threading.Thread(target=self._poll_loop, name='jarvis-device-poller', daemon=True)
+        self._poller.start()
+        return self
+
+    def stop(self):
+        self._running = False
+
+    def get(self, name, max_age=None):
+        """Parsed JSON for a sensor, or None when the command is unavailable"""
+        return self.read(name, max_age).value
+
+    def read(self, name, max_age=None, _poll=False):
+        command, ttl = self.sensors[name]
+        max_age = ttl if max_age is None else max_age
+        with self._lock:
+            if not _poll:
+                self._last_requested[name] = time.time()
+            reading = self._cache.get(name)
+            if reading is not None:
+                limit = ERROR_TTL if reading.error else max_age
+                if reading.age() < limit:
+                    self.counters['hits'] += 1
+                    return reading
+            future = self._inflight.get(name)
+            owner = future is None
+            if owner:
+                future = self._inflight[name] = Future()
+                self.counters['misses'] += 1
+            else:
+                self.counters['coalesced'] += 1
+
+        if owner:
+            reading = self._run(command)
+            with self._lock:
+                self._cache[name] = reading
+                del self._inflight[name]
+            future.set_result(reading)
+            return reading
+        return future.result(timeout=COMMAND_TIMEOUT + 1)
+
+    def snapshot(self, max_age=None):
+        """JSON-ready view of every sensor, served from cache when fresh"""
+        result = {'timestamp': datetime.now().isoformat()}
+        for name in self.sensors:
+            reading = self.read(name, max_age)
+            result[name] = reading.value
+            if reading.error:
+                result.setdefault('errors', {})[name] = reading.error
+        return result
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            for name, reading in self._cache.items():
+                stats[f'{name}.age_s'] = round(reading.age(), 1)
+                stats[f'{name}.spawn_ms'] = round(reading.duration * 1000, 1)
+        return stats
+
+    def _run(self, command):
+        with self._lock:
+            self.counters['spawns'] += 1
+        start = time.time()
+        try:
+            result = subprocess.run(command, capture_output=True, text=True, timeout=COMMAND_TIMEOUT)
+            if result.returncode != 0:
+                raise RuntimeError(result.stderr.strip() or f"exit status {result.returncode}")
+            value = json.loads(result.stdout)
+            return SensorReading(value, fetched_at=start, duration=time.time() - start)
+        except Exception as e:
+            with self._lock:
+                self.counters['errors'] += 1
+            return SensorReading(error=str(e) or type(e).__name__, fetched_at=start,
+                                 duration=time.time() - start)
+
+    def _poll_loop(self):
+        """Refresh sensors shortly before they expire, but only while someone is asking"""
+        while self._running:
+            now = time.time()
+            for name, (_, ttl) in self.sensors.items():
+                with self._lock:
+                    requested = self._last_requested.get(name)
+                    reading = self._cache.get(name)
+                if requested is None or now - requested > self.idle_after:
+                    continue
+                if reading is None or reading.age(now) > ttl * 0.8:
+                    self.read(name, max_age=ttl * 0.8, _poll=True)
+            time.sleep(self.poll_interval)
+
+
+if __name__ == '__main__':
+    json.dump(DeviceStatus().snapshot(), sys.stdout, indent=2)
+    print()
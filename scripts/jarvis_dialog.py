@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+J.A.R.V.I.S multi-turn dialog
+Slot-filling frames: ask for what's missing, take the answer without a wake word, merge slots across turns
+"""
+import re
+import threading
+import time
+
+FOLLOW_UP_TIMEOUT = 8  # seconds to answer a follow-up question once it has been asked
+MAX_RETRIES = 1
+CANCEL_PHRASES = re.compile(r"^(cancel|never mind|nevermind|forget it|stop|no thanks)\b")
+
+
+class Slot:
+    """One piece of information a command needs; parse() returns None when the answer doesn't fit"""
+
+    def __init__(self, name, prompt, parse=None, value=None):
+        self.name = name
+        self.prompt = prompt
+        self.parse = parse or (lambda text: text.strip(" ,.?!") or None)
+        self.value = value
+
+    @property
+    def filled(self):
+        return self.value is not None
+
+
+class DialogFrame:
+    """An intent waiting on slots; extract() may pull several slots out of any one answer"""
+
+    def __init__(self, intent, slots, on_complete, extract=None):
+        self.intent = intent
+        self.slots = slots
+        self.on_complete = on_complete
+        self.extract = extract
+        self.retries = 0
+        self.turns = 0
+
+    @property
+    def missing(self):
+        return next((slot for slot in self.slots if not slot.filled), None)
+
+    def values(self):
+        return {slot.name: slot.value for slot in self.slots}
+
+    def merge(self, values):
+        """Fill any still-missing slots the answer happened to mention"""
+        for slot in self.slots:
+            if not slot.filled and values.get(slot.name):
+                slot.value = values[slot.name]
+
+
+class DialogManager:
+    """At most one open frame; driven from the dispatch thread, so nothing here blocks capture"""
+
+    def __init__(self, speak, timeout=FOLLOW_UP_TIMEOUT, max_retries=MAX_RETRIES):
+        self.speak = speak
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.frame = None
+        self.expires_at = None
+        self.counters = {'started': 0, 'completed': 0, 'follow_ups': 0, 'retries': 0,
+                         'timeouts': 0, 'cancelled': 0, 'abandoned': 0}
+        self._lock = threading.Lock()
+
+    @property
+    def active(self):
+        return self.frame is not None
+
+    def start(self, frame):
+        """Run the frame now if nothing is missing, otherwise ask for the first missing slot"""
+        with self._lock:
+            self.counters['started'] += 1
+            self.frame = frame
+            slot = frame.missing
+            if slot is None:
+                self.frame = None
+            else:
+                self.expires_at = time.time() + self.timeout
+        if slot is None:
+            self._complete(frame)
+        else:
+            self.speak(slot.prompt)
+
+    def handle(self, text):
+        """Feed a follow-up utterance into the open frame"""
+        with self._lock:
+            frame = self.frame
+            if frame is None:
+                return False
+            if CANCEL_PHRASES.match(text):
+                self.frame = None
+                self.counters['cancelled'] += 1
+                outcome = 'cancelled'
+            else:
+                frame.turns += 1
+                self.counters['follow_ups'] += 1
+                asked = frame.missing
+                if frame.extract:
+                    frame.merge(frame.extract(text))
+                if not asked.filled:
+                    asked.value = asked.parse(text)
+                if frame.missing is None:
+                    self.frame = None
+                    outcome = 'complete'
+                elif frame.missing is asked:
+                    outcome = self._retry_locked(frame)
+                else:
+                    self.expires_at = time.time() + self.timeout
+                    outcome = 'next'
+        self._respond(frame, outcome)
+        return True
+
+    def retry(self):
+        """Recognition failed on a follow-up: re-ask instead of dropping the frame"""
+        with self._lock:
+            frame = self.frame
+            if frame is None:
+                return
+            outcome = self._retry_locked(frame)
+        self._respond(frame, outcome)
+
+    def _retry_locked(self, frame):
+        frame.retries += 1
+        self.counters['retries'] += 1
+        if frame.retries > self.max_retries:
+            self.frame = None
+            self.counters['abandoned'] += 1
+            return 'abandoned'
+        self.expires_at = time.time() + self.timeout
+        return 'retry'
+
+    def _respond(self, frame, outcome):
+        if outcome == 'complete':
+            self._complete(frame)
+        elif outcome == 'cancelled':
+            self.speak("Okay, cancelled.")
+        elif outcome == 'abandoned':
+            self.speak("Sorry, I still didn't get that. Let's try again later.")
+        elif outcome == 'retry':
+            self.speak(f"Sorry, I didn't catch that. {frame.missing.prompt}")
+        else:
+            self.speak(frame.missing.prompt)
+
+    def tick(self, speaking=False):
+        """Expire the open frame; the answer window only starts once the prompt has been spoken"""
+        with self._lock:
+            if self.frame is None:
+                return
+            if speaking:
+                self.expires_at = time.time() + self.timeout
+                return
+            if time.time() <= self.expires_at:
+                return
+            self.frame = None
+            self.counters['timeouts'] += 1
+        self.speak("I didn't hear an answer, so I've dropped that.")
+
+    def cancel(self):
+        with self._lock:
+            if self.frame is not None:
+                self.frame = None
+                self.counters['cancelled'] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats['open'] = self.frame.intent if self.frame else None
+        return stats
+
+    def _complete(self, frame):
+        self.counters['completed'] += 1
+        frame.on_complete(frame.values())
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+J.A.R.V.I.S replay harness
+Drives JarvisVoice headless from text or audio corpora: stub TTS, scripted recognition, dry-run actions
+"""
+import array
+import audioop
+import collections
+import importlib.util
+import json
+import os
+import queue
+import random
+import threading
+import time
+import wave
+from concurrent.futures import Future
+
+from jarvis_actions import ActionResult
+from jarvis_metrics import LatencyHistogram
+from jarvis_recognition import RecognitionBackend, RecognitionChain
+from jarvis_speech import NORMAL, SpeechQueue
+
+VOICE_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'jarvis-voice.py')
+REPLAY_RATE = 16000
+REPLAY_WIDTH = 2
+REPLAY_CHUNK = 1024
+RESULT_TIMEOUT = 10  # seconds of wall time to wait for one utterance
+LEAD_IN_SECONDS = 1.0  # room tone before the first clip, where a live session has its greeting
+
+DEFAULT_COMMANDS = [
+    "what time is it", "what's the date today", "how's the weather", "check my battery",
+    "battery status please", "what wifi am i on", "open camera", "open calculator", "open settings",
+    "open google chrome", "open google maps", "open messages",
+    "play some music", "volume up three times", "volume down", "turn the brightness up",
+    "tell me a joke", "give me a compliment", "how are you", "thanks", "who are you", "help",
+    "search for pizza places", "take a note buy milk", "remind me to call mom",
+    "what did i note about milk", "remind me to stretch in 20 minutes",
+    "list my apps", "call someone", "send a message", "goodbye",
+]
+
+
+def synthetic_corpus(count, seed=17):
+    rng = random.Random(seed)
+    return [{'text': rng.choice(DEFAULT_COMMANDS)} for _ in range(count)]
+
+
+def load_corpus(path):
+    """One command per line, or JSONL {"text": ..., "audio": "clip.wav"}; '#' starts a comment"""
+    corpus = []
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            entry = json.loads(line) if line.startswith('{') else {'text': line}
+            if entry.get('audio'):
+                entry['audio'] = os.path.join(base, entry['audio'])
+            corpus.append(entry)
+    return corpus
+
+
+def load_wav_pcm(path, sample_rate=REPLAY_RATE, sample_width=REPLAY_WIDTH):
+    """WAV file converted to mono PCM at the replay microphone's format"""
+    with wave.open(path, 'rb') as wav:
+        data = wav.readframes(wav.getnframes())
+        width, channels, rate = wav.getsampwidth(), wav.getnchannels(), wav.getframerate()
+    if channels > 1:
+        data = audioop.tomono(data, width, 0.5, 0.5)
+    if width != sample_width:
+        data = audioop.lin2lin(data, width, sample_width)
+    if rate != sample_rate:
+        data, _ = audioop.ratecv(data, sample_width, 1, rate, sample_rate, None)
+    return data
+
+
+_synthetic_cache = {}
+
+
+def synthetic_utterance(text, sample_rate=REPLAY_RATE):
+    """Speech-shaped noise: one loud burst per word, well above the default energy threshold"""
+    words = max(1, len(text.split()))
+    if words not in _synthetic_cache:
+        rng = random.Random(words)
+        samples = array.array('h')
+        word_len, gap_len = int(sample_rate * 0.3), int(sample_rate * 0.08)
+        for _ in range(words):
+            samples.extend(int(max(-32767, min(32767, rng.gauss(0, 4000)))) for _ in range(word_len))
+            samples.extend(0 for _ in range(gap_len))
+        _synthetic_cache[words] = samples.tobytes()
+    return _synthetic_cache[words]
+
+
+class ReplayMicrophone:
+    """sr.Microphone stand-in: plays queued clips, silence in between, paced at `speed` x real time"""
+
+    def __init__(self, sample_rate=REPLAY_RATE, sample_width=REPLAY_WIDTH, chunk=REPLAY_CHUNK, speed=4.0):
+        self.SAMPLE_RATE = sample_rate
+        self.SAMPLE_WIDTH = sample_width
+        self.CHUNK = chunk
+        self.speed = speed
+        self.stream = self
+        self.clip_ended_at = None
+        self._clips = collections.deque()
+        self._current = None
+        self._offset = 0
+        self._next_frame = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self._next_frame = time.time()
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def play(self, pcm):
+        with self._lock:
+            self._clips.append(pcm)
+
+    def read(self, frames):
+        # Pace like a real device so the ring buffer and segmenter see realistic frame timing
+        self._next_frame += frames / float(self.SAMPLE_RATE) / self.speed
+        delay = self._next_frame - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        size = frames * self.SAMPLE_WIDTH
+        with self._lock:
+            if self._current is None and self._clips:
+                self._current, self._offset = self._clips.popleft(), 0
+            if self._current is None:
+                return b'\0' * size
+            data = self._current[self._offset:self._offset + size]
+            self._offset += size
+            if self._offset >= len(self._current):
+                self._current = None
+                self.clip_ended_at = time.time()
+        return data + b'\0' * (size - len(data))
+
+
+class ScriptedBackend(RecognitionBackend):
+    """Mock recognizer: returns the transcripts it was told to expect, in order, after a fixed delay"""
+
+    name = 'scripted'
+    offline = True
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self._expected = collections.deque()
+        self._lock = threading.Lock()
+
+    def expect(self, text):
+        with self._lock:
+            self._expected.append(text)
+
+    def recognize(self, audio, on_partial=None):
+        if self.delay:
+            time.sleep(self.delay)
+        with self._lock:
+            text = self._expected.popleft() if self._expected else None
+        return (text, 1.0) if text else None
+
+
+class SilentSpeechQueue(SpeechQueue):
+    """The real speech queue with synthesis replaced by an optional per-character sleep"""
+
+    def __init__(self, seconds_per_char=0.0):
+        super().__init__(use_pyttsx3=False)
+        self.seconds_per_char = seconds_per_char
+        self.items = []
+
+    def say(self, text, language='en', priority=NORMAL):
+        item = super().say(text, language, priority)
+        self.items.append(item)
+        return item
+
+    def _synthesize(self, item):
+        self._mark_started()
+        end = time.time() + len(item.text) * self.seconds_per_char
+        while not item.cancelled and time.time() < end:
+            time.sleep(min(0.01, end - time.time()))
+
+
+class DryRunActions:
+    """ActionExecutor stand-in: records am/input calls and reports success without running them"""
+
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, action, argv, timeout=None):
+        self.calls.append((action, list(argv)))
+        future = Future()
+        future.set_result(ActionResult(0, '', 0.0))
+        return future
+
+    def am(self, *args):
+        return self.submit('am', args)
+
+    def keyevent(self, keycode, repeat=1):
+        return self.submit('keyevent', [keycode] * repeat)
+
+    def stats(self):
+        return {'dry_run_calls': len(self.calls)}
+
+    def stop(self):
+        pass
+
+
+class StaticDevice:
+    """DeviceStatus stand-in with fixed readings, so handlers never spawn termux-* commands"""
+
+    READINGS = {
+        'battery': {'percentage': 80, 'status': 'DISCHARGING'},
+        'wifi': {'ssid': 'replay-net', 'rssi': -50},
+    }
+
+    def start(self):
+        return self
+
+    def stop(self):
+        pass
+
+    def get(self, name, max_age=None):
+        return self.READINGS.get(name)
+
+    def snapshot(self):
+        return dict(self.READINGS)
+
+    def stats(self):
+        return {}
+
+
+def load_voice_module():
+    """jarvis-voice.py isn't importable by name (hyphen), so load it from its path"""
+    spec = importlib.util.spec_from_file_location('jarvis_voice', VOICE_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_jarvis(microphone=None, recognition=None, speech=None, telemetry=None, live_llm=False):
+    """A constructed but not started JarvisVoice wired to stand-ins for every side effect"""
+    from jarvis_cache import ResponseCache
+    from jarvis_notes import NoteStore
+    from jarvis_registry import REGISTRY_DIR, Registry
+    from jarvis_wakeword import PassThroughDetector
+
+    voice = load_voice_module()
+    jarvis = voice.JarvisVoice(
+        telemetry=telemetry,
+        microphone=microphone or ReplayMicrophone(),
+        recognition=recognition or RecognitionChain([ScriptedBackend()]),
+        speech=speech or SilentSpeechQueue(),
+        actions=DryRunActions(),
+        device=StaticDevice(),
+        wake_detector=PassThroughDetector(),
+        notes=NoteStore(),
+        # In-memory cache and the bundled registry only: nothing under ~/.jarvis is read or created
+        response_cache=ResponseCache(),
+        registry=Registry(directories=(REGISTRY_DIR,)),
+        autostart=False
+    )
+    jarvis.calibration_seconds = 0
+    if not live_llm:
+        jarvis.chat_client = None
+    return jarvis
+
+
+class ReplayReport:
+    """End-to-end latency from the harness's point of view, next to the voice loop's own spans"""
+
+    def __init__(self):
+        self.stages = collections.defaultdict(LatencyHistogram)
+        self.counts = collections.Counter()
+        self.elapsed = 0.0
+
+    def record(self, stage, seconds):
+        if seconds is not None:
+            self.stages[stage].record(max(0.0, seconds))
+
+    def summary(self, telemetry=None):
+        summary = {
+            'utterances': self.counts['utterances'],
+            'throughput_per_s': round(self.counts['utterances'] / self.elapsed, 1) if self.elapsed else 0.0,
+            'counts': dict(self.counts),
+            'stages': {name: hist.summary() for name, hist in sorted(self.stages.items())},
+        }
+        if telemetry is not None:
+            summary['spans'] = telemetry.snapshot()['spans']
+        return summary
+
+
+def wait_for_replies(speech, first_item, timeout=RESULT_TIMEOUT):
+    """Wait until every utterance queued since `first_item` was spoken; returns them"""
+    deadline = time.time() + timeout
+    seen = first_item
+    while True:
+        items = speech.items[first_item:]
+        for item in items[seen - first_item:]:
+            item.wait(max(0.0, deadline - time.time()))
+        seen = first_item + len(items)
+        # A handler may queue a follow-up while the first reply is still playing
+        if len(speech.items) == seen or time.time() > deadline:
+            return items
+
+
+def replay_text(jarvis, corpus):
+    """Commands straight into process_command: routing, handlers and TTS without audio"""
+    report = ReplayReport()
+    start = time.time()
+    for entry in corpus:
+        first_item = len(jarvis.speech.items)
+        sent_at = time.time()
+        jarvis.process_command(entry['text'])
+        # Slow intents finish on scheduler pools after process_command returns
+        jarvis.scheduler.wait_idle(RESULT_TIMEOUT)
+        replies = wait_for_replies(jarvis.speech, first_item)
+        done_at = time.time()
+        report.counts['utterances'] += 1
+        started = [item.started_at for item in replies if item.started_at]
+        report.record('first_reply', min(started) - sent_at if started else None)
+        report.record('end_to_end', done_at - sent_at)
+    report.elapsed = time.time() - start
+    return report
+
+
+def replay_audio(jarvis, corpus, backend=None, wake_word='jarvis'):
+    """Clips through the microphone, pipeline, recognizer and dispatch, one utterance at a time"""
+    microphone = jarvis.microphone
+    results = queue.Queue()
+    handle_recognition = jarvis.handle_recognition
+
+    def handle(result):
+        handle_recognition(result)
+        results.put((result, time.time()))
+
+    jarvis.handle_recognition = handle
+    jarvis.listen_for_wake_word()
+    microphone.play(b'\0' * int(LEAD_IN_SECONDS * microphone.SAMPLE_RATE) * microphone.SAMPLE_WIDTH)
+    timeout = RESULT_TIMEOUT / min(1.0, microphone.speed)
+
+    report = ReplayReport()
+    start = time.time()
+    for entry in corpus:
+        text = entry['text']
+        if backend is not None:
+            backend.expect(text if wake_word in text else f"{wake_word} {text}")
+        pcm = load_wav_pcm(entry['audio']) if entry.get('audio') else synthetic_utterance(text)
+        first_item = len(jarvis.speech.items)
+        microphone.play(pcm)
+        report.counts['utterances'] += 1
+        try:
+            result, dispatched_at = results.get(timeout=timeout)
+        except queue.Empty:
+            report.counts['timeouts'] += 1
+            continue
+        if not result.ok:
+            report.counts[result.error if result.error in ('unknown', 'dropped', 'gated') else 'errors'] += 1
+            continue
+        # Slow intents finish on scheduler pools after process_command returns
+        jarvis.scheduler.wait_idle(RESULT_TIMEOUT)
+        replies = wait_for_replies(jarvis.speech, first_item)
+        done_at = time.time()
+        spoken_at = microphone.clip_ended_at
+        started = [item.started_at for item in replies if item.started_at]
+        report.record('endpoint_and_recognize', dispatched_at - spoken_at)
+        report.record('first_reply', min(started) - spoken_at if started else None)
+        report.record('end_to_end', done_at - spoken_at)
+    report.elapsed = time.time() - start
+    jarvis.pipeline.stop()
+    return report
+
+
+def compare(summary, baseline, tolerance=0.2):
+    """Stages whose p95 got more than `tolerance` slower than the baseline report"""
+    regressions = []
+    for section in ('stages', 'spans'):
+        for name, current in summary.get(section, {}).items():
+            before = baseline.get(section, {}).get(name)
+            if not before or not before.get('count'):
+                continue
+            # Ignore sub-millisecond noise; a regression has to be noticeable
+            if current['p95_ms'] > before['p95_ms'] * (1 + tolerance) and current['p95_ms'] - before['p95_ms'] > 1:
+                regressions.append((name, before['p95_ms'], current['p95_ms']))
+    return regressions
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+J.A.R.V.I.S intent router
+Token-level Aho-Corasick automaton with word-boundary matching and priorities
+"""
+import re
+from collections import deque
+
+TOKEN_RE = re.compile(r"[a-z0-9']+")
+FILLER_WORDS = {'for', 'a', 'an', 'the', 'to', 'about', 'me', 'please', 'that', 'of'}
+
+
+def tokenize(text):
+    """Lowercase word tokens; 'update' never contains the token 'date'"""
+    return TOKEN_RE.findall(text.lower())
+
+
+class IntentPhrase:
+    """One trigger phrase registered for an intent"""
+
+    def __init__(self, intent, tokens, priority, order):
+        self.intent = intent
+        self.tokens = tokens
+        self.priority = priority
+        self.order = order
+
+    @property
+    def text(self):
+        return " ".join(self.tokens)
+
+
+class IntentMatch:
+    """Winning intent for a command plus the slots around the trigger phrase, cut from the command's own text"""
+
+    def __init__(self, intent, handler, phrase, start, end, command):
+        self.intent = intent
+        self.handler = handler
+        self.phrase = phrase
+        self.start = start
+        self.end = end
+        spans = [m.span() for m in TOKEN_RE.finditer(command.lower())]
+        tokens = [command[a:b].lower() for a, b in spans]
+        lead = end
+        while lead < len(tokens) and tokens[lead] in FILLER_WORDS:
+            lead += 1
+        # Character offsets rather than re-joined tokens, so "5:30" or "mom's" survive
+        self.slots = {
+            'before': command[:spans[start][0]].strip(" ,."),
+            'after': command[spans[end - 1][1]:].strip(" ,."),
+            'query': command[spans[lead][0]:].strip(" ,.") if lead < len(spans) else ""
+        }
+
+    def __repr__(self):
+        return f"IntentMatch({self.intent!r}, phrase={self.phrase!r}, slots={self.slots})"
+
+
+class IntentRouter:
+    """Compiled multi-phrase matcher: one pass over the command's tokens"""
+
+    def __init__(self):
+        self.handlers = {}
+        self.phrases = []
+        self._compiled = False
+        self._goto = []
+        self._fail = []
+        self._out = []
+
+    def add(self, intent, phrases, handler=None, priority=0):
+        """Register trigger phrases for an intent; higher priority wins"""
+        if isinstance(phrases, str):
+            phrases = [phrases]
+        self.handlers[intent] = handler
+        for phrase in phrases:
+            tokens = tokenize(phrase)
+            if tokens:
+                self.phrases.append(IntentPhrase(intent, tokens, priority, len(self.phrases)))
+        self._compiled = False
+        return self
+
+    def compile(self):
+        """Build the goto/fail/output tables; called lazily on first route"""
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for entry in self.phrases:
+            node = 0
+            for token in entry.tokens:
+                nxt = self._goto[node].get(token)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][token] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(entry)
+
+        pending = deque(self._goto[0].values())
+        while pending:
+            node = pending.popleft()
+            for token, child in self._goto[node].items():
+                pending.append(child)
+                fail = self._fail[node]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(token, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+        self._compiled = True
+
+    def match_all(self, command):
+        """Every (phrase, start, end) occurrence in the command, in scan order"""
+        if not self._compiled:
+            self.compile()
+        tokens = tokenize(command)
+        matches = []
+        node = 0
+        for position, token in enumerate(tokens):
+            while node and token not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(token, 0)
+            for entry in self._out[node]:
+                matches.append((entry, position + 1 - len(entry.tokens), position + 1))
+        return matches, tokens
+
+    def route(self, command, intent=None):
+        """Best intent for a command, or None when nothing matches; intent restricts it to that one's phrases"""
+        matches = self.match_all(command)[0]
+        if intent is not None:
+            matches = [m for m in matches if m[0].intent == intent]
+        if not matches:
+            return None
+        # Highest priority, then the phrase that starts first ("remind me to take a note" is a
+        # reminder), then longest phrase, then registration order
+        entry, start, end = max(
+            matches,
+            key=lambda m: (m[0].priority, -m[1], len(m[0].tokens), -m[0].order)
+        )
+        return IntentMatch(entry.intent, self.handlers.get(entry.intent), entry.text,
+                           start, end, command)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+J.A.R.V.I.S chat completion client
+Pooled keep-alive session with retry/backoff and streamed (SSE) sentence chunks
+"""
+import json
+import os
+import re
+
+API_BASE = os.getenv('OPENAI_BASE_URL', 'https://api.openai.com/v1')
+MODEL = os.getenv('JARVIS_LLM_MODEL', 'gpt-3.5-turbo')
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 10
+SYSTEM_PROMPT = ('You are JARVIS, a friendly and helpful AI assistant. Keep responses concise (1-2 sentences), '
+                 'conversational, and helpful. You are running on a mobile device in Termux.')
+
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+MIN_CHUNK_CHARS = 20  # don't hand TTS tiny fragments like "Sure."
+
+
+class ChatClient:
+    """Long-lived client: one TLS handshake, then keep-alive for every query"""
+
+    def __init__(self, api_key, base_url=API_BASE, model=MODEL, retries=2, backoff=0.5):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.model = model
+        # Imported here: requests is slow to import and only needed once a key is configured
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['POST']),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Authorization': f'Bearer {api_key}',
+            'Content-Type': 'application/json'
+        })
+
+    def _payload(self, query, context, stream):
+        return {
+            'model': self.model,
+            'messages': [
+                {'role': 'system', 'content': SYSTEM_PROMPT},
+                {'role': 'user', 'content': f"Context: {context}\n\nUser question: {query}"}
+            ],
+            'max_tokens': 150,
+            'temperature': 0.7,
+            'stream': stream
+        }
+
+    def complete(self, query, context=""):
+        """Whole completion in one response, or None on failure"""
+        response = self.session.post(
+            f"{self.base_url}/chat/completions",
+            json=self._payload(query, context, stream=False),
+            timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
+        )
+        if response.status_code != 200:
+            print(f"API Error: {response.status_code}")
+            return None
+        return response.json()['choices'][0]['message']['content'].strip()
+
+    def stream_deltas(self, query, context=""):
+        """Yield content deltas as the server sends them"""
+        with self.session.post(
+            f"{self.base_url}/chat/completions",
+            json=self._payload(query, context, stream=True),
+            timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+            stream=True
+        ) as response:
+            if response.status_code != 200:
+                print(f"API Error: {response.status_code}")
+                return
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith('data:'):
+                    continue
+                data = line[5:].strip()
+                if data == '[DONE]':
+                    # Keep reading to the end of the body so the connection returns to the pool
+                    continue
+                try:
+                    delta = json.loads(data)['choices'][0].get('delta', {})
+                except (ValueError, KeyError, IndexError):
+                    continue
+                if delta.get('content'):
+                    yield delta['content']
+
+    def stream_sentences(self, query, context=""):
+        """Yield sentence-sized chunks so TTS can start before the completion ends"""
+        buffer = ""
+        for delta in self.stream_deltas(query, context):
+            buffer += delta
+            parts = SENTENCE_END.split(buffer)
+            if len(parts) < 2:
+                continue
+            ready, buffer = " ".join(parts[:-1]).strip(), parts[-1]
+            if len(ready) < MIN_CHUNK_CHARS:
+                buffer = f"{ready} {buffer}"
+                continue
+            yield ready
+        if buffer.strip():
+            yield buffer.strip()
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+J.A.R.V.I.S conversation memory
+Bounded turn ring with token estimates, rolling summary and optional session log
+"""
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+
+MAX_TURNS = 32              # turns kept verbatim
+SUMMARY_TOKENS = 120        # cap on the rolling summary of older turns
+CONTEXT_TOKEN_BUDGET = 300  # default prompt context size
+SESSION_DIR = os.getenv('JARVIS_SESSION_DIR', os.path.expanduser('~/.jarvis/sessions'))
+
+SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+
+
+def estimate_tokens(text):
+    """Cheap BPE-ish estimate: about four characters per token"""
+    return max(1, (len(text) + 3) // 4)
+
+
+def extractive_summary(summary, turn, max_tokens=SUMMARY_TOKENS):
+    """Default summarizer: keep the first sentence of each user turn, newest last"""
+    if turn.role != 'User':
+        return summary
+    first = SENTENCE_RE.split(turn.text.strip(), 1)[0]
+    topics = [t for t in summary.split("; ") if t] + [first]
+    while len(topics) > 1 and estimate_tokens("; ".join(topics)) > max_tokens:
+        topics.pop(0)
+    return "; ".join(topics)
+
+
+class Turn:
+    __slots__ = ('role', 'text', 'tokens', 'timestamp')
+
+    def __init__(self, role, text, timestamp=None):
+        self.role = role
+        self.text = text
+        self.tokens = estimate_tokens(f"{role}: {text}")
+        self.timestamp = timestamp or time.time()
+
+    def line(self):
+        return f"{self.role}: {self.text}"
+
+
+class ConversationMemory:
+    """Fixed-size memory: old turns are folded into a summary instead of piling up"""
+
+    def __init__(self, max_turns=MAX_TURNS, summarizer=extractive_summary, log_path=None):
+        self.turns = deque()
+        self.max_turns = max_turns
+        self.summarizer = summarizer
+        self.summary = ""
+        self.log_path = log_path
+        self._lock = threading.Lock()
+        self._log = None
+        if log_path:
+            try:
+                os.makedirs(os.path.dirname(log_path) or '.', exist_ok=True)
+                self._log = open(log_path, 'a', buffering=1)
+            except OSError as e:
+                print(f"⚠️ Session log disabled: {e}")
+
+    def add(self, role, text):
+        turn = Turn(role, text)
+        with self._lock:
+            self.turns.append(turn)
+            while len(self.turns) > self.max_turns:
+                self.summary = self.summarizer(self.summary, self.turns.popleft())
+            if self._log:
+                self._log.write(json.dumps({'t': round(turn.timestamp, 1), 'r': role[0], 'x': text},
+                                           separators=(',', ':')) + "\n")
+
+    def add_user(self, text):
+        self.add('User', text)
+
+    def add_reply(self, text):
+        self.add('JARVIS', text)
+
+    def context(self, budget=CONTEXT_TOKEN_BUDGET):
+        """Newest turns that fit the token budget, oldest first, summary on top if room"""
+        lines = []
+        used = 0
+        with self._lock:
+            for turn in reversed(self.turns):
+                if used + turn.tokens > budget:
+                    break
+                lines.append(turn.line())
+                used += turn.tokens
+            summary = self.summary
+        lines.reverse()
+        if summary:
+            summary_line = f"Earlier topics: {summary}"
+            if used + estimate_tokens(summary_line) <= budget:
+                lines.insert(0, summary_line)
+        return "\n".join(lines)
+
+    def __len__(self):
+        return len(self.turns)
+
+    def close(self):
+        if self._log:
+            self._log.close()
+            self._log = None
+
+
+def session_log_path(directory=SESSION_DIR):
+    return os.path.join(directory, time.strftime('%Y-%m-%d') + '.jsonl')
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+J.A.R.V.I.S metrics primitives
+HDR-style latency histograms, span timers, counters and JSON/Prometheus export
+"""
+import functools
+import threading
+import time
+
+
+class LatencyHistogram:
+    """HDR-style histogram: log-linear microsecond buckets, constant memory, ~3% percentile error"""
+
+    SUB_BITS = 5  # 32 linear sub-buckets per power of two
+    HALF = 1 << (SUB_BITS - 1)
+    MAX_SHIFT = 32  # tracks up to ~37 hours
+    SIZE = (MAX_SHIFT + 2) * HALF
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.buckets = [0] * self.SIZE
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @classmethod
+    def bucket_index(cls, us):
+        shift = us.bit_length() - cls.SUB_BITS
+        if shift <= 0:
+            return us
+        return min(shift * cls.HALF + (us >> shift), cls.SIZE - 1)
+
+    @classmethod
+    def bucket_upper(cls, index):
+        """Exclusive upper bound of a bucket, in microseconds"""
+        if index < 2 * cls.HALF:
+            return index + 1
+        shift = index // cls.HALF - 1
+        return (index - shift * cls.HALF + 1) << shift
+
+    def record(self, seconds):
+        us = int(seconds * 1e6) if seconds > 0 else 0
+        index = self.bucket_index(us)
+        ms = seconds * 1000.0
+        with self._lock:
+            self.buckets[index] += 1
+            self.count += 1
+            self.total += ms
+            if ms > self.max:
+                self.max = ms
+
+    def percentile(self, fraction):
+        """Upper bound (ms) of the bucket holding the given fraction of samples"""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            target = fraction * self.count
+            seen = 0
+            for index, count in enumerate(self.buckets):
+                seen += count
+                if count and seen >= target:
+                    return round(min(self.bucket_upper(index) / 1000.0, self.max), 3)
+            return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'avg_ms': round(self.total / self.count, 1) if self.count else 0.0,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': round(self.max, 1)
+        }
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Times a with-block into a histogram; exceptions are counted, never swallowed"""
+
+    __slots__ = ('metrics', 'key', 'histogram', 'start')
+
+    def __init__(self, metrics, key, histogram):
+        self.metrics = metrics
+        self.key = key
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.record(time.perf_counter() - self.start)
+        if exc_type is not None:
+            self.metrics.incr(self.key[0] + '.errors', label=self.key[1])
+        return False
+
+
+class Metrics:
+    """Named span histograms and event counters for the voice loop; cheap enough to leave on"""
+
+    def __init__(self, enabled=True, namespace='jarvis'):
+        self.enabled = enabled
+        self.namespace = namespace
+        self.histograms = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name, label=None):
+        key = (name, label)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(key, LatencyHistogram())
+        return histogram
+
+    def span(self, name, label=None):
+        """with metrics.span('recognize'): ...  (a shared no-op when disabled)"""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, (name, label), self.histogram(name, label))
+
+    def timed(self, name, label=None):
+        """Decorator form of span()"""
+        def wrap(func):
+            @functools.wraps(func)
+            def run(*args, **kwargs):
+                with self.span(name, label):
+                    return func(*args, **kwargs)
+            return run
+        return wrap
+
+    def observe(self, name, seconds, label=None):
+        """Record a duration measured elsewhere, e.g. from timestamps on a queued item"""
+        if self.enabled and seconds is not None:
+            self.histogram(name, label).record(seconds)
+
+    def incr(self, name, amount=1, label=None):
+        # Counters stay on even when spans are disabled: they're the error signal
+        key = (name, label)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def snapshot(self):
+        """JSON-friendly dump: {'spans': {'handler[battery]': {...}}, 'counters': {...}}"""
+        with self._lock:
+            histograms = list(self.histograms.items())
+            counters = dict(self.counters)
+        return {
+            'spans': {_display_name(key): histogram.summary() for key, histogram in sorted(histograms, key=_sort_key)},
+            'counters': {_display_name(key): value for key, value in sorted(counters.items(), key=_sort_key)}
+        }
+
+    def prometheus(self):
+        """Prometheus text exposition format (spans as summaries, counters as one labelled counter)"""
+        with self._lock:
+            histograms = sorted(self.histograms.items(), key=_sort_key)
+            counters = sorted(self.counters.items(), key=_sort_key)
+        span_metric = f"{self.namespace}_span_seconds"
+        lines = [f"# HELP {span_metric} Time spent in each voice-loop stage",
+                 f"# TYPE {span_metric} summary"]
+        for (name, label), histogram in histograms:
+            labels = _labels(span=name, label=label)
+            for quantile in (0.5, 0.95, 0.99):
+                value = histogram.percentile(quantile) / 1000.0
+                lines.append(f'{span_metric}{{{labels},quantile="{quantile}"}} {value:.6f}')
+            lines.append(f"{span_metric}_sum{{{labels}}} {histogram.total / 1000.0:.6f}")
+            lines.append(f"{span_metric}_count{{{labels}}} {histogram.count}")
+        event_metric = f"{self.namespace}_events_total"
+        lines += [f"# HELP {event_metric} Timeouts, unrecognized audio, errors and other events",
+                  f"# TYPE {event_metric} counter"]
+        for (name, label), value in counters:
+            lines.append(f"{event_metric}{{{_labels(event=name, label=label)}}} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _display_name(key):
+    name, label = key
+    return f"{name}[{label}]" if label is not None else name
+
+
+def _sort_key(item):
+    name, label = item[0]
+    return name, label or ''
+
+
+def _labels(**labels):
+    parts = []
+    for key, value in labels.items():
+        if value is not None:
+            escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            parts.append(f'{key}="{escaped}"')
+    return ",".join(parts)
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+J.A.R.V.I.S notes and reminders
+SQLite (WAL) store with full-text search, reminder time parsing and a heap-based reminder scheduler
+"""
+import heapq
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+NOTES_PATH = os.getenv('JARVIS_NOTES_PATH', os.path.expanduser('~/.jarvis/notes.sqlite'))
+LEGACY_NOTES_PATH = 'jarvis_notes.txt'
+DEFAULT_REMINDER_HOUR = 9  # "remind me tomorrow" with no time
+SEARCH_STOPWORDS = {'what', 'did', 'i', 'note', 'notes', 'noted', 'about', 'my', 'the', 'a', 'an', 'find',
+                    'search', 'for', 'any', 'do', 'have', 'on', 'of', 'write', 'wrote', 'down', 'show'}
+
+NUMBER_WORDS = {'a': 1, 'an': 1, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6,
+                'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10, 'fifteen': 15, 'twenty': 20,
+                'thirty': 30, 'forty': 40, 'forty five': 45, 'fifty': 50, 'sixty': 60}
+UNIT_SECONDS = {'second': 1, 'sec': 1, 'minute': 60, 'min': 60, 'hour': 3600, 'day': 86400}
+
+RELATIVE_TIME = re.compile(r"\bin (half an hour|(\d+|%s) (second|sec|minute|min|hour|day)s?)\b"
+                           % "|".join(sorted(NUMBER_WORDS, key=len, reverse=True)))
+CLOCK_TIME = re.compile(r"\bat (noon|midnight|(\d{1,2})(?::(\d{2}))?\s*(a\.?m\.?|p\.?m\.?)?)(?!\w)")
+TOMORROW = re.compile(r"\btomorrow\b")
+REMINDER_LEAD = re.compile(r"^(please )?(set (a |me a )?reminder( to| for)?|remind me( to| about)?)\s*")
+
+
+class Note:
+    def __init__(self, note_id, created_at, text):
+        self.id = note_id
+        self.created_at = created_at
+        self.text = text
+
+    def __repr__(self):
+        return f"Note({self.id}, {self.text!r})"
+
+
+class Reminder:
+    def __init__(self, reminder_id, due_at, text):
+        self.id = reminder_id
+        self.due_at = due_at
+        self.text = text
+
+    def __lt__(self, other):
+        return (self.due_at, self.id) < (other.due_at, other.id)
+
+    def __repr__(self):
+        return f"Reminder({self.id}, due={datetime.fromtimestamp(self.due_at):%Y-%m-%d %H:%M}, {self.text!r})"
+
+
+class NoteStore:
+    """Append-only notes with an FTS5 index and a reminders table; nothing is loaded at open"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.fts = True
+        self.metrics = {'notes_added': 0, 'searches': 0, 'reminders_added': 0, 'reminders_fired': 0}
+        self._lock = threading.Lock()
+        self._db = self._open(path)
+
+    def add(self, text, created_at=None):
+        with self._lock:
+            cursor = self._db.execute('INSERT INTO notes (created_at, text) VALUES (?, ?)',
+                                      (created_at or time.time(), text))
+            self._db.commit()
+            self.metrics['notes_added'] += 1
+            return cursor.lastrowid
+
+    def search(self, query, limit=5):
+        """Best matching notes, most relevant first; every word must match (prefixes count)"""
+        terms = [t for t in re.findall(r"[a-z0-9]+", query.lower()) if t not in SEARCH_STOPWORDS]
+        if not terms:
+            return self.recent(limit)
+        with self._lock:
+            self.metrics['searches'] += 1
+            if self.fts:
+                match = " AND ".join(f'"{term}"*' for term in terms)
+                rows = self._db.execute(
+                    'SELECT n.id, n.created_at, n.text FROM notes_fts f JOIN notes n ON n.id = f.rowid '
+                    'WHERE notes_fts MATCH ? ORDER BY bm25(notes_fts), n.id DESC LIMIT ?', (match, limit))
+            else:
+                clause = " AND ".join("text LIKE ?" for _ in terms)
+                rows = self._db.execute(f'SELECT id, created_at, text FROM notes WHERE {clause} '
+                                        'ORDER BY id DESC LIMIT ?', [f"%{t}%" for t in terms] + [limit])
+            return [Note(*row) for row in rows.fetchall()]
+
+    def recent(self, limit=5):
+        with self._lock:
+            rows = self._db.execute('SELECT id, created_at, text FROM notes ORDER BY id DESC LIMIT ?', (limit,))
+            return [Note(*row) for row in rows.fetchall()]
+
+    def add_reminder(self, text, due_at):
+        with self._lock:
+            cursor = self._db.execute('INSERT INTO reminders (created_at, due_at, text) VALUES (?, ?, ?)',
+                                      (time.time(), due_at, text))
+            self._db.commit()
+            self.metrics['reminders_added'] += 1
+            return Reminder(cursor.lastrowid, due_at, text)
+
+    def pending_reminders(self):
+        with self._lock:
+            rows = self._db.execute('SELECT id, due_at, text FROM reminders WHERE fired_at IS NULL ORDER BY due_at')
+            return [Reminder(*row) for row in rows.fetchall()]
+
+    def mark_fired(self, reminder_id):
+        with self._lock:
+            self._db.execute('UPDATE reminders SET fired_at = ? WHERE id = ?', (time.time(), reminder_id))
+            self._db.commit()
+            self.metrics['reminders_fired'] += 1
+
+    def import_text_log(self, path):
+        """One-time migration of the old "[timestamp] text" notes file; returns notes imported"""
+        entries = []
+        with open(path) as f:
+            for line in f:
+                match = re.match(r"\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\] (.*)", line.rstrip('\n'))
+                if match:
+                    stamp = datetime.strptime(match.group(1), "%Y-%m-%d %H:%M:%S").timestamp()
+                    entries.append((stamp, match.group(2)))
+        with self._lock:
+            self._db.executemany('INSERT INTO notes (created_at, text) VALUES (?, ?)', entries)
+            self._db.commit()
+        os.replace(path, path + '.imported')
+        return len(entries)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.metrics)
+            stats['pending_reminders'] = self._db.execute(
+                'SELECT COUNT(*) FROM reminders WHERE fired_at IS NULL').fetchone()[0]
+        stats['full_text'] = self.fts
+        return stats
+
+    def close(self):
+        with self._lock:
+            if self._db:
+                self._db.close()
+                self._db = None
+
+    def _open(self, path):
+        if path:
+            try:
+                os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+                db = sqlite3.connect(path, check_same_thread=False)
+                db.execute('PRAGMA journal_mode=WAL')
+            except (OSError, sqlite3.Error) as e:
+                print(f"⚠️ Notes database unavailable, keeping notes in memory: {e}")
+                db = sqlite3.connect(':memory:', check_same_thread=False)
+        else:
+            db = sqlite3.connect(':memory:', check_same_thread=False)
+        # Appends are the hot path; WAL + NORMAL sync makes each one a single sequential write
+        db.execute('PRAGMA synchronous=NORMAL')
+        db.execute('CREATE TABLE IF NOT EXISTS notes (id INTEGER PRIMARY KEY, created_at REAL, text TEXT)')
+        db.execute('CREATE TABLE IF NOT EXISTS reminders '
+                   '(id INTEGER PRIMARY KEY, created_at REAL, due_at REAL, text TEXT, fired_at REAL)')
+        db.execute('CREATE INDEX IF NOT EXISTS reminders_pending ON reminders (due_at) WHERE fired_at IS NULL')
+        try:
+            db.execute("CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(text, content='notes', content_rowid='id')")
+            db.execute('CREATE TRIGGER IF NOT EXISTS notes_ai AFTER INSERT ON notes BEGIN '
+                       'INSERT INTO notes_fts (rowid, text) VALUES (new.id, new.text); END')
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: fall back to a LIKE scan
+            self.fts = False
+        db.commit()
+        return db
+
+
+def parse_number(word):
+    return int(word) if word.isdigit() else NUMBER_WORDS.get(word)
+
+
+def clock_due(clock, now, tomorrow=False):
+    """Next datetime for a CLOCK_TIME match, or None when it isn't a real time ("at 5:75")"""
+    if clock.group(1) in ('noon', 'midnight'):
+        hour, minute = (12 if clock.group(1) == 'noon' else 0), 0
+    else:
+        hour, minute = int(clock.group(2)), int(clock.group(3) or 0)
+        if hour > 23 or minute > 59:
+            return None
+        meridiem = (clock.group(4) or '').replace('.', '')
+        if meridiem == 'pm' and hour < 12:
+            hour += 12
+        elif meridiem == 'am' and hour == 12:
+            hour = 0
+        elif (not meridiem and hour < 12 and now.replace(hour=hour, minute=minute) <= now
+              and now.replace(hour=hour + 12, minute=minute) > now):
+            # "at 5" in the afternoon means 5 pm, not tomorrow morning; "at 11" at 23:30 is tomorrow morning
+            hour += 12
+    due = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if tomorrow or due <= now:
+        due += timedelta(days=1)
+    return due
+
+
+def parse_reminder(command, now=None):
+    """Split "remind me to X in 10 minutes" into (text, due_at); due_at is None if no time was given"""
+    now = now or datetime.now()
+    text = command.lower().strip()
+    due = None
+
+    relative = RELATIVE_TIME.search(text)
+    clock = CLOCK_TIME.search(text)
+    tomorrow = TOMORROW.search(text)
+    if relative:
+        if relative.group(1) == 'half an hour':
+            seconds = 1800
+        else:
+            seconds = parse_number(relative.group(2)) * UNIT_SECONDS[relative.group(3)]
+        due = now + timedelta(seconds=seconds)
+        text = text[:relative.start()] + text[relative.end():]
+    elif clock:
+        # An impossible time is dropped and asked for again, like no time at all
+        due = clock_due(clock, now, tomorrow)
+        text = text[:clock.start()] + text[clock.end():]
+    if due is None and tomorrow:
+        due = (now + timedelta(days=1)).replace(hour=DEFAULT_REMINDER_HOUR, minute=0, second=0, microsecond=0)
+    if tomorrow:
+        text = TOMORROW.sub('', text)
+
+    text = REMINDER_LEAD.sub('', re.sub(r"\s+", " ", text).strip()).strip(" ,.")
+    return text, due.timestamp() if due else None
+
+
+class ReminderScheduler:
+    """Timer thread over a min-heap: sleeps until the earliest reminder is due, never polls"""
+
+    def __init__(self, on_due):
+        self.on_due = on_due
+        self._heap = []
+        self._cancelled = set()
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='jarvis-reminders', daemon=True)
+        self._thread.start()
+        return self
+
+    def schedule(self, reminder):
+        with self._cond:
+            heapq.heappush(self._heap, reminder)
+            # Only an earlier deadline changes how long the timer thread should sleep
+            if self._heap[0] is reminder:
+                self._cond.notify()
+
+    def cancel(self, reminder_id):
+        with self._cond:
+            self._cancelled.add(reminder_id)
+            self._cond.notify()
+
+    def pending(self):
+        with self._cond:
+            return sorted(r for r in self._heap if r.id not in self._cancelled)
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout=2)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and self._heap and self._heap[0].id in self._cancelled:
+                    self._cancelled.discard(heapq.heappop(self._heap).id)
+                if not self._running:
+                    return
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                delay = self._heap[0].due_at - time.time()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                reminder = heapq.heappop(self._heap)
+            try:
+                self.on_due(reminder)
+            except Exception as e:
+                print(f"Reminder error: {e}")
+
+
+def main(argv):
+    """Search notes from the shell: jarvis_notes.py [--reminders] [query ...]"""
+    store = NoteStore(NOTES_PATH)
+    if argv[:1] == ['--reminders']:
+        for reminder in store.pending_reminders():
+            print(reminder)
+    else:
+        for note in store.search(" ".join(argv)):
+            print(f"[{datetime.fromtimestamp(note.created_at):%Y-%m-%d %H:%M}] {note.text}")
+    store.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+J.A.R.V.I.S streaming audio pipeline
+Capture -> ring buffer -> phrase segmenter -> recognition pool -> dispatcher
+"""
+import audioop
+import collections
+import itertools
+import queue
+import threading
+import time
+
+FRAME_CHUNK = 1024          # samples per captured frame
+RING_SECONDS = 20           # audio kept in the capture ring buffer
+RECOGNITION_WORKERS = 2
+RECOGNITION_QUEUE_SIZE = 4  # phrases waiting for a recognition worker
+DISPATCH_TICK = 0.5         # seconds between dispatcher idle ticks
+STOP_TIMEOUT = 3.0          # total seconds stop() waits for the stages; a stuck recognizer is left behind
+ECHO_HISTORY = 8            # recent spoken lines kept to stamp phrases captured over them
+
+
+class PipelineStats:
+    """Thread-safe counters for every pipeline stage"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def high_water(self, name, value):
+        with self._lock:
+            if value > self._counters.get(name, 0):
+                self._counters[name] = value
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._counters)
+
+
+class FrameRing:
+    """Bounded ring of fixed-size audio frames; the writer never blocks"""
+
+    def __init__(self, capacity, stats=None):
+        self.capacity = capacity
+        self.stats = stats or PipelineStats()
+        self._slots = [None] * capacity
+        self._head = 0   # next slot to read
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def put(self, frame, timestamp=None, suppressed=False):
+        """Store a frame, overwriting the oldest one when the ring is full"""
+        with self._cond:
+            tail = (self._head + self._size) % self.capacity
+            self._slots[tail] = (timestamp or time.time(), frame, suppressed)
+            if self._size == self.capacity:
+                self._head = (self._head + 1) % self.capacity
+                self.stats.incr('capture.overruns')
+            else:
+                self._size += 1
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Pop the oldest (timestamp, frame, suppressed) entry, or None on timeout/close"""
+        with self._cond:
+            if not self._size and not self._closed:
+                self._cond.wait(timeout)
+            if not self._size:
+                return None
+            item = self._slots[self._head]
+            self._slots[self._head] = None
+            self._head = (self._head + 1) % self.capacity
+            self._size -= 1
+            return item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __len__(self):
+        with self._cond:
+            return self._size
+
+
+class RecognitionResult:
+    """Outcome of one recognized phrase, delivered in capture order"""
+
+    def __init__(self, seq, text=None, error=None, audio=None, captured_at=None,
+                 during_speech=False, echo=()):
+        self.seq = seq
+        self.text = text
+        self.error = error          # None, 'unknown', 'dropped', 'gated' or an exception string
+        self.audio = audio
+        self.captured_at = captured_at
+        self.during_speech = during_speech  # captured while JARVIS itself was talking
+        self.echo = echo                    # what JARVIS was saying while it was captured
+
+    @property
+    def ok(self):
+        return self.text is not None
+
+
+class PhraseSegmenter:
+    """Energy-based phrase detection over raw frames, mirroring sr.Recognizer.listen"""
+
+    adaptive = False
+
+    def __init__(self, recognizer, sample_rate, sample_width, chunk=FRAME_CHUNK,
+                 phrase_time_limit=15):
+        self.recognizer = recognizer
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.chunk = chunk
+        self.phrase_time_limit = phrase_time_limit
+        self.reset()
+
+    @property
+    def seconds_per_frame(self):
+        return float(self.chunk) / self.sample_rate
+
+    def reset(self):
+        self._frames = []
+        self._preroll = []
+        self._silent = 0
+        self._started_at = None
+        self._flagged = False
+
+    def feed(self, frame, timestamp, flagged=False):
+        """Feed one frame; returns (audio_bytes, started_at, flagged) when a phrase completes"""
+        spf = self.seconds_per_frame
+        pause_frames = int(self.recognizer.pause_threshold / spf) + 1
+        preroll_frames = int(self.recognizer.non_speaking_duration / spf) + 1
+        min_frames = int(self.recognizer.phrase_threshold / spf) + 1
+        limit_frames = int(self.phrase_time_limit / spf) if self.phrase_time_limit else None
+
+        energy = audioop.rms(frame, self.sample_width)
+        loud = energy > self.recognizer.energy_threshold
+
+        if self._started_at is None:
+            self._preroll.append(frame)
+            if len(self._preroll) > preroll_frames:
+                self._preroll.pop(0)
+            if loud:
+                self._frames = list(self._preroll)
+                self._preroll = []
+                self._silent = 0
+                self._started_at = timestamp
+                self._flagged = flagged
+            return None
+
+        self._frames.append(frame)
+        self._flagged = self._flagged or flagged
+        self._silent = 0 if loud else self._silent + 1
+        done = self._silent > pause_frames
+        if limit_frames and len(self._frames) >= limit_frames:
+            done = True
+        if not done:
+            return None
+
+        frames, started_at, silent, flagged = self._frames, self._started_at, self._silent, self._flagged
+        self.reset()
+        if len(frames) - silent < min_frames:
+            return None
+        return b"".join(frames), started_at, flagged
+
+    def snapshot(self):
+        return {}
+
+
+class AudioPipeline:
+    """Decoupled capture, recognition and dispatch stages with backpressure counters"""
+
+    def __init__(self, microphone, recognizer, recognize, on_result, on_tick=None, gate=None,
+                 barge_in=False, workers=RECOGNITION_WORKERS, queue_size=RECOGNITION_QUEUE_SIZE,
+                 ring_seconds=RING_SECONDS, phrase_time_limit=15, metrics=None,
+                 segmenter_factory=PhraseSegmenter):
+        self.microphone = microphone
+        self.recognizer = recognizer
+        self.recognize = recognize
+        self.on_result = on_result
+        self.on_tick = on_tick
+        self.gate = gate
+        self.barge_in = barge_in
+        self.workers = workers
+        self.queue_size = queue_size
+        self.ring_seconds = ring_seconds
+        self.phrase_time_limit = phrase_time_limit
+        self.metrics = metrics
+        self.segmenter_factory = segmenter_factory
+
+        self.stats = PipelineStats()
+        self.running = False
+        self.suppressed = threading.Event()
+        self._spoken = collections.deque(maxlen=ECHO_HISTORY)  # [started, ended or None, text]
+        self._spoken_lock = threading.Lock()
+        self.source = None
+        self.ring = None
+        self.segmenter = None
+        self._seq = itertools.count()
+        self._recognition_queue = queue.Queue(maxsize=queue_size)
+        self._dispatch_queue = queue.Queue()
+        self._threads = []
+
+    def start(self, calibrate=2):
+        """Open the microphone once and start every stage"""
+        self.source = self.microphone.__enter__()
+        if calibrate:
+            self.recognizer.adjust_for_ambient_noise(self.source, duration=calibrate)
+
+        chunk = getattr(self.source, 'CHUNK', FRAME_CHUNK)
+        capacity = max(1, int(self.ring_seconds * self.source.SAMPLE_RATE / chunk))
+        self.ring = FrameRing(capacity, self.stats)
+        self.segmenter = self.segmenter_factory(self.recognizer, self.source.SAMPLE_RATE,
+                                                self.source.SAMPLE_WIDTH, chunk,
+                                                self.phrase_time_limit)
+        self.running = True
+
+        targets = [('jarvis-capture', self._capture_loop),
+                   ('jarvis-segmenter', self._segment_loop),
+                   ('jarvis-dispatch', self._dispatch_loop)]
+        targets += [(f'jarvis-recognize-{i}', self._recognize_loop) for i in range(self.workers)]
+        for name, target in targets:
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """Stop all stages and release the microphone"""
+        if not self.running:
+            return
+        self.running = False
+        self.ring.close()
+        sentinels = self.workers
+        while sentinels:
+            try:
+                self._recognition_queue.put_nowait(None)
+                sentinels -= 1
+            except queue.Full:
+                # Phrases nobody will dispatch any more: make room for the sentinels
+                try:
+                    self._recognition_queue.get_nowait()
+                except queue.Empty:
+                    pass
+        self._dispatch_queue.put(None)
+        deadline = time.time() + STOP_TIMEOUT
+        for thread in self._threads:
+            # Daemon threads: one blocked in a cloud request is abandoned rather than waited for
+            thread.join(timeout=max(0.0, deadline - time.time()))
+        self._threads = []
+        try:
+            self.microphone.__exit__(None, None, None)
+        except Exception as e:
+            print(f"Microphone close error: {e}")
+
+    def speech_started(self, text):
+        """JARVIS started talking: flag captured frames and remember what was said, and when"""
+        with self._spoken_lock:
+            self._spoken.append([time.time(), None, text])
+        self.suppressed.set()
+
+    def speech_finished(self):
+        self.suppressed.clear()
+        with self._spoken_lock:
+            if self._spoken and self._spoken[-1][1] is None:
+                self._spoken[-1][1] = time.time()
+
+    def spoken_between(self, start, end):
+        """Lines JARVIS was saying at any point between two capture timestamps"""
+        with self._spoken_lock:
+            return tuple(text for started, ended, text in self._spoken
+                         if started <= end and (ended is None or ended >= start))
+
+    def snapshot(self):
+        """Counters plus current queue depths for every stage"""
+        stats = self.stats.snapshot()
+        stats['capture.ring_depth'] = len(self.ring) if self.ring else 0
+        stats['recognize.queue_depth'] = self._recognition_queue.qsize()
+        stats['dispatch.queue_depth'] = self._dispatch_queue.qsize()
+        if self.segmenter:
+            stats.update(self.segmenter.snapshot())
+        return stats
+
+    def _capture_loop(self):
+        """Read fixed-size frames forever; never waits on downstream stages"""
+        chunk = self.segmenter.chunk
+        while self.running:
+            try:
+                frame = self.source.stream.read(chunk)
+            except Exception as e:
+                self.stats.incr('capture.errors')
+                print(f"Capture error: {e}")
+                time.sleep(0.1)
+                continue
+            if not frame:
+                continue
+            self.ring.put(frame, suppressed=self.suppressed.is_set())
+            self.stats.incr('capture.frames')
+
+    def _segment_loop(self):
+        while self.running:
+            item = self.ring.get(timeout=DISPATCH_TICK)
+            if item is None:
+                continue
+            timestamp, frame, suppressed = item
+            if suppressed:
+                self.stats.incr('segment.suppressed_frames')
+                if not (self.barge_in() if callable(self.barge_in) else self.barge_in):
+                    # Our own speech: keep the mic hot but don't recognize it
+                    self.segmenter.reset()
+                    continue
+            phrase = self.segmenter.feed(frame, timestamp, suppressed)
+            if phrase is not None:
+                self.stats.incr('segment.phrases')
+                if self.metrics:
+                    self.metrics.observe('listen', timestamp - phrase[1])
+                # Stamped now: by dispatch time the line we overheard has usually finished
+                echo = self.spoken_between(phrase[1], timestamp) if phrase[2] else ()
+                self._submit(*phrase, echo=echo)
+
+    def _submit(self, frame_data, started_at, during_speech, echo=()):
+        import speech_recognition as sr
+        audio = sr.AudioData(frame_data, self.segmenter.sample_rate, self.segmenter.sample_width)
+        job = (next(self._seq), audio, started_at, during_speech, echo)
+        while True:
+            try:
+                self._recognition_queue.put_nowait(job)
+                break
+            except queue.Full:
+                # Backpressure: shed the oldest waiting phrase, keep the newest
+                try:
+                    stale = self._recognition_queue.get_nowait()
+                except queue.Empty:
+                    continue
+                if stale is not None:
+                    self.stats.incr('recognize.dropped')
+                    self._dispatch_queue.put(RecognitionResult(stale[0], error='dropped'))
+        self.stats.incr('recognize.queued')
+        self.stats.high_water('recognize.queue_high_water', self._recognition_queue.qsize())
+
+    def _recognize_loop(self):
+        while True:
+            job = self._recognition_queue.get()
+            if job is None:
+                break
+            seq, audio, started_at, during_speech, echo = job
+            context = dict(audio=audio, captured_at=started_at, during_speech=during_speech, echo=echo)
+            # Every sequence number must produce a result, or the in-order dispatcher waits on it forever
+            try:
+                result = self._recognize_job(seq, audio, during_speech, context)
+            except Exception as e:
+                result = RecognitionResult(seq, error=str(e), **context)
+                self.stats.incr('recognize.errors')
+            self._dispatch_queue.put(result)
+
+    def _recognize_job(self, seq, audio, during_speech, context):
+        if self.gate is not None and not self.gate(audio, during_speech):
+            # Rejected locally: never reaches a recognition backend
+            self.stats.incr('recognize.gated')
+            return RecognitionResult(seq, error='gated', captured_at=context['captured_at'],
+                                     during_speech=during_speech, echo=context['echo'])
+        self.stats.incr('recognize.in_flight')
+        try:
+            text = self.recognize(audio)
+        finally:
+            self.stats.incr('recognize.in_flight', -1)
+        if text:
+            self.stats.incr('recognize.ok')
+            return RecognitionResult(seq, text, **context)
+        self.stats.incr('recognize.unknown')
+        return RecognitionResult(seq, error='unknown', **context)
+
+    def _dispatch_loop(self):
+        """Deliver results strictly in capture order"""
+        pending = {}
+        next_seq = 0
+        while self.running:
+            try:
+                result = self._dispatch_queue.get(timeout=DISPATCH_TICK)
+            except queue.Empty:
+                result = False
+            if result is None:
+                break
+            if result:
+                pending[result.seq] = result
+                self.stats.high_water('dispatch.reorder_high_water', len(pending))
+            while next_seq in pending:
+                result = pending.pop(next_seq)
+                next_seq += 1
+                try:
+                    self.on_result(result)
+                    self.stats.incr('dispatch.delivered')
+                except Exception as e:
+                    self.stats.incr('dispatch.errors')
+                    print(f"Dispatch error: {e}")
+            if self.on_tick:
+                try:
+                    self.on_tick()
+                except Exception as e:
+                    print(f"Dispatch tick error: {e}")
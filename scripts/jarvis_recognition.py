@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+J.A.R.V.I.S speech recognition backends
+Warm local engine first, cloud fallback on low confidence, per-backend metrics
+"""
+import json
+import os
+import sys
+import threading
+import time
+
+from jarvis_metrics import LatencyHistogram
+
+RECOGNIZERS = os.getenv('JARVIS_RECOGNIZERS', 'vosk,google')
+VOSK_MODEL = os.getenv('JARVIS_VOSK_MODEL', os.path.expanduser('~/.jarvis/vosk-model'))
+MIN_CONFIDENCE = float(os.getenv('JARVIS_MIN_CONFIDENCE', '0.6'))
+VOSK_RATE = 16000
+VOSK_CHUNK = 4000  # bytes fed per step; partial results are reported between steps
+
+
+class RecognitionOutcome:
+    def __init__(self, text, confidence, backend, latency):
+        self.text = text
+        self.confidence = confidence  # None when the backend doesn't report one
+        self.backend = backend
+        self.latency = latency
+
+    def __repr__(self):
+        return f"RecognitionOutcome({self.text!r}, confidence={self.confidence}, backend={self.backend!r})"
+
+
+class RecognitionBackend:
+    """Base class: recognize() returns (text, confidence) or None when nothing was understood"""
+
+    name = 'base'
+    offline = False
+
+    def warm(self):
+        pass
+
+    def recognize(self, audio, on_partial=None):
+        raise NotImplementedError
+
+
+class GoogleBackend(RecognitionBackend):
+    name = 'google'
+
+    def __init__(self, recognizer):
+        self.recognizer = recognizer
+
+    def recognize(self, audio, on_partial=None):
+        import speech_recognition as sr
+        try:
+            result = self.recognizer.recognize_google(audio, show_all=True)
+        except sr.UnknownValueError:
+            return None
+        if not result or not result.get('alternative'):
+            return None
+        best = result['alternative'][0]
+        return best['transcript'], best.get('confidence')
+
+
+class VoskBackend(RecognitionBackend):
+    """Offline Kaldi model, loaded once and shared by every utterance"""
+
+    name = 'vosk'
+    offline = True
+
+    def __init__(self, model_path=VOSK_MODEL):
+        self.model_path = model_path
+        self.model = None
+        self._lock = threading.Lock()
+
+    def warm(self):
+        with self._lock:
+            if self.model is not None:
+                return
+            import vosk
+            vosk.SetLogLevel(-1)
+            start = time.time()
+            self.model = vosk.Model(self.model_path)
+            print(f"✅ Vosk model loaded in {time.time() - start:.1f}s")
+
+    def recognize(self, audio, on_partial=None):
+        import vosk
+        if self.model is None:
+            self.warm()
+        rec = vosk.KaldiRecognizer(self.model, VOSK_RATE)
+        rec.SetWords(True)
+        data = audio.get_raw_data(convert_rate=VOSK_RATE, convert_width=2)
+        for offset in range(0, len(data), VOSK_CHUNK):
+            if not rec.AcceptWaveform(data[offset:offset + VOSK_CHUNK]) and on_partial:
+                partial = json.loads(rec.PartialResult()).get('partial')
+                if partial:
+                    on_partial(self.name, partial)
+        result = json.loads(rec.FinalResult())
+        text = result.get('text', '').strip()
+        if not text:
+            return None
+        words = result.get('result') or []
+        confidence = sum(w.get('conf', 0.0) for w in words) / len(words) if words else None
+        return text, confidence
+
+
+class BackendStats:
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.counts = {'ok': 0, 'unknown': 0, 'errors': 0, 'low_confidence': 0}
+        self.confidence_total = 0.0
+        self.confidence_count = 0
+
+    def summary(self):
+        summary = dict(self.counts, latency=self.latency.summary())
+        if self.confidence_count:
+            summary['avg_confidence'] = round(self.confidence_total / self.confidence_count, 3)
+        return summary
+
+
+class RecognitionChain:
+    """Try backends in order; accept the first confident answer, else the most confident one"""
+
+    def __init__(self, backends, min_confidence=MIN_CONFIDENCE, on_partial=None):
+        self.backends = backends
+        self.min_confidence = min_confidence
+        self.on_partial = on_partial
+        self.stats = {backend.name: BackendStats() for backend in backends}
+        self.fallbacks = 0
+
+    def warm(self):
+        """Load every backend up front so the first utterance pays no model-load cost"""
+        ready = []
+        for backend in self.backends:
+            try:
+                backend.warm()
+                ready.append(backend)
+            except Exception as e:
+                print(f"⚠️ {backend.name} recognizer not available: {e}")
+        self.backends = ready or self.backends
+        return self
+
+    def recognize(self, audio):
+        best = None
+        for index, backend in enumerate(self.backends):
+            stats = self.stats[backend.name]
+            start = time.time()
+            try:
+                result = backend.recognize(audio, self.on_partial)
+            except Exception as e:
+                stats.counts['errors'] += 1
+                print(f"{backend.name} recognition error: {e}")
+                continue
+            finally:
+                stats.latency.record(time.time() - start)
+            if result is None:
+                stats.counts['unknown'] += 1
+                continue
+            text, confidence = result
+            outcome = RecognitionOutcome(text, confidence, backend.name, time.time() - start)
+            stats.counts['ok'] += 1
+            if confidence is not None:
+                stats.confidence_total += confidence
+                stats.confidence_count += 1
+            if confidence is None or confidence >= self.min_confidence:
+                return outcome
+            stats.counts['low_confidence'] += 1
+            if best is None or confidence > best.confidence:
+                best = outcome
+            if index < len(self.backends) - 1:
+                self.fallbacks += 1
+        return best
+
+    def summary(self):
+        summary = {name: stats.summary() for name, stats in self.stats.items()}
+        summary['fallbacks'] = self.fallbacks
+        return summary
+
+
+def create_chain(recognizer, names=RECOGNIZERS, offline_only=False, warm=True):
+    """Build the configured chain, e.g. JARVIS_RECOGNIZERS=vosk,google"""
+    factories = {
+        'vosk': lambda: VoskBackend(),
+        'google': lambda: GoogleBackend(recognizer),
+    }
+    backends = []
+    for name in names.split(','):
+        name = name.strip()
+        if name not in factories:
+            print(f"⚠️ Unknown recognizer: {name}")
+            continue
+        backend = factories[name]()
+        if offline_only and not backend.offline:
+            continue
+        backends.append(backend)
+    chain = RecognitionChain(backends)
+    return chain.warm() if warm else chain
+
+
+def main(argv):
+    """Transcribe WAV fixtures offline: jarvis_recognition.py file.wav ..."""
+    import speech_recognition as sr
+    if not argv:
+        print(main.__doc__)
+        return 1
+    recognizer = sr.Recognizer()
+    chain = create_chain(recognizer, offline_only=True)
+    for path in argv:
+        with sr.AudioFile(path) as source:
+            audio = recognizer.record(source)
+        print(f"{path}: {chain.recognize(audio)}")
+    print(json.dumps(chain.summary(), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
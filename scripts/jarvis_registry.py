@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+J.A.R.V.I.S command and app registry
+Commands and app targets declared in JSON, a trigram + edit-distance index for spoken app names, hot reload
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+
+REGISTRY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'registry')
+USER_REGISTRY_DIR = os.getenv('JARVIS_REGISTRY_DIR', os.path.expanduser('~/.jarvis/registry'))
+RELOAD_INTERVAL = 2.0  # seconds between registry file mtime checks
+MIN_APP_SCORE = 0.6    # edit-distance similarity a spoken name needs to count as a match
+CANDIDATES = 5
+CACHE_SIZE = 256
+APP_FILLER = {'the', 'app', 'application', 'please', 'my', 'for', 'me', 'up', 'a'}
+
+
+def normalize_app_name(text):
+    """'the whats app app' and 'WhatsApp' both become 'whatsapp'"""
+    return "".join(word for word in re.findall(r"[a-z0-9]+", text.lower()) if word not in APP_FILLER)
+
+
+def trigrams(text):
+    padded = f"^{text}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b):
+    """Levenshtein distance, two rows at a time"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+class AppTarget:
+    """Something `am start` can open: an explicit component, a package, or an action/category"""
+
+    def __init__(self, name, aliases=(), component=None, package=None, action=None, category=None):
+        self.name = name
+        self.aliases = list(aliases)
+        self.component = component
+        self.package = package
+        self.action = action
+        self.category = category
+
+    @classmethod
+    def from_dict(cls, entry):
+        return cls(entry['name'], entry.get('aliases', ()), entry.get('component'), entry.get('package'),
+                   entry.get('action'), entry.get('category'))
+
+    def am_args(self):
+        if self.component:
+            return ['-n', self.component]
+        args = ['-a', self.action or 'android.intent.action.MAIN']
+        if self.category or not self.action:
+            # Role categories (APP_CALCULATOR, ...) open whichever vendor's app fills the role
+            args += ['-c', self.category or 'android.intent.category.LAUNCHER']
+        if self.package:
+            args += ['-p', self.package]
+        return args
+
+    def __repr__(self):
+        return f"AppTarget({self.name!r}, {' '.join(self.am_args())})"
+
+
+class AppIndex:
+    """Trigram inverted index narrows the candidates; edit distance picks the winner"""
+
+    def __init__(self, apps):
+        self.apps = apps
+        self.keys = []
+        self.postings = {}
+        for app in apps:
+            for spoken in [app.name] + app.aliases:
+                key = normalize_app_name(spoken)
+                if key:
+                    self._add(key, app)
+
+    def _add(self, key, app):
+        index = len(self.keys)
+        grams = trigrams(key)
+        self.keys.append((key, app, len(grams)))
+        for gram in grams:
+            self.postings.setdefault(gram, []).append(index)
+
+    def resolve(self, spoken):
+        """(AppTarget, score) for the closest name, or None when nothing is close enough"""
+        query = normalize_app_name(spoken)
+        if not query:
+            return None
+        grams = trigrams(query)
+        shared = {}
+        for gram in grams:
+            for index in self.postings.get(gram, ()):
+                shared[index] = shared.get(index, 0) + 1
+        # Dice coefficient over trigrams, then exact edit distance on the few best
+        ranked = sorted(shared, key=lambda i: -2.0 * shared[i] / (len(grams) + self.keys[i][2]))[:CANDIDATES]
+        best = None
+        for index in ranked:
+            key, app, _ = self.keys[index]
+            score = 1.0 - edit_distance(query, key) / max(len(query), len(key))
+            if best is None or score > best[1]:
+                best = (app, score)
+        if best is None or best[1] < MIN_APP_SCORE:
+            return None
+        return best
+
+
+class Registry:
+    """Loads commands.json/apps.json from the bundled and user directories; user entries win"""
+
+    def __init__(self, directories=(REGISTRY_DIR, USER_REGISTRY_DIR), reload_interval=RELOAD_INTERVAL):
+        self.directories = [d for d in directories if d]
+        self.reload_interval = reload_interval
+        self.commands = []
+        self.apps = []
+        self.counters = {'reloads': 0, 'load_errors': 0, 'resolved': 0, 'cache_hits': 0, 'unresolved': 0}
+        self._index = None
+        self._cache = {}
+        self._signature = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._load()
+
+    def refresh(self):
+        """Reload if any registry file changed; cheap enough to call from the dispatcher's tick"""
+        now = time.time()
+        if now - self._checked_at < self.reload_interval:
+            return False
+        self._checked_at = now
+        if self._files_signature() == self._signature:
+            return False
+        self._load()
+        self.counters['reloads'] += 1
+        return True
+
+    def resolve_app(self, spoken):
+        """Closest declared app for a spoken name, or None; answers are cached until the next reload"""
+        key = normalize_app_name(spoken)
+        with self._lock:
+            if key in self._cache:
+                self.counters['cache_hits'] += 1
+                return self._cache[key]
+            if self._index is None:
+                # Built on first use: most sessions never open an app by name
+                self._index = AppIndex(self.apps)
+            index = self._index
+        match = index.resolve(spoken)
+        with self._lock:
+            if len(self._cache) >= CACHE_SIZE:
+                self._cache.clear()
+            self._cache[key] = match[0] if match else None
+            self.counters['resolved' if match else 'unresolved'] += 1
+        return match[0] if match else None
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats['cached'] = len(self._cache)
+        stats['commands'] = len(self.commands)
+        stats['apps'] = len(self.apps)
+        return stats
+
+    def _paths(self, name):
+        return [os.path.join(d, name) for d in self.directories if os.path.isfile(os.path.join(d, name))]
+
+    def _files_signature(self):
+        signature = []
+        for name in ('commands.json', 'apps.json'):
+            for path in self._paths(name):
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                signature.append((path, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def _load(self):
+        signature = self._files_signature()
+        try:
+            commands = self._merge('commands.json', 'commands', 'intent')
+            apps = [AppTarget.from_dict(entry) for entry in self._merge('apps.json', 'apps', 'name')]
+        except (OSError, ValueError, KeyError) as e:
+            # A half-saved edit shouldn't take the assistant down: keep what was loaded before
+            self.counters['load_errors'] += 1
+            print(f"⚠️ Registry not reloaded: {e}")
+            self._signature = signature
+            return
+        with self._lock:
+            self.commands = commands
+            self.apps = apps
+            self._index = None
+            self._cache = {}
+            self._signature = signature
+
+    def _merge(self, filename, section, key):
+        entries = {}
+        for path in self._paths(filename):
+            with open(path) as f:
+                for entry in json.load(f)[section]:
+                    entries[entry[key].lower()] = entry
+        return list(entries.values())
+
+
+def main(argv):
+    """jarvis_registry.py apps | resolve <spoken name> | launch <spoken name>"""
+    registry = Registry()
+    if argv[:1] == ['apps']:
+        print(", ".join(app.name.lower() for app in registry.apps))
+        return 0
+    if len(argv) < 2 or argv[0] not in ('resolve', 'launch'):
+        print(main.__doc__)
+        return 1
+    app = registry.resolve_app(" ".join(argv[1:]))
+    if app is None:
+        print(f"App not found: {' '.join(argv[1:])}")
+        return 1
+    if argv[0] == 'resolve':
+        print(app)
+        return 0
+    return subprocess.call(['am', 'start'] + app.am_args())
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
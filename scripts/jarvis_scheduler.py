@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+J.A.R.V.I.S command scheduler
+Per-intent execution classes on separate pools, deadlines, cooperative cancellation and spoken progress
+"""
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from jarvis_metrics import NULL_SPAN
+
+INSTANT = 'instant'  # answers from memory or only queues speech/actions: run inline on the dispatch thread
+IO = 'io'            # waits on the network or disk (LLM, note search)
+PROCESS = 'process'  # waits on a child process (termux-* sensors); own pool so a hang can't starve IO
+POOL_SIZES = {IO: 2, PROCESS: 1}
+PROGRESS_AFTER = 4   # seconds a running command may stay silent before "still working on it"
+PROGRESS_EVERY = 8
+
+_local = threading.local()
+
+
+class TaskCancelled(BaseException):
+    """Raised by check_cancelled(); a BaseException, like asyncio.CancelledError, so a handler's
+    broad `except Exception` doesn't swallow it"""
+
+
+class Task:
+    """One scheduled command; handlers see it through current_task()"""
+
+    def __init__(self, task_id, intent, execution, deadline):
+        self.id = task_id
+        self.intent = intent
+        self.execution = execution
+        self.deadline = deadline
+        self.reason = None
+        self.future = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.last_output = self.submitted_at
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self, reason='cancelled'):
+        if not self._cancel.is_set():
+            self.reason = reason
+            self._cancel.set()
+
+    def sleep(self, seconds):
+        """Interruptible wait; returns False once the task has been cancelled"""
+        return not self._cancel.wait(seconds)
+
+    def __repr__(self):
+        return f"Task({self.id}, {self.intent!r}, {self.execution}, reason={self.reason!r})"
+
+
+def current_task():
+    return getattr(_local, 'task', None)
+
+
+def check_cancelled():
+    """Call between steps of a long handler; raises TaskCancelled once the command was stopped"""
+    task = current_task()
+    if task is not None and task.cancelled:
+        raise TaskCancelled(task.reason)
+
+
+class CommandScheduler:
+    """Runs handlers by execution class; tick() enforces deadlines and speaks progress"""
+
+    def __init__(self, on_progress=None, on_deadline=None, metrics=None, pool_sizes=None,
+                 progress_after=PROGRESS_AFTER, progress_every=PROGRESS_EVERY):
+        self.on_progress = on_progress
+        self.on_deadline = on_deadline
+        self.metrics = metrics
+        self.progress_after = progress_after
+        self.progress_every = progress_every
+        self.classes = {}
+        self.pools = {execution: ThreadPoolExecutor(max_workers=size, thread_name_prefix=f'jarvis-{execution}')
+                      for execution, size in dict(POOL_SIZES, **(pool_sizes or {})).items()}
+        self.active = {}
+        self.counters = {'submitted': 0, 'completed': 0, 'cancelled': 0, 'deadlines': 0,
+                         'errors': 0, 'progress': 0}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+
+    def register(self, intent, execution=INSTANT, deadline=None):
+        if execution != INSTANT and execution not in self.pools:
+            raise ValueError(f"unknown execution class: {execution}")
+        self.classes[intent] = (execution, deadline)
+        return self
+
+    @property
+    def busy(self):
+        return bool(self.active)
+
+    def submit(self, intent, func, *args):
+        """Run func(*args) for an intent; returns its Task (already finished for instant intents)"""
+        execution, deadline = self.classes.get(intent, (INSTANT, None))
+        task = Task(next(self._ids), intent, execution, deadline)
+        with self._lock:
+            self.counters['submitted'] += 1
+        if execution == INSTANT:
+            self._run(task, func, args)
+            return task
+        with self._lock:
+            self.active[task.id] = task
+        task.future = self.pools[execution].submit(self._run, task, func, args)
+        return task
+
+    def wait_idle(self, timeout=None):
+        """Block until no scheduled command is queued or running; False on timeout"""
+        with self._idle:
+            return self._idle.wait_for(lambda: not self.active, timeout)
+
+    def cancel_all(self, reason='cancelled'):
+        """Cancel every queued or running command; returns how many there were"""
+        with self._lock:
+            tasks = list(self.active.values())
+            self.active.clear()
+            self.counters['cancelled'] += len(tasks)
+            self._idle.notify_all()
+        for task in tasks:
+            task.cancel(reason)
+            # Not started yet: never runs. Running: stops at its next check_cancelled()
+            task.future.cancel()
+        return len(tasks)
+
+    def note_output(self):
+        """The current task just spoke, so it isn't silent and needs no progress message"""
+        task = current_task()
+        if task is not None:
+            task.last_output = time.time()
+
+    def tick(self):
+        """Expire commands past their deadline; nudge the user when one has been quiet too long"""
+        now = time.time()
+        expired, quiet = [], []
+        with self._lock:
+            for task in list(self.active.values()):
+                if task.started_at is None:
+                    continue
+                if task.deadline and now - task.started_at > task.deadline:
+                    del self.active[task.id]
+                    self.counters['deadlines'] += 1
+                    self._idle.notify_all()
+                    expired.append(task)
+                elif now - task.last_output > (self.progress_every if task.last_output > task.started_at
+                                               else self.progress_after):
+                    task.last_output = now
+                    self.counters['progress'] += 1
+                    quiet.append(task)
+        for task in expired:
+            task.cancel('deadline')
+            if self.on_deadline:
+                self.on_deadline(task)
+        for task in quiet:
+            if self.on_progress:
+                self.on_progress(task)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats['running'] = sorted(task.intent for task in self.active.values())
+        return stats
+
+    def shutdown(self):
+        self.cancel_all('shutdown')
+        for pool in self.pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, task, func, args):
+        if task.cancelled:
+            return
+        task.started_at = task.last_output = time.time()
+        if self.metrics and task.execution != INSTANT:
+            self.metrics.observe('handler.queued', task.started_at - task.submitted_at, task.execution)
+        _local.task = task
+        span = self.metrics.span('handler', task.intent) if self.metrics else NULL_SPAN
+        try:
+            with span:
+                try:
+                    func(*args)
+                except TaskCancelled:
+                    pass
+        except Exception as e:
+            with self._lock:
+                self.counters['errors'] += 1
+            print(f"Command error ({task.intent}): {e}")
+        finally:
+            _local.task = None
+            with self._lock:
+                self.active.pop(task.id, None)
+                if not task.cancelled:
+                    self.counters['completed'] += 1
+                self._idle.notify_all()
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+J.A.R.V.I.S speech output queue
+One long-lived synthesis worker with priorities, barge-in, cached fixed phrases and time-to-first-audio stats
+"""
+import itertools
+import queue
+import subprocess
+import threading
+import time
+
+URGENT = 0
+NORMAL = 5
+LOW = 9
+RENDER = LOW + 2  # speech-cache renders on the engine thread: after every utterance, and after stop()
+PLAYER_MAX_FAILURES = 3  # consecutive cached-playback failures before going back to live synthesis
+RENDER_TIMEOUT = 60  # seconds a cache render may wait behind speech for the engine
+PYTTSX3_RATE = 150
+PYTTSX3_VOLUME = 0.9
+
+ESPEAK_ARGS = [
+    '-s', '155',  # Slightly slower for clarity
+    '-p', '45',   # Better pitch
+    '-a', '120',  # Higher amplitude
+    '-g', '8',    # More gap between words
+    '-v', 'en+m3' # Male voice variant
+]
+
+
+def espeak_voice(args=ESPEAK_ARGS):
+    """(voice, rate, pitch) for the speech-cache key; amplitude and word gap count as part of the voice"""
+    options = dict(zip(args[::2], args[1::2]))
+    voice = " ".join([options.pop('-v', 'en')] + [f"{flag} {value}" for flag, value in sorted(options.items())
+                                                  if flag not in ('-s', '-p')])
+    return voice, int(options.get('-s', 175)), int(options.get('-p', 50))
+
+
+def render_espeak(text, path, args=ESPEAK_ARGS):
+    """Same voice as live espeak output, written to a WAV file instead of the speaker"""
+    subprocess.run(['espeak', '-w', path, text] + list(args), stdout=subprocess.DEVNULL,
+                   stderr=subprocess.DEVNULL, timeout=30, check=True)
+
+
+class SpeechItem:
+    """One queued utterance; wait() blocks until it was spoken or cancelled"""
+
+    def __init__(self, text, language='en', priority=NORMAL):
+        self.text = text
+        self.language = language
+        self.priority = priority
+        self.enqueued_at = time.time()
+        self.started_at = None
+        self.cancelled = False
+        self.done = threading.Event()
+
+    @property
+    def time_to_first_audio(self):
+        if self.started_at is None:
+            return None
+        return self.started_at - self.enqueued_at
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+
+class RenderJob:
+    """A line for the speech cache, rendered by the pyttsx3 engine when it has nothing to say"""
+
+    def __init__(self, text, path):
+        self.text = text
+        self.path = path
+        self.error = None
+        self.cancelled = False
+        self.done = threading.Event()
+
+
+class SpeechQueue:
+    """Asynchronous TTS: handlers enqueue text and return immediately"""
+
+    def __init__(self, use_pyttsx3=True, on_start=None, on_finish=None, history=200, audio_cache=None):
+        self.use_pyttsx3 = use_pyttsx3
+        # Optional SpeechCache: fixed phrases play from rendered PCM instead of being synthesized again
+        self.audio_cache = audio_cache
+        self.player = None
+        self.on_start = on_start
+        self.on_finish = on_finish
+        self.tts_engine = None
+        self.tts_available = False
+        self.current = None
+        self.history = history
+        self.ttfa = []
+        self.counters = {'spoken': 0, 'cached': 0, 'player_errors': 0, 'cancelled': 0, 'interrupted': 0,
+                         'errors': 0}
+        self._player_failures = 0
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._process = None
+        self._ready = threading.Event()
+        self._stopped = False
+        self._worker = None
+
+    def start(self):
+        """Start the synthesis worker; the TTS engine initializes on that thread, in parallel"""
+        self._worker = threading.Thread(target=self._run, name='jarvis-tts', daemon=True)
+        self._worker.start()
+        return self
+
+    def wait_ready(self, timeout=None):
+        return self._ready.wait(timeout)
+
+    def say(self, text, language='en', priority=NORMAL):
+        item = SpeechItem(text, language, priority)
+        self._queue.put((priority, next(self._seq), item))
+        return item
+
+    def prefetch(self, text):
+        """Speculation: a line that is probably about to be spoken gets its audio ready now"""
+        if self.audio_cache is not None:
+            self.audio_cache.prefetch(text)
+
+    def prepare(self, texts):
+        """Render fixed phrases ahead of time; waits for the engine so the voice is known"""
+        if self.audio_cache is not None and self.wait_ready(30):
+            return self.audio_cache.prepare(texts)
+        return None
+
+    @property
+    def speaking(self):
+        # Queued cache renders and the stop marker sort after every utterance and aren't speech
+        with self._queue.mutex:
+            head = self._queue.queue[0][0] if self._queue.queue else None
+        return self.current is not None or (head is not None and head <= LOW)
+
+    def interrupt(self, min_priority=NORMAL):
+        """Barge-in: stop the current utterance and drop queued ones of lower importance"""
+        kept = []
+        while True:
+            try:
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if not isinstance(entry[2], SpeechItem) or entry[0] < min_priority:
+                kept.append(entry)
+            else:
+                self._finish(entry[2], cancelled=True)
+        for entry in kept:
+            self._queue.put(entry)
+
+        with self._lock:
+            item, process = self.current, self._process
+        if item is None:
+            return False
+        item.cancelled = True
+        self.counters['interrupted'] += 1
+        if process is not None and process.poll() is None:
+            process.terminate()
+        elif self.tts_engine is not None:
+            try:
+                self.tts_engine.stop()
+            except Exception as e:
+                print(f"TTS stop error: {e}")
+        return True
+
+    def stop(self, timeout=5):
+        self._queue.put((LOW + 1, next(self._seq), None))
+        if self._worker:
+            self._worker.join(timeout)
+        if self.audio_cache is not None:
+            self.audio_cache.close()
+        if self.player is not None:
+            self.player.close()
+
+    def stats(self):
+        samples = sorted(self.ttfa)
+        stats = dict(self.counters)
+        stats['queued'] = self._queue.qsize()
+        if samples:
+            stats['ttfa_last_ms'] = round(self.ttfa[-1] * 1000, 1)
+            stats['ttfa_p50_ms'] = round(samples[len(samples) // 2] * 1000, 1)
+            stats['ttfa_p95_ms'] = round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 1)
+        return stats
+
+    def _init_engine(self):
+        if not self.use_pyttsx3:
+            return
+        try:
+            import pyttsx3
+            self.tts_engine = pyttsx3.init()
+            self.tts_engine.setProperty('rate', PYTTSX3_RATE)
+            self.tts_engine.setProperty('volume', PYTTSX3_VOLUME)
+            self.tts_engine.connect('started-utterance', self._mark_started)
+            self.tts_available = True
+            print("✅ TTS engine initialized successfully")
+        except Exception as e:
+            print(f"⚠️ TTS engine not available: {e}")
+            print("📱 Will use espeak directly")
+
+    def _init_cache(self):
+        if self.audio_cache is None:
+            return
+        from jarvis_tts_cache import AudioPlayer
+        player = AudioPlayer()
+        if not player.open():
+            print("⚠️ Speech cache off: no audio player (install pyaudio or alsa-utils)")
+            return
+        self.player = player
+        if self.tts_available:
+            # Cached lines must sound like live ones, so pyttsx3 renders them itself
+            voice = f"pyttsx3 {self.tts_engine.getProperty('voice')} volume {PYTTSX3_VOLUME}"
+            self.audio_cache.bind((voice, PYTTSX3_RATE, 0), self._render_pyttsx3)
+        else:
+            self.audio_cache.bind(espeak_voice(), render_espeak)
+
+    def _render_pyttsx3(self, text, path):
+        """Cache renderer: pyttsx3 only runs on its own thread, so queue the render behind all speech"""
+        if self._stopped:
+            raise RuntimeError("speech queue stopped")
+        job = RenderJob(text, path)
+        self._queue.put((RENDER, next(self._seq), job))
+        if not job.done.wait(RENDER_TIMEOUT):
+            job.cancelled = True
+            raise TimeoutError(f"no idle engine within {RENDER_TIMEOUT}s")
+        if job.error is not None:
+            raise job.error
+
+    def _render(self, job):
+        if not job.cancelled:
+            try:
+                self.tts_engine.save_to_file(job.text, job.path)
+                self.tts_engine.runAndWait()
+            except Exception as e:
+                job.error = e
+        job.done.set()
+
+    def _run(self):
+        self._init_engine()
+        self._init_cache()
+        self._ready.set()
+        while True:
+            _, _, item = self._queue.get()
+            if item is None:
+                break
+            if isinstance(item, RenderJob):
+                self._render(item)
+                continue
+            if item.cancelled:
+                self._finish(item, cancelled=True)
+                continue
+            with self._lock:
+                self.current = item
+            if self.on_start:
+                self.on_start(item)
+            try:
+                self._synthesize(item)
+            except Exception as e:
+                self.counters['errors'] += 1
+                print(f"TTS Error: {e}")
+            finally:
+                with self._lock:
+                    self.current = None
+                    self._process = None
+                if self.on_finish:
+                    self.on_finish(item)
+                self._finish(item, cancelled=item.cancelled)
+        # Renders queued behind the stop marker would otherwise wait out RENDER_TIMEOUT
+        self._stopped = True
+        while True:
+            try:
+                _, _, item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, RenderJob):
+                item.error = RuntimeError("speech queue stopped")
+                item.done.set()
+
+    def _mark_started(self, name=None):
+        item = self.current
+        if item is not None and item.started_at is None:
+            item.started_at = time.time()
+
+    def _spawn(self, args):
+        process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        with self._lock:
+            self._process = process
+        self._mark_started()
+        return process.wait()
+
+    def _play_cached(self, item):
+        audio = self.audio_cache.get(item.text) if self.player is not None else None
+        if audio is None:
+            return False
+        try:
+            if self.player.command:
+                ok = self._spawn(self.player.command + [audio.path]) == 0
+            else:
+                self._mark_started()
+                self.player.play(audio, lambda: item.cancelled)
+                ok = True
+        except Exception as e:
+            print(f"Cached speech playback error: {e}")
+            ok = False
+        if ok or item.cancelled:
+            self._player_failures = 0
+            self.counters['cached'] += 1
+            return True
+        # e.g. paplay with no PulseAudio server: say it live rather than play silence
+        self.counters['player_errors'] += 1
+        self._player_failures += 1
+        if self._player_failures >= PLAYER_MAX_FAILURES:
+            print(f"⚠️ Speech cache off: {self.player.name} keeps failing")
+            self.player = None
+        item.started_at = None
+        return False
+
+    def _synthesize(self, item):
+        if item.language == 'en' and self._play_cached(item):
+            return
+        if item.language == 'hi':
+            self._spawn(['termux-tts-speak', item.text, '-l', 'hi-IN'])
+        elif self.tts_available and self.tts_engine:
+            self.tts_engine.say(item.text)
+            self.tts_engine.runAndWait()
+        else:
+            returncode = self._spawn(['espeak', item.text] + ESPEAK_ARGS)
+            if returncode != 0 and not item.cancelled:
+                self._spawn(['termux-tts-speak', item.text])
+
+    def _finish(self, item, cancelled=False):
+        if cancelled:
+            item.cancelled = True
+            self.counters['cancelled'] += 1
+        else:
+            self.counters['spoken'] += 1
+            if item.time_to_first_audio is not None:
+                self.ttfa.append(item.time_to_first_audio)
+                del self.ttfa[:-self.history]
+        item.done.set()
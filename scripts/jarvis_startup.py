@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+J.A.R.V.I.S startup helpers
+Lazy module loading, startup timing breakdown and cached ambient-noise calibration
+"""
+import importlib
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+import types
+from contextlib import contextmanager
+
+CALIBRATION_PATH = os.getenv('JARVIS_CALIBRATION_PATH', os.path.expanduser('~/.jarvis/calibration.json'))
+CALIBRATION_MAX_AGE = 24 * 3600
+
+
+class LazyModule(types.ModuleType):
+    """Stands in for a module and imports it on first attribute access"""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__['_lazy_target'] = None
+
+    def _load(self):
+        module = self.__dict__['_lazy_target']
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__['_lazy_target'] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+
+def lazy_import(name):
+    return LazyModule(name)
+
+
+def is_available(name):
+    """True when a module can be imported, without importing it"""
+    return name in sys.modules or importlib.util.find_spec(name) is not None
+
+
+class StartupProfiler:
+    """Wall-clock breakdown of startup steps, including ones running on other threads"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        self.steps = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def step(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.steps.append((name, threading.current_thread().name, start - self.origin, end - start))
+
+    def timed(self, name, func, *args, **kwargs):
+        """Wrap a callable so it records its own step wherever it runs"""
+        def run():
+            with self.step(name):
+                return func(*args, **kwargs)
+        return run
+
+    def report(self, milestone):
+        if not self.enabled:
+            return
+        total = time.perf_counter() - self.origin
+        print(f"⏱️ Startup profile: {milestone} after {total * 1000:.0f} ms")
+        with self._lock:
+            steps = sorted(self.steps, key=lambda s: s[2])
+        for name, thread, started, duration in steps:
+            print(f"   {started * 1000:7.0f} ms +{duration * 1000:7.0f} ms  {name:<32} [{thread}]")
+
+
+def load_calibration(path=CALIBRATION_PATH, max_age=CALIBRATION_MAX_AGE):
+    """Energy threshold from a recent run, or None if missing or stale"""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        if time.time() - data['saved_at'] <= max_age:
+            return float(data['energy_threshold'])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def save_calibration(energy_threshold, path=CALIBRATION_PATH):
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({'energy_threshold': energy_threshold, 'saved_at': time.time()}, f)
+    except OSError as e:
+        print(f"⚠️ Couldn't save calibration: {e}")
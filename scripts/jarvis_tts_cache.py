@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+J.A.R.V.I.S synthesized-speech cache
+Fixed phrases rendered once to WAV, keyed by (text, voice, rate, pitch), and played straight from PCM
+"""
+import os
+import re
+import shutil
+import threading
+import wave
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from jarvis_cache import fingerprint
+from jarvis_startup import is_available, lazy_import
+
+pyaudio = lazy_import('pyaudio') if is_available('pyaudio') else None
+
+TTS_CACHE_DIR = os.getenv('JARVIS_TTS_CACHE_DIR', os.path.expanduser('~/.jarvis/tts-cache'))
+MAX_ENTRIES = 500               # WAV files kept on disk; the least recently played are pruned past this
+PRUNE_TO = 0.9                  # share of MAX_ENTRIES left after pruning, so it doesn't run on every render
+MEMORY_BYTES = 8 * 1024 * 1024  # decoded PCM kept in RAM for the hottest phrases
+MAX_TEXT_CHARS = 400            # longer text is never cached
+REPEAT_TO_CACHE = 2             # a line synthesized live this many times is rendered for next time
+DYNAMIC_TEXT = re.compile(r"\d")  # times, battery levels...: repeats of these are coincidence
+PLAYBACK_FRAMES = 1024          # ~50 ms per write, so barge-in stops playback quickly
+PLAYER_COMMANDS = (['aplay', '-q'], ['paplay'], ['play', '-q'])
+
+
+class CachedAudio:
+    """One rendered phrase: PCM plus the format needed to play it"""
+
+    def __init__(self, path, pcm, sample_rate, sample_width, channels):
+        self.path = path
+        self.pcm = pcm
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.channels = channels
+
+    @classmethod
+    def load(cls, path):
+        with wave.open(path, 'rb') as wav:
+            pcm = wav.readframes(wav.getnframes())
+            return cls(path, pcm, wav.getframerate(), wav.getsampwidth(), wav.getnchannels())
+
+    @property
+    def duration(self):
+        return len(self.pcm) / float(self.sample_rate * self.sample_width * self.channels)
+
+
+class AudioPlayer:
+    """PyAudio straight from memory when installed, otherwise aplay/paplay/play on the cached file"""
+
+    def __init__(self):
+        self.command = None
+        self._pa = None
+
+    def open(self):
+        """Pick a backend; False when nothing can play a WAV"""
+        if pyaudio is not None:
+            try:
+                self._pa = pyaudio.PyAudio()
+                return True
+            except Exception as e:
+                print(f"⚠️ PyAudio output not available: {e}")
+        for command in PLAYER_COMMANDS:
+            if shutil.which(command[0]):
+                self.command = command
+                return True
+        return False
+
+    @property
+    def name(self):
+        return self.command[0] if self.command else 'pyaudio' if self._pa else None
+
+    def play(self, audio, stopped):
+        """Blocking playback from memory; checks stopped() between chunks for barge-in"""
+        stream = self._pa.open(format=self._pa.get_format_from_width(audio.sample_width),
+                               channels=audio.channels, rate=audio.sample_rate, output=True)
+        step = PLAYBACK_FRAMES * audio.sample_width * audio.channels
+        try:
+            for offset in range(0, len(audio.pcm), step):
+                if stopped():
+                    break
+                stream.write(audio.pcm[offset:offset + step])
+        finally:
+            stream.stop_stream()
+            stream.close()
+
+    def close(self):
+        if self._pa is not None:
+            self._pa.terminate()
+            self._pa = None
+
+
+class SpeechCache:
+    """Rendered speech on disk with an LRU of decoded PCM in RAM; disabled until a renderer is bound"""
+
+    def __init__(self, directory=TTS_CACHE_DIR, max_entries=MAX_ENTRIES, memory_bytes=MEMORY_BYTES,
+                 repeat_to_cache=REPEAT_TO_CACHE):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.memory_bytes = memory_bytes
+        self.repeat_to_cache = repeat_to_cache
+        self.voice = None   # (voice, rate, pitch) of the live TTS path
+        self.render = None  # render(text, wav_path) with that same voice
+        self.bytes = 0
+        self.disk_entries = 0
+        self.counters = {'hits': 0, 'misses': 0, 'renders': 0, 'render_errors': 0, 'prefetches': 0,
+                         'evictions': 0, 'pruned': 0}
+        self._memory = OrderedDict()  # key -> CachedAudio
+        self._seen = OrderedDict()    # key -> live syntheses this session
+        self._pending = set()
+        self._lock = threading.Lock()
+        # One worker for batch warming, one left free for the speculative wake acknowledgement
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='jarvis-tts-cache')
+
+    @property
+    def enabled(self):
+        return self.render is not None
+
+    def bind(self, voice, render):
+        """Called by the speech queue once it knows which voice it speaks with"""
+        os.makedirs(self.directory, exist_ok=True)
+        self.voice = tuple(voice)
+        self.render = render
+        self._prune(self.max_entries, temp_files=True)
+        return self
+
+    def key(self, text):
+        return fingerprint(text, *self.voice)
+
+    def get(self, text):
+        """Cached audio for text, or None; a miss counts towards rendering the line for next time"""
+        if not self.enabled or len(text) > MAX_TEXT_CHARS:
+            return None
+        key = self.key(text)
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.counters['hits'] += 1
+        if audio is None:
+            audio = self._load(key)
+            with self._lock:
+                self.counters['hits' if audio else 'misses'] += 1
+        if audio is not None:
+            self._touch(key)
+            return audio
+        with self._lock:
+            seen = self._seen.pop(key, 0) + 1
+            self._seen[key] = seen
+            while len(self._seen) > self.max_entries:
+                self._seen.popitem(last=False)
+        if seen >= self.repeat_to_cache and not DYNAMIC_TEXT.search(text):
+            # Repeated verbatim, so it's a canned line rather than a one-off answer
+            self.prepare([text])
+        return None
+
+    def prepare(self, texts):
+        """Render whatever isn't on disk yet, in the background and in order"""
+        if not self.enabled:
+            return None
+        todo = []
+        with self._lock:
+            for text in texts:
+                key = self.key(text)
+                if len(text) > MAX_TEXT_CHARS or key in self._pending or os.path.exists(self._path(key)):
+                    continue
+                self._pending.add(key)
+                todo.append((key, text))
+        if not todo:
+            return None
+        return self._pool.submit(self._render_all, todo)
+
+    def prefetch(self, text):
+        """Speculatively get text's PCM into RAM (rendering it if needed) before it is spoken"""
+        if not self.enabled or len(text) > MAX_TEXT_CHARS:
+            return None
+        key = self.key(text)
+        with self._lock:
+            if key in self._memory:
+                return None
+            self.counters['prefetches'] += 1
+        return self._pool.submit(self._warm, key, text)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats['memory_entries'] = len(self._memory)
+            stats['memory_bytes'] = self.bytes
+            stats['disk_entries'] = self.disk_entries
+        stats['enabled'] = self.enabled
+        return stats
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.wav")
+
+    def _touch(self, key):
+        """Mark a render as just played: _prune goes by mtime, so it drops the least recently played"""
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    def _load(self, key):
+        try:
+            audio = CachedAudio.load(self._path(key))
+        except (OSError, EOFError, wave.Error):
+            return None
+        self._remember(key, audio)
+        return audio
+
+    def _remember(self, key, audio):
+        with self._lock:
+            if key in self._memory:
+                return
+            self._memory[key] = audio
+            self.bytes += len(audio.pcm)
+            while self.bytes > self.memory_bytes and len(self._memory) > 1:
+                _, evicted = self._memory.popitem(last=False)
+                self.bytes -= len(evicted.pcm)
+                self.counters['evictions'] += 1
+
+    def _render_all(self, todo):
+        for key, text in todo:
+            self._render(key, text)
+
+    def _render(self, key, text):
+        path = self._path(key)
+        partial = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            if not os.path.exists(path):
+                self.render(text, partial)
+                # Atomic, so a concurrent get() never reads half a file
+                os.replace(partial, path)
+                with self._lock:
+                    self.counters['renders'] += 1
+                    self.disk_entries += 1
+                    full = self.disk_entries > self.max_entries
+                if full:
+                    self._prune(int(self.max_entries * PRUNE_TO))
+            return True
+        except Exception as e:
+            with self._lock:
+                self.counters['render_errors'] += 1
+            print(f"Speech cache render error: {e}")
+            try:
+                os.remove(partial)
+            except OSError:
+                pass
+            return False
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def _warm(self, key, text):
+        if self._load(key) is None and self._render(key, text):
+            self._load(key)
+
+    def _prune(self, keep, temp_files=False):
+        """Delete the least recently played renders beyond keep; leftover partial files only at startup"""
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            return
+        stale = [entry for entry in entries if entry.name.endswith('.tmp')] if temp_files else []
+        wavs = sorted((entry for entry in entries if entry.name.endswith('.wav')),
+                      key=lambda entry: entry.stat().st_mtime)
+        stale += wavs[:max(0, len(wavs) - keep)]
+        removed = 0
+        for entry in stale:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                continue
+            if entry.name.endswith('.wav'):
+                removed += 1
+                with self._lock:
+                    # The file player needs the path, so the RAM copy goes too
+                    audio = self._memory.pop(entry.name[:-4], None)
+                    if audio is not None:
+                        self.bytes -= len(audio.pcm)
+        with self._lock:
+            self.counters['pruned'] += removed
+            self.disk_entries = len(wavs) - removed
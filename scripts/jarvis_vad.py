@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+J.A.R.V.I.S adaptive voice-activity detection and endpointing
+Vectorized frame energies against a continuously tracked noise floor, with trailing-silence endpoints
+"""
+import audioop
+import collections
+import math
+import os
+
+from jarvis_pipeline import FRAME_CHUNK, PhraseSegmenter
+from jarvis_startup import is_available, lazy_import
+
+np = lazy_import('numpy') if is_available('numpy') else None
+
+ENDPOINTER = os.getenv('JARVIS_ENDPOINTER', 'vad')  # 'vad' (adaptive) or 'energy' (fixed threshold)
+VAD_FRAME_MS = 10
+ONSET_DB = 9.0          # speech starts this far above the noise floor...
+OFFSET_DB = 5.0         # ...and continues while it stays this far above it
+MIN_LEVEL_DBFS = -65.0  # nothing quieter than this is speech, however quiet the room
+MIN_FLOOR_DBFS = -90.0
+VOICED_FRACTION = 0.3   # share of 10 ms frames in a chunk that must be voiced
+FLOOR_WINDOW = 1.5      # seconds of frame minima the noise floor is taken from
+FLOOR_RISE = 0.5        # seconds for the floor to follow noise that gets louder...
+FLOOR_FALL = 0.1        # ...and noise that gets quieter
+WARMUP_SECONDS = 0.5    # non-blocking stand-in for the 2 s ambient-noise calibration
+MIN_SPEECH = 0.15       # voiced seconds before a phrase counts
+TRAILING_SILENCE = float(os.getenv('JARVIS_TRAILING_SILENCE', '0.45'))
+MAX_TRAILING_SILENCE = 0.8
+TRAILING_PER_VOICED_SECOND = 0.15  # long dictation gets more room to pause than "jarvis"
+KEEP_TAIL = 0.15        # trailing silence still sent to the recognizer
+CALIBRATION_RATIO = 1.5  # sr.Recognizer's dynamic_energy_ratio
+
+
+def to_dbfs(rms):
+    return 20 * math.log10(rms / 32768.0) if rms > 0 else MIN_FLOOR_DBFS
+
+
+def from_dbfs(db):
+    return 32768.0 * 10 ** (db / 20.0)
+
+
+class AdaptiveVAD:
+    """Speech/non-speech per chunk from 10 ms frame energies relative to a tracked noise floor"""
+
+    def __init__(self, sample_rate, sample_width=2, floor_db=-50.0, frame_ms=VAD_FRAME_MS,
+                 onset_db=ONSET_DB, offset_db=OFFSET_DB):
+        self.sample_width = sample_width
+        self.frame_samples = max(1, int(sample_rate * frame_ms / 1000))
+        self.floor_db = floor_db
+        self.onset_db = onset_db
+        self.offset_db = offset_db
+        self.in_speech = False
+        self.level_db = MIN_FLOOR_DBFS
+        self.elapsed = 0.0
+        self._minima = collections.deque()
+
+    def levels(self, frame):
+        """dBFS of every 10 ms frame in the chunk, in one vectorized pass"""
+        if self.sample_width != 2:
+            frame = audioop.lin2lin(frame, self.sample_width, 2)
+        samples = np.frombuffer(frame, dtype=np.int16)
+        usable = len(samples) // self.frame_samples * self.frame_samples
+        frames = samples[:usable].reshape(-1, self.frame_samples) if usable else samples.reshape(1, -1)
+        scaled = frames.astype(np.float32) / 32768.0
+        power = np.einsum('ij,ij->i', scaled, scaled) / frames.shape[1]
+        return 10.0 * np.log10(power + 1e-10)
+
+    @property
+    def threshold_db(self):
+        margin = self.offset_db if self.in_speech else self.onset_db
+        return max(self.floor_db + margin, MIN_LEVEL_DBFS)
+
+    def update(self, frame, seconds):
+        """Classify one chunk and move the noise floor; returns True for speech"""
+        levels = self.levels(frame)
+        self.elapsed += seconds
+        warming = self.elapsed < WARMUP_SECONDS
+        speech = not warming and float((levels > self.threshold_db).mean()) >= VOICED_FRACTION
+
+        # Minimum statistics: the gaps between syllables reach the noise floor within a
+        # second or so even mid-utterance, so the floor keeps tracking drift while someone talks
+        self._minima.append((self.elapsed, float(levels.min())))
+        while self._minima[0][0] <= self.elapsed - FLOOR_WINDOW:
+            self._minima.popleft()
+        target = min(quiet for _, quiet in self._minima)
+        if warming:
+            constant = seconds
+        else:
+            constant = FLOOR_FALL if target < self.floor_db else FLOOR_RISE
+        self.floor_db += (1.0 - math.exp(-seconds / constant)) * (target - self.floor_db)
+        self.floor_db = max(self.floor_db, MIN_FLOOR_DBFS)
+        self.in_speech = speech
+        self.level_db = float(levels.max())
+        return speech
+
+
+class VadSegmenter(PhraseSegmenter):
+    """Drop-in PhraseSegmenter: adaptive VAD onsets, endpoint after a length-scaled trailing silence"""
+
+    adaptive = True
+
+    def __init__(self, recognizer, sample_rate, sample_width, chunk=FRAME_CHUNK, phrase_time_limit=15,
+                 min_silence=TRAILING_SILENCE, max_silence=MAX_TRAILING_SILENCE, min_speech=MIN_SPEECH,
+                 keep_tail=KEEP_TAIL, adapt_threshold=True):
+        self.min_silence = min_silence
+        self.max_silence = max(min_silence, max_silence)
+        self.min_speech = min_speech
+        self.keep_tail = keep_tail
+        # Keeps recognizer.energy_threshold (and so the wake-word energy gate) on the live floor
+        self.adapt_threshold = adapt_threshold
+        floor = to_dbfs(recognizer.energy_threshold / CALIBRATION_RATIO)
+        self.vad = AdaptiveVAD(sample_rate, sample_width, floor)
+        self.counters = {'endpoints': 0, 'rejected': 0, 'time_limited': 0}
+        self.last_trailing = 0.0
+        super().__init__(recognizer, sample_rate, sample_width, chunk, phrase_time_limit)
+
+    def reset(self):
+        super().reset()
+        self._voiced = 0
+
+    def trailing_silence(self, voiced_seconds):
+        """Silence that ends a phrase: short for one-word commands, longer once someone is dictating"""
+        return min(self.max_silence, self.min_silence + TRAILING_PER_VOICED_SECOND * voiced_seconds)
+
+    def feed(self, frame, timestamp, flagged=False):
+        spf = self.seconds_per_frame
+        speech = self.vad.update(frame, spf)
+        if self.adapt_threshold:
+            self.recognizer.energy_threshold = from_dbfs(self.vad.floor_db) * CALIBRATION_RATIO
+
+        if self._started_at is None:
+            preroll_frames = int(self.recognizer.non_speaking_duration / spf) + 1
+            self._preroll.append(frame)
+            if len(self._preroll) > preroll_frames:
+                self._preroll.pop(0)
+            if speech:
+                self._frames = list(self._preroll)
+                self._preroll = []
+                self._silent = 0
+                self._voiced = 1
+                self._started_at = timestamp
+                self._flagged = flagged
+            return None
+
+        self._frames.append(frame)
+        self._flagged = self._flagged or flagged
+        if speech:
+            self._voiced += 1
+            self._silent = 0
+        else:
+            self._silent += 1
+        trailing = self.trailing_silence(self._voiced * spf)
+        done = self._silent * spf >= trailing
+        limit_frames = int(self.phrase_time_limit / spf) if self.phrase_time_limit else None
+        if limit_frames and len(self._frames) >= limit_frames:
+            if not done:
+                self.counters['time_limited'] += 1
+            done = True
+        if not done:
+            return None
+
+        frames, started_at, silent, voiced, flagged = (self._frames, self._started_at, self._silent,
+                                                       self._voiced, self._flagged)
+        self.reset()
+        self.counters['endpoints'] += 1
+        self.last_trailing = trailing
+        if voiced * spf < self.min_speech:
+            self.counters['rejected'] += 1
+            return None
+        # Silence past the tail only costs recognition time
+        surplus = max(0, silent - int(math.ceil(self.keep_tail / spf)))
+        return b"".join(frames[:len(frames) - surplus]), started_at, flagged
+
+    def snapshot(self):
+        stats = {f'vad.{name}': value for name, value in self.counters.items()}
+        stats['vad.noise_floor_db'] = round(self.vad.floor_db, 1)
+        stats['vad.last_trailing_ms'] = round(self.last_trailing * 1000)
+        return stats
+
+
+def segmenter_factory(name=ENDPOINTER):
+    """Segmenter class for AudioPipeline: 'vad' needs NumPy and falls back to fixed 'energy'"""
+    if name == 'vad':
+        if np is not None:
+            return VadSegmenter
+        print("⚠️ NumPy not installed; using fixed-threshold endpointing")
+    elif name != 'energy':
+        print(f"⚠️ Unknown endpointer: {name}")
+    return PhraseSegmenter
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+J.A.R.V.I.S local wake-word detection
+Energy/VAD gate plus an MFCC keyword spotter that runs before cloud recognition
+"""
+import glob
+import os
+import sys
+import time
+import wave
+
+from jarvis_startup import is_available, lazy_import
+
+# NumPy costs ~100 ms to import; only pay for it when the detector first runs
+np = lazy_import('numpy') if is_available('numpy') else None
+
+WAKEWORD_DIR = os.getenv('JARVIS_WAKEWORD_DIR', os.path.expanduser('~/.jarvis/wakeword'))
+MATCH_THRESHOLD = float(os.getenv('JARVIS_WAKEWORD_THRESHOLD', '0.55'))
+MIN_VOICED_SECONDS = 0.25
+FRAME_MS = 25
+HOP_MS = 10
+NUM_MEL = 26
+NUM_CEPS = 13
+MAX_FREQ = 4000
+ENROLL_SAMPLES = 3          # recordings taken by `enroll` when no WAV files are given
+ENROLL_SECONDS = 2.0        # longest recording kept per sample
+TEMPLATE_RATE = 16000
+
+
+class WakeDecision:
+    """Result of running a phrase through the local wake-word stage"""
+
+    def __init__(self, passed, reason, score=None):
+        self.passed = passed
+        self.reason = reason
+        self.score = score
+
+    def __bool__(self):
+        return self.passed
+
+    def __repr__(self):
+        return f"WakeDecision(passed={self.passed}, reason={self.reason!r}, score={self.score})"
+
+
+class PassThroughDetector:
+    """Lets every phrase through; used when NumPy is not installed"""
+
+    name = 'passthrough'
+
+    def check(self, frame_data, sample_rate, sample_width):
+        return WakeDecision(True, 'passthrough')
+
+
+def pcm_to_float(frame_data, sample_width):
+    """Decode little-endian PCM bytes (8, 16, 24 or 32 bit) into a float array in [-1, 1]"""
+    if sample_width == 1:
+        samples = np.frombuffer(frame_data, dtype=np.uint8).astype(np.float32) - 128.0
+        return samples / 128.0
+    if sample_width == 3:
+        # No 24-bit dtype: place each sample in the top three bytes of an int32, keeping the sign
+        raw = np.frombuffer(frame_data, dtype=np.uint8).reshape(-1, 3).astype(np.uint32)
+        packed = (raw[:, 0] << 8) | (raw[:, 1] << 16) | (raw[:, 2] << 24)
+        return packed.view(np.int32).astype(np.float32) / float(2 ** 31)
+    if sample_width not in (2, 4):
+        raise ValueError(f"Unsupported sample width: {sample_width} bytes")
+    dtype = {2: np.int16, 4: np.int32}[sample_width]
+    samples = np.frombuffer(frame_data, dtype=dtype).astype(np.float32)
+    return samples / float(2 ** (8 * sample_width - 1))
+
+
+def float_to_pcm16(samples):
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype('<i2').tobytes()
+
+
+def frame_signal(samples, sample_rate, frame_ms=FRAME_MS, hop_ms=HOP_MS):
+    """Split a signal into overlapping frames as a strided (n_frames, frame_len) view"""
+    frame_len = int(sample_rate * frame_ms / 1000)
+    hop = int(sample_rate * hop_ms / 1000)
+    if len(samples) < frame_len:
+        samples = np.pad(samples, (0, frame_len - len(samples)))
+    n_frames = 1 + (len(samples) - frame_len) // hop
+    return np.lib.stride_tricks.as_strided(
+        samples,
+        shape=(n_frames, frame_len),
+        strides=(samples.strides[0] * hop, samples.strides[0]),
+        writeable=False
+    )
+
+
+_filterbank_cache = {}
+
+
+def mel_filterbank(sample_rate, n_fft, n_mel=NUM_MEL, max_freq=MAX_FREQ):
+    """Triangular mel filterbank (cached per sample rate / FFT size)"""
+    key = (sample_rate, n_fft, n_mel, max_freq)
+    if key in _filterbank_cache:
+        return _filterbank_cache[key]
+    max_freq = min(max_freq, sample_rate / 2)
+    mel_max = 2595 * np.log10(1 + max_freq / 700.0)
+    mel_points = np.linspace(0, mel_max, n_mel + 2)
+    hz_points = 700 * (10 ** (mel_points / 2595) - 1)
+    bins = np.floor((n_fft + 1) * hz_points / sample_rate).astype(int)
+
+    fbank = np.zeros((n_mel, n_fft // 2 + 1), dtype=np.float32)
+    for m in range(1, n_mel + 1):
+        left, center, right = bins[m - 1], bins[m], bins[m + 1]
+        if center > left:
+            fbank[m - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+        if right > center:
+            fbank[m - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+    _filterbank_cache[key] = fbank
+    return fbank
+
+
+_dct_cache = {}
+
+
+def dct_matrix(n_in, n_out=NUM_CEPS):
+    """Orthonormal DCT-II basis so cepstra come from one matrix product"""
+    key = (n_in, n_out)
+    if key not in _dct_cache:
+        k = np.arange(n_out)[:, None]
+        n = np.arange(n_in)[None, :]
+        basis = np.cos(np.pi * k * (2 * n + 1) / (2 * n_in)) * np.sqrt(2.0 / n_in)
+        basis[0] /= np.sqrt(2)
+        _dct_cache[key] = basis.astype(np.float32)
+    return _dct_cache[key]
+
+
+def mfcc(samples, sample_rate):
+    """MFCC features (n_frames, NUM_CEPS) with per-utterance mean/variance normalization"""
+    emphasized = np.append(samples[0], samples[1:] - 0.97 * samples[:-1]).astype(np.float32)
+    frames = frame_signal(emphasized, sample_rate) * np.hamming(int(sample_rate * FRAME_MS / 1000))
+    n_fft = 1 << (frames.shape[1] - 1).bit_length()
+    power = (np.abs(np.fft.rfft(frames, n_fft)) ** 2) / n_fft
+    mel_energy = power @ mel_filterbank(sample_rate, n_fft).T
+    log_mel = np.log(np.maximum(mel_energy, 1e-10))
+    ceps = log_mel @ dct_matrix(log_mel.shape[1]).T
+    ceps -= ceps.mean(axis=0)
+    ceps /= ceps.std(axis=0) + 1e-8
+    return ceps
+
+
+def frame_energy(samples, sample_rate):
+    """Per-frame RMS energy in the same int16 scale speech_recognition uses"""
+    frames = frame_signal(samples, sample_rate)
+    return np.sqrt(np.mean(frames ** 2, axis=1)) * 32768.0
+
+
+class EnergyGate:
+    """Rejects phrases that never contain enough voiced audio"""
+
+    def __init__(self, threshold=300, min_voiced_seconds=MIN_VOICED_SECONDS):
+        self.threshold = threshold
+        self.min_voiced_seconds = min_voiced_seconds
+
+    def voiced_seconds(self, samples, sample_rate):
+        threshold = self.threshold() if callable(self.threshold) else self.threshold
+        voiced = np.count_nonzero(frame_energy(samples, sample_rate) > threshold)
+        return voiced * HOP_MS / 1000.0
+
+    def check(self, samples, sample_rate):
+        voiced = self.voiced_seconds(samples, sample_rate)
+        return voiced >= self.min_voiced_seconds, voiced
+
+
+class KeywordSpotter:
+    """Template matcher: best sliding-window cosine similarity of MFCC sequences"""
+
+    def __init__(self, threshold=MATCH_THRESHOLD):
+        self.threshold = threshold
+        self.templates = []
+
+    def enroll(self, samples, sample_rate):
+        feats = mfcc(samples, sample_rate)
+        norms = np.linalg.norm(feats, axis=1, keepdims=True) + 1e-8
+        self.templates.append(feats / norms)
+
+    def load_directory(self, directory):
+        """Enroll every WAV file in a directory; returns how many were loaded"""
+        count = 0
+        for path in sorted(glob.glob(os.path.join(directory, '*.wav'))):
+            samples, sample_rate = read_wav(path)
+            self.enroll(samples, sample_rate)
+            count += 1
+        return count
+
+    def score(self, feats):
+        """Highest similarity of any template against any window of the phrase"""
+        if not self.templates:
+            return None
+        norms = np.linalg.norm(feats, axis=1, keepdims=True) + 1e-8
+        unit = feats / norms
+        best = -1.0
+        for template in self.templates:
+            length = len(template)
+            if len(unit) < length:
+                padded = np.zeros((length, unit.shape[1]), dtype=unit.dtype)
+                padded[:len(unit)] = unit
+                windows = padded[None, :, :]
+            else:
+                windows = np.lib.stride_tricks.sliding_window_view(unit, length, axis=0)
+                windows = windows.transpose(0, 2, 1)
+            # Mean per-frame cosine similarity for every window in one einsum
+            sims = np.einsum('wfc,fc->w', windows, template) / length
+            best = max(best, float(sims.max()))
+        return best
+
+
+class LocalWakeWordDetector:
+    """Energy gate followed by an optional keyword spotter"""
+
+    name = 'local'
+
+    def __init__(self, energy_threshold=300, template_dir=WAKEWORD_DIR,
+                 match_threshold=MATCH_THRESHOLD):
+        self.gate = EnergyGate(energy_threshold)
+        self.spotter = KeywordSpotter(match_threshold)
+        if template_dir and os.path.isdir(template_dir):
+            loaded = self.spotter.load_directory(template_dir)
+            print(f"✅ Loaded {loaded} wake-word templates from {template_dir}")
+
+    def check(self, frame_data, sample_rate, sample_width):
+        samples = pcm_to_float(frame_data, sample_width)
+        voiced_ok, voiced = self.gate.check(samples, sample_rate)
+        if not voiced_ok:
+            return WakeDecision(False, 'silence', voiced)
+        if not self.spotter.templates:
+            return WakeDecision(True, 'energy', voiced)
+        score = self.spotter.score(mfcc(samples, sample_rate))
+        if score < self.spotter.threshold:
+            return WakeDecision(False, 'no-keyword', score)
+        return WakeDecision(True, 'keyword', score)
+
+
+def create_detector(energy_threshold=300, template_dir=WAKEWORD_DIR):
+    """Best available wake-word stage for this device"""
+    if np is None:
+        print("⚠️ NumPy not available, local wake-word gate disabled")
+        return PassThroughDetector()
+    return LocalWakeWordDetector(energy_threshold, template_dir)
+
+
+def read_wav(path):
+    """Load a WAV file as mono float samples"""
+    with wave.open(path, 'rb') as wav:
+        sample_rate = wav.getframerate()
+        channels = wav.getnchannels()
+        samples = pcm_to_float(wav.readframes(wav.getnframes()), wav.getsampwidth())
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples, sample_rate
+
+
+def write_wav(path, samples, sample_rate):
+    """Save mono float samples as 16-bit PCM"""
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(float_to_pcm16(samples))
+
+
+def record_samples(count=ENROLL_SAMPLES, seconds=ENROLL_SECONDS):
+    """Yield (samples, sample_rate) for each spoken wake word, from the default microphone"""
+    import speech_recognition as sr
+    recognizer = sr.Recognizer()
+    with sr.Microphone(sample_rate=TEMPLATE_RATE) as source:
+        recognizer.adjust_for_ambient_noise(source, duration=1)
+        for index in range(count):
+            print(f"🎤 Say 'Jarvis' ({index + 1}/{count})...")
+            audio = recognizer.listen(source, timeout=10, phrase_time_limit=seconds)
+            yield pcm_to_float(audio.get_raw_data(convert_width=2), 2), audio.sample_rate
+
+
+def enroll(paths, template_dir=WAKEWORD_DIR, count=ENROLL_SAMPLES):
+    """Store wake-word templates from WAV files, or from the microphone when none are given"""
+    gate = EnergyGate()
+    samples = (read_wav(path) for path in paths) if paths else record_samples(count)
+    os.makedirs(template_dir, exist_ok=True)
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    saved = 0
+    for index, (audio, sample_rate) in enumerate(samples):
+        voiced_ok, voiced = gate.check(audio, sample_rate)
+        if not voiced_ok:
+            print(f"⚠️ Sample {index + 1} is too quiet ({voiced:.2f}s voiced), skipped")
+            continue
+        write_wav(os.path.join(template_dir, f"wake-{stamp}-{index + 1}.wav"), audio, sample_rate)
+        saved += 1
+    print(f"✅ Saved {saved} wake-word templates to {template_dir}")
+    return saved
+
+
+def main(argv):
+    """Offline tools for the local wake word:
+    jarvis_wakeword.py enroll [--templates DIR] [file.wav ...]   (records from the mic without files)
+    jarvis_wakeword.py [--templates DIR] file.wav ...            (scores recordings)"""
+    command = 'score'
+    if argv and argv[0] == 'enroll':
+        command, argv = 'enroll', argv[1:]
+    template_dir = WAKEWORD_DIR
+    if len(argv) > 1 and argv[0] == '--templates':
+        template_dir, argv = argv[1], argv[2:]
+    if np is None:
+        print("⚠️ NumPy is required for the local wake word")
+        return 1
+    if command == 'enroll':
+        try:
+            return 0 if enroll(argv, template_dir) else 1
+        except Exception as e:
+            # No microphone, no speech_recognition, or nothing said before the timeout
+            print(f"❌ Enrollment failed: {e}")
+            return 1
+    if not argv:
+        print(main.__doc__)
+        return 1
+    detector = create_detector(template_dir=template_dir)
+    for path in argv:
+        # Mono 16-bit, whatever the fixture was recorded as, which is what the microphone delivers
+        samples, sample_rate = read_wav(path)
+        decision = detector.check(float_to_pcm16(samples), sample_rate, 2)
+        mark = "✅" if decision.passed else "❌"
+        print(f"{mark} {path}: {decision.reason} (score={decision.score})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
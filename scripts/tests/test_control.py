@@ -0,0 +1,59 @@
+"""Control API over a real loopback socket, driving a harness-built JarvisVoice"""
+import http.client
+import json
+import socket
+import time
+
+import pytest
+
+from jarvis_control import ControlServer
+from jarvis_harness import build_jarvis
+
+
+@pytest.fixture
+def server():
+    jarvis = build_jarvis()
+    server = ControlServer(jarvis, port=0).start()
+    yield server
+    server.stop()
+    jarvis.shutdown(farewell=False)
+
+
+def raw_request(server, head):
+    with socket.create_connection(('127.0.0.1', server.port), timeout=5) as sock:
+        sock.sendall(head.encode('latin-1'))
+        return sock.recv(4096).decode('latin-1').split('\r\n', 1)[0]
+
+
+def post(server, path, payload):
+    connection = http.client.HTTPConnection('127.0.0.1', server.port, timeout=5)
+    try:
+        connection.request('POST', path, json.dumps(payload), {'Content-Type': 'application/json'})
+        return connection.getresponse().status
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize('length', ['abc', '-5'])
+def test_malformed_content_length_is_a_bad_request(server, length):
+    status = raw_request(server, f"POST /command HTTP/1.1\r\nHost: localhost\r\nContent-Length: {length}\r\n\r\n")
+    assert status == 'HTTP/1.1 400 Bad Request'
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_api_commands_answer_and_cancel_an_open_dialog(server):
+    dialog = server.jarvis.dialog
+    assert post(server, '/command', {'text': 'send a message'}) == 202
+    assert wait_for(lambda: dialog.active)
+    assert post(server, '/command', {'text': 'mom'}) == 202
+    assert wait_for(lambda: dialog.stats()['follow_ups'] == 1)
+    assert dialog.active and dialog.frame.intent == 'message'
+    assert post(server, '/command', {'text': 'stop'}) == 202
+    assert wait_for(lambda: not dialog.active)
+    assert dialog.stats()['cancelled'] == 1
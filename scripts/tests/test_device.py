@@ -0,0 +1,99 @@
+"""DeviceStatus against stub termux-* binaries on PATH"""
+import json
+import os
+import stat
+import threading
+
+import pytest
+
+import jarvis_device
+from jarvis_device import DeviceStatus
+
+BATTERY = {'percentage': 81, 'status': 'CHARGING'}
+
+
+def write_stub(directory, name, body):
+    path = directory / name
+    path.write_text("#!/bin/sh\n" + body)
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return path
+
+
+@pytest.fixture
+def stub_path(tmp_path, monkeypatch):
+    monkeypatch.setenv('PATH', f"{tmp_path}{os.pathsep}{os.environ.get('PATH', '')}")
+    return tmp_path
+
+
+def battery_stub(directory, delay=0.0, exit_code=0):
+    # Every spawn leaves a line in calls.log, so tests can count real subprocesses
+    return write_stub(directory, 'termux-battery-status',
+                      f"echo x >> '{directory}/calls.log'\nsleep {delay}\n"
+                      f"echo '{json.dumps(BATTERY)}'\nexit {exit_code}\n")
+
+
+def spawned(directory):
+    log = directory / 'calls.log'
+    return len(log.read_text().splitlines()) if log.exists() else 0
+
+
+def test_fresh_reading_is_served_from_cache(stub_path):
+    battery_stub(stub_path)
+    device = DeviceStatus()
+    assert device.get('battery') == BATTERY
+    assert device.get('battery') == BATTERY
+    assert device.counters['spawns'] == 1
+    assert device.counters['hits'] == 1
+    assert spawned(stub_path) == 1
+
+
+def test_expired_reading_runs_the_command_again(stub_path):
+    battery_stub(stub_path)
+    device = DeviceStatus()
+    device.get('battery')
+    device.get('battery', max_age=0)
+    assert device.counters['spawns'] == 2
+    assert spawned(stub_path) == 2
+
+
+def test_failures_are_cached_for_the_error_ttl(stub_path, monkeypatch):
+    battery_stub(stub_path, exit_code=1)
+    device = DeviceStatus()
+    reading = device.read('battery')
+    assert reading.value is None and reading.error
+    # A failing termux-api shouldn't be re-spawned on every request...
+    device.read('battery', max_age=0)
+    assert device.counters['spawns'] == 1
+    assert device.counters['errors'] == 1
+    # ...but it is retried once the error TTL has passed
+    monkeypatch.setattr(jarvis_device, 'ERROR_TTL', 0)
+    device.read('battery')
+    assert device.counters['spawns'] == 2
+
+
+def test_missing_command_is_an_error_reading(stub_path):
+    device = DeviceStatus(sensors={'battery': (['termux-missing-command'], 60)})
+    reading = device.read('battery')
+    assert reading.value is None
+    assert reading.error
+
+
+def test_concurrent_reads_share_one_subprocess(stub_path):
+    battery_stub(stub_path, delay=0.3)
+    device = DeviceStatus()
+    barrier = threading.Barrier(8)
+    values = []
+
+    def read():
+        barrier.wait()
+        values.append(device.get('battery'))
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert values == [BATTERY] * 8
+    assert device.counters['spawns'] == 1
+    assert device.counters['coalesced'] == 7
+    assert spawned(stub_path) == 1
@@ -0,0 +1,29 @@
+"""parse_reminder's time rules against a fixed clock"""
+from datetime import datetime
+
+import pytest
+
+from jarvis_notes import parse_reminder
+
+SUNDAY_AFTERNOON = datetime(2026, 10, 18, 14, 0)
+SUNDAY_LATE = datetime(2026, 10, 18, 23, 30)
+
+
+@pytest.mark.parametrize('command, now, text, due', [
+    ("remind me to call mom at 5", SUNDAY_AFTERNOON, "call mom", datetime(2026, 10, 18, 17, 0)),
+    ("remind me at 3 pm", SUNDAY_AFTERNOON, "", datetime(2026, 10, 18, 15, 0)),
+    ("remind me tomorrow at 7 am to run", SUNDAY_AFTERNOON, "run", datetime(2026, 10, 19, 7, 0)),
+    ("remind me to stretch in 20 minutes", SUNDAY_AFTERNOON, "stretch", datetime(2026, 10, 18, 14, 20)),
+    # 11 pm has passed too, so "at 11" is tomorrow morning rather than 23:00 tomorrow
+    ("remind me to jog at 11", SUNDAY_LATE, "jog", datetime(2026, 10, 19, 11, 0)),
+])
+def test_clock_and_relative_times(command, now, text, due):
+    assert parse_reminder(command, now) == (text, due.timestamp())
+
+
+@pytest.mark.parametrize('command, text', [
+    ("remind me at 5:75", ""),
+    ("remind me to call mom at 25", "call mom"),
+])
+def test_impossible_time_is_dropped_with_the_lead(command, text):
+    assert parse_reminder(command, SUNDAY_AFTERNOON) == (text, None)
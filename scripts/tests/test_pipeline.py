@@ -0,0 +1,46 @@
+"""AudioPipeline recognition stage: every phrase yields a result, and stop() is bounded"""
+import threading
+import time
+
+import jarvis_pipeline
+from jarvis_pipeline import AudioPipeline, FrameRing
+
+
+def start_workers(pipeline, targets):
+    pipeline.ring = FrameRing(1)
+    pipeline.running = True
+    for target in targets:
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        pipeline._threads.append(thread)
+
+
+def test_gate_errors_still_produce_results_in_order():
+    results = []
+
+    def gate(audio, during_speech):
+        raise RuntimeError('odd audio')
+
+    pipeline = AudioPipeline(None, None, recognize=lambda audio: 'hello', on_result=results.append, gate=gate)
+    start_workers(pipeline, [pipeline._recognize_loop, pipeline._dispatch_loop])
+    for seq in range(3):
+        pipeline._recognition_queue.put((seq, b'', time.time(), False, ()))
+    deadline = time.time() + 2
+    while len(results) < 3 and time.time() < deadline:
+        time.sleep(0.01)
+    assert [(r.seq, r.error) for r in results] == [(0, 'odd audio'), (1, 'odd audio'), (2, 'odd audio')]
+
+
+def test_stop_is_bounded_with_a_full_queue_and_a_stuck_recognizer(monkeypatch):
+    monkeypatch.setattr(jarvis_pipeline, 'STOP_TIMEOUT', 0.5)
+    release = threading.Event()
+    pipeline = AudioPipeline(None, None, recognize=lambda audio: release.wait(10), on_result=lambda r: None,
+                             workers=1, queue_size=2)
+    pipeline.microphone = type('Mic', (), {'__exit__': lambda self, *exc: None})()
+    start_workers(pipeline, [pipeline._recognize_loop, pipeline._dispatch_loop])
+    for seq in range(3):
+        pipeline._recognition_queue.put((seq, b'', time.time(), False, ()))
+    started = time.time()
+    pipeline.stop()
+    assert time.time() - started < 2
+    release.set()
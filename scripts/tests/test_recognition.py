@@ -0,0 +1,138 @@
+"""RecognitionChain fallback and confidence selection, and backend parsing of recorded responses"""
+import json
+import sys
+import types
+
+import pytest
+
+from jarvis_recognition import GoogleBackend, RecognitionBackend, RecognitionChain, VoskBackend
+
+# Recorded recognizer responses: recognize_google(show_all=True) and Vosk's FinalResult()
+GOOGLE_RESPONSE = {'alternative': [{'transcript': 'what time is it', 'confidence': 0.92},
+                                   {'transcript': 'what time is in'}], 'final': True}
+VOSK_PARTIALS = ['{"partial": "what"}', '{"partial": "what time"}']
+VOSK_FINAL = json.dumps({'text': 'what time is it', 'result': [
+    {'word': 'what', 'conf': 1.0}, {'word': 'time', 'conf': 0.9},
+    {'word': 'is', 'conf': 0.8}, {'word': 'it', 'conf': 0.5}]})
+
+
+class StubBackend(RecognitionBackend):
+    def __init__(self, name, result=None, error=None, warm_error=None):
+        self.name = name
+        self.result = result
+        self.error = error
+        self.warm_error = warm_error
+        self.calls = 0
+
+    def warm(self):
+        if self.warm_error:
+            raise self.warm_error
+
+    def recognize(self, audio, on_partial=None):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return self.result
+
+
+def test_confident_first_backend_wins_without_fallback():
+    local, cloud = StubBackend('local', ('open camera', 0.9)), StubBackend('cloud', ('open camera', 0.99))
+    chain = RecognitionChain([local, cloud], min_confidence=0.6)
+    outcome = chain.recognize(b'audio')
+    assert (outcome.text, outcome.backend) == ('open camera', 'local')
+    assert cloud.calls == 0
+    assert chain.fallbacks == 0
+
+
+def test_low_confidence_falls_back_to_the_next_backend():
+    local, cloud = StubBackend('local', ('open camel', 0.3)), StubBackend('cloud', ('open camera', 0.95))
+    chain = RecognitionChain([local, cloud], min_confidence=0.6)
+    outcome = chain.recognize(b'audio')
+    assert (outcome.text, outcome.backend) == ('open camera', 'cloud')
+    assert chain.fallbacks == 1
+    assert chain.summary()['local']['low_confidence'] == 1
+
+
+def test_most_confident_answer_when_nobody_is_sure():
+    chain = RecognitionChain([StubBackend('local', ('open camel', 0.3)),
+                              StubBackend('cloud', ('open camera', 0.5))], min_confidence=0.6)
+    outcome = chain.recognize(b'audio')
+    assert (outcome.text, outcome.confidence) == ('open camera', 0.5)
+
+
+def test_missing_confidence_is_accepted():
+    chain = RecognitionChain([StubBackend('cloud', ('hello', None))])
+    assert chain.recognize(b'audio').text == 'hello'
+
+
+def test_errors_and_silence_move_on_to_the_next_backend():
+    broken, silent = StubBackend('broken', error=RuntimeError('offline')), StubBackend('silent')
+    chain = RecognitionChain([broken, silent, StubBackend('cloud', ('hello', 0.9))])
+    assert chain.recognize(b'audio').backend == 'cloud'
+    summary = chain.summary()
+    assert summary['broken']['errors'] == 1
+    assert summary['silent']['unknown'] == 1
+
+
+def test_nothing_understood_returns_none():
+    assert RecognitionChain([StubBackend('local'), StubBackend('cloud')]).recognize(b'audio') is None
+
+
+def test_warm_drops_backends_that_cannot_load():
+    cloud = StubBackend('cloud', ('hello', 0.9))
+    chain = RecognitionChain([StubBackend('local', warm_error=ImportError('no vosk')), cloud]).warm()
+    assert chain.backends == [cloud]
+
+
+class FakeRecognizer:
+    def __init__(self, response):
+        self.response = response
+
+    def recognize_google(self, audio, show_all=False):
+        return self.response
+
+
+@pytest.fixture
+def fake_sr(monkeypatch):
+    module = types.SimpleNamespace(UnknownValueError=type('UnknownValueError', (Exception,), {}))
+    monkeypatch.setitem(sys.modules, 'speech_recognition', module)
+    return module
+
+
+def test_google_backend_reads_the_top_alternative(fake_sr):
+    assert GoogleBackend(FakeRecognizer(GOOGLE_RESPONSE)).recognize(b'audio') == ('what time is it', 0.92)
+    assert GoogleBackend(FakeRecognizer([])).recognize(b'audio') is None
+
+
+class FakeKaldiRecognizer:
+    def __init__(self, model, rate):
+        self.partials = list(VOSK_PARTIALS)
+
+    def SetWords(self, enabled):
+        pass
+
+    def AcceptWaveform(self, data):
+        return False
+
+    def PartialResult(self):
+        return self.partials.pop(0) if self.partials else '{"partial": ""}'
+
+    def FinalResult(self):
+        return VOSK_FINAL
+
+
+class FakeAudio:
+    def get_raw_data(self, convert_rate=None, convert_width=None):
+        return b'\0' * 8000
+
+
+def test_vosk_backend_reports_partials_and_mean_word_confidence(monkeypatch):
+    vosk = types.SimpleNamespace(KaldiRecognizer=FakeKaldiRecognizer, SetLogLevel=lambda level: None)
+    monkeypatch.setitem(sys.modules, 'vosk', vosk)
+    backend = VoskBackend()
+    backend.model = object()
+    partials = []
+    text, confidence = backend.recognize(FakeAudio(), lambda name, partial: partials.append(partial))
+    assert text == 'what time is it'
+    assert confidence == pytest.approx(0.8)
+    assert partials == ['what', 'what time']
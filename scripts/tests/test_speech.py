@@ -0,0 +1,109 @@
+"""Speech cache with the pyttsx3 voice, and pruning by last playback"""
+import os
+import sys
+import threading
+import types
+import wave
+
+import pytest
+
+import jarvis_tts_cache
+from jarvis_speech import SpeechQueue
+from jarvis_tts_cache import SpeechCache
+
+
+def write_silence(path, seconds=0.1, rate=16000):
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(b'\0\0' * int(rate * seconds))
+
+
+class FakeEngine:
+    """pyttsx3 engine that records which thread did what and writes silent WAVs for save_to_file"""
+
+    def __init__(self):
+        self.properties = {'voice': 'english'}
+        self.threads = set()
+        self.spoken = []
+        self._pending = []
+
+    def setProperty(self, name, value):
+        self.properties[name] = value
+
+    def getProperty(self, name):
+        return self.properties.get(name)
+
+    def connect(self, event, callback):
+        pass
+
+    def say(self, text):
+        self._pending.append(('say', text, None))
+
+    def save_to_file(self, text, path):
+        self._pending.append(('save', text, path))
+
+    def runAndWait(self):
+        self.threads.add(threading.current_thread().name)
+        for kind, text, path in self._pending:
+            if kind == 'save':
+                write_silence(path)
+            else:
+                self.spoken.append(text)
+        self._pending = []
+
+    def stop(self):
+        pass
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = FakeEngine()
+    monkeypatch.setitem(sys.modules, 'pyttsx3', types.SimpleNamespace(init=lambda: engine))
+    # `true` stands in for aplay, so cached lines "play" without a sound card
+    monkeypatch.setattr(jarvis_tts_cache, 'pyaudio', None)
+    monkeypatch.setattr(jarvis_tts_cache, 'PLAYER_COMMANDS', (['true'],))
+    return engine
+
+
+def test_pyttsx3_voice_renders_the_cache_on_its_own_thread(engine, tmp_path):
+    cache = SpeechCache(directory=str(tmp_path))
+    speech = SpeechQueue(audio_cache=cache).start()
+    try:
+        speech.prepare(["Yes sir, how can I help you?"]).result(timeout=5)
+        assert cache.stats()['renders'] == 1
+        assert engine.threads == {'jarvis-tts'}
+        assert not speech.speaking
+
+        speech.say("Yes sir, how can I help you?").wait(5)
+        speech.say("The time is 10:42").wait(5)
+        assert speech.stats()['cached'] == 1
+        assert engine.spoken == ["The time is 10:42"]
+    finally:
+        speech.stop()
+
+
+def test_renders_queued_at_stop_fail_fast(engine, tmp_path):
+    speech = SpeechQueue(audio_cache=SpeechCache(directory=str(tmp_path))).start()
+    speech.wait_ready(5)
+    speech.stop()
+    with pytest.raises(RuntimeError):
+        speech._render_pyttsx3("Goodbye", str(tmp_path / 'late.wav'))
+
+
+def test_prune_keeps_the_most_recently_played(tmp_path):
+    cache = SpeechCache(directory=str(tmp_path), max_entries=10)
+    cache.bind(('voice', 150, 0), lambda text, path: write_silence(path))
+    try:
+        for age, text in enumerate(["one", "two", "three"]):
+            cache.prepare([text]).result(timeout=5)
+            # Rendered oldest first, a minute apart
+            os.utime(cache._path(cache.key(text)), (1000 + 60 * age, 1000 + 60 * age))
+        assert cache.get("one") is not None
+        cache._prune(2)
+        assert not os.path.exists(cache._path(cache.key("two")))
+        assert os.path.exists(cache._path(cache.key("one")))
+        assert os.path.exists(cache._path(cache.key("three")))
+    finally:
+        cache.close()
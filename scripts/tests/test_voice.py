@@ -0,0 +1,98 @@
+"""JarvisVoice on the harness stand-ins: routing against the bundled registry, handlers, and the audio gate"""
+import pytest
+
+from jarvis_harness import build_jarvis
+
+
+@pytest.fixture
+def jarvis():
+    jarvis = build_jarvis()
+    yield jarvis
+    jarvis.shutdown(farewell=False)
+
+
+@pytest.mark.parametrize('command, app', [
+    ("open google chrome", 'Chrome'),
+    ("open google maps", 'Maps'),
+    ("open google mail", 'Gmail'),
+    ("open messages", 'Messages'),
+    ("launch whats app", 'WhatsApp'),
+])
+def test_open_resolves_app_names_containing_other_triggers(jarvis, command, app):
+    match = jarvis.route(command)
+    assert match.intent == 'open_app'
+    jarvis.process_command(command)
+    jarvis.scheduler.wait_idle(5)
+    expected = jarvis.registry.resolve_app(app)
+    assert expected.name == app
+    assert jarvis.actions.calls == [('am', ['start', *expected.am_args()])]
+
+
+@pytest.mark.parametrize('command, intent', [
+    ("search for pizza places", 'search'),
+    ("google the weather", 'search'),
+    ("send a message", 'message'),
+    ("open a text message to bob", 'message'),
+])
+def test_triggers_win_when_nothing_after_open_is_an_app(jarvis, command, intent):
+    assert jarvis.route(command).intent == intent
+
+
+@pytest.mark.parametrize('command, query', [
+    ("take a note that dinner moved to 5:30", "dinner moved to 5:30"),
+    ("make a note of mom's birthday", "mom's birthday"),
+    ("look up, weather in paris", "weather in paris"),
+    ("read my notes", ""),
+])
+def test_query_slot_keeps_the_commands_own_text(jarvis, command, query):
+    assert jarvis.route(command).slots['query'] == query
+
+
+def test_message_handler_reads_only_what_follows_the_trigger(jarvis):
+    jarvis.process_command("i want to send a message to mom saying i'm late")
+    assert jarvis.actions.calls[-1][1][-2:] == ['sms_body', "i'm late"]
+    assert "Choose mom as the recipient." in jarvis.speech.items[-1].text
+
+
+class DroppedStream:
+    """ChatClient stand-in whose stream dies after the given sentences"""
+
+    def __init__(self, sentences, error=None):
+        self.sentences = sentences
+        self.error = error
+
+    def stream_sentences(self, query, context=""):
+        yield from self.sentences
+        if self.error:
+            raise self.error
+
+
+def test_cut_off_reply_is_neither_cached_nor_remembered(jarvis):
+    query = "why is the sky blue"
+    jarvis.chat_client = DroppedStream(["Light scatters off the air."], ConnectionError("reset"))
+    jarvis.handle_general_query(query)
+    assert jarvis.response_cache.get(jarvis.response_cache.key(query, jarvis.cache_fingerprint)) is None
+    assert all(turn.role != 'JARVIS' for turn in jarvis.memory.turns)
+
+    jarvis.chat_client = DroppedStream(["Light scatters off the air."])
+    jarvis.handle_general_query(query)
+    assert jarvis.response_cache.get(jarvis.response_cache.key(query, jarvis.cache_fingerprint)) == \
+        "Light scatters off the air."
+
+
+class Phrase:
+    """Just the fields gate_audio reads from speech_recognition's AudioData"""
+
+    def __init__(self, amplitude, seconds, sample_rate=16000):
+        samples = [amplitude if i % 2 else -amplitude for i in range(int(sample_rate * seconds))]
+        self.frame_data = b''.join(s.to_bytes(2, 'little', signed=True) for s in samples)
+        self.sample_rate = sample_rate
+        self.sample_width = 2
+
+
+def test_without_templates_barge_in_needs_a_short_phrase_louder_than_our_echo(jarvis):
+    assert not jarvis.wake_enrolled
+    assert not jarvis.gate_audio(Phrase(1000, 1.0), during_speech=True)  # our own voice, learned
+    assert not jarvis.gate_audio(Phrase(1200, 1.0), during_speech=True)
+    assert jarvis.gate_audio(Phrase(6000, 0.8), during_speech=True)
+    assert not jarvis.gate_audio(Phrase(6000, 4.0), during_speech=True)
@@ -0,0 +1,68 @@
+"""Wake-word enrollment and scoring on synthetic WAV fixtures, written the way a recorder would"""
+import wave
+
+import pytest
+
+import jarvis_wakeword
+from jarvis_wakeword import LocalWakeWordDetector, enroll, pcm_to_float
+
+np = pytest.importorskip('numpy')
+
+RATE = 16000
+
+
+def sweep(start_hz, end_hz, seconds=0.6):
+    """A voiced-sounding glide with harmonics between two short silences"""
+    t = np.arange(int(RATE * seconds)) / RATE
+    phase = 2 * np.pi * np.cumsum(np.linspace(start_hz, end_hz, len(t))) / RATE
+    tone = 0.5 * np.sin(phase) + 0.25 * np.sin(2 * phase) + 0.1 * np.sin(3 * phase)
+    silence = np.zeros(int(RATE * 0.2))
+    return np.concatenate([silence, tone, silence])
+
+
+def write_fixture(path, samples, channels=1, sample_width=2):
+    """Interleaved PCM at any width: stereo 24-bit is what USB recorders tend to produce"""
+    scale = 2 ** (8 * sample_width - 1) - 1
+    ints = np.repeat((samples * scale).astype(np.int64)[:, None], channels, axis=1).ravel()
+    data = b''.join(int(v).to_bytes(sample_width, 'little', signed=True) for v in ints)
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(sample_width)
+        wav.setframerate(RATE)
+        wav.writeframes(data)
+    return str(path)
+
+
+def test_24_bit_samples_keep_their_sign():
+    data = b''.join(v.to_bytes(3, 'little', signed=True) for v in (0, 1, -1, 2 ** 23 - 1, -2 ** 23))
+    assert list(pcm_to_float(data, 3) * 2 ** 23) == [0, 1, -1, 2 ** 23 - 1, -2 ** 23]
+
+
+def test_unsupported_sample_width_is_a_clear_error():
+    with pytest.raises(ValueError, match="sample width"):
+        pcm_to_float(b'\0' * 10, 5)
+
+
+def test_enrolled_stereo_24_bit_fixture_spots_the_keyword(tmp_path):
+    wake = write_fixture(tmp_path / 'wake.wav', sweep(300, 1500), channels=2, sample_width=3)
+    templates = tmp_path / 'templates'
+    assert enroll([wake], str(templates)) == 1
+
+    stored = next(templates.glob('*.wav'))
+    with wave.open(str(stored), 'rb') as wav:
+        assert (wav.getnchannels(), wav.getsampwidth()) == (1, 2)
+
+    detector = LocalWakeWordDetector(template_dir=str(templates))
+    assert len(detector.spotter.templates) == 1
+    spoken = write_fixture(tmp_path / 'spoken.wav', sweep(300, 1500) * 0.6)
+    other = write_fixture(tmp_path / 'other.wav', sweep(1500, 300))
+    assert jarvis_wakeword.main(['--templates', str(templates), spoken, other]) == 0
+    with wave.open(spoken, 'rb') as wav:
+        assert detector.check(wav.readframes(wav.getnframes()), RATE, 2).reason == 'keyword'
+    with wave.open(other, 'rb') as wav:
+        assert detector.check(wav.readframes(wav.getnframes()), RATE, 2).reason == 'no-keyword'
+
+
+def test_silent_recordings_are_not_enrolled(tmp_path):
+    quiet = write_fixture(tmp_path / 'quiet.wav', np.zeros(RATE))
+    assert enroll([quiet], str(tmp_path / 'templates')) == 0